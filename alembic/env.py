@@ -11,15 +11,16 @@ from sqlalchemy import pool
 
 from alembic import context
 
-# Import settings to get DATABASE_URL from .env
-from app.config import settings
+# Import Config to get the database URI from .env
+from app.config import Config
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
-# Set the sqlalchemy.url to the one from our settings (which reads from .env)
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+# Set the sqlalchemy.url to the one the Flask app uses (which reads from .env).
+# '%' must be doubled — the ini parser treats it as interpolation.
+config.set_main_option("sqlalchemy.url", Config.SQLALCHEMY_DATABASE_URI.replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -28,26 +29,12 @@ if config.config_file_name is not None:
 
 # add your model's MetaData object here
 # for 'autogenerate' support
-from app.database import Base
+from app.extensions import db
 
 # Import ALL models so Alembic can detect them
-from app.models import (
-    Role,
-    User,
-    Department,
-    Team,
-    TeamMember,
-    TicketType,
-    SLAPolicy,
-    Ticket,
-    TicketComment,
-    TicketLog,
-    Assignment,
-    TicketAI,
-    TicketHistory,
-)
-
-target_metadata = Base.metadata
+import app.models  # noqa: F401
+
+target_metadata = db.metadata
 
 
 # other values from the config, defined by the needs of env.py,
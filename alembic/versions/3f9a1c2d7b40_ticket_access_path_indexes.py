@@ -0,0 +1,74 @@
+"""ticket access path indexes
+
+Composite index pack for the role-scoped ticket queries:
+  agents     department_id + status + assigned_to
+  team leads department_id + created_at
+  employees  created_by + created_at
+  workload   assigned_to + status
+  children   parent_ticket_id
+  scheduler  status + sla_deadline
+  admin      created_at
+
+Databases bootstrapped by db.create_all() after this change already have the
+indexes; existing ones are skipped so the upgrade is safe on either.
+
+Revision ID: 3f9a1c2d7b40
+Revises:
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d7b40'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_tickets_dept_status_assignee', ['department_id', 'status', 'assigned_to']),
+    ('ix_tickets_dept_created', ['department_id', 'created_at']),
+    ('ix_tickets_creator_created', ['created_by', 'created_at']),
+    ('ix_tickets_assignee_status', ['assigned_to', 'status']),
+    ('ix_tickets_parent', ['parent_ticket_id']),
+    ('ix_tickets_status_sla', ['status', 'sla_deadline']),
+    ('ix_tickets_created', ['created_at']),
+]
+
+# MySQL silently drops the implicit single-column index behind a foreign key
+# once another index can serve it, and refuses to drop the last index a
+# foreign key depends on.  Downgrade restores plain FK indexes first.
+FK_BACKING_INDEXES = [
+    ('ix_tickets_department_id', ['department_id']),
+    ('ix_tickets_created_by', ['created_by']),
+    ('ix_tickets_assigned_to', ['assigned_to']),
+    ('ix_tickets_parent_ticket_id', ['parent_ticket_id']),
+]
+
+
+def _existing_indexes():
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes('tickets')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = _existing_indexes()
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'tickets', columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    existing = _existing_indexes()
+    for name, columns in FK_BACKING_INDEXES:
+        if name not in existing:
+            op.create_index(name, 'tickets', columns)
+    for name, _ in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='tickets')
@@ -0,0 +1,38 @@
+"""user token version
+
+users.token_version — embedded in access tokens and bumped when a user's
+role or profile departments change, so older tokens are rejected
+(app/utils/principal.py).
+
+Revision ID: 5d1f7a3c9e62
+Revises: 8b2e4d6f1a93
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1f7a3c9e62'
+down_revision: Union[str, Sequence[str], None] = '8b2e4d6f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existing_columns():
+    return {col['name'] for col in sa.inspect(op.get_bind()).get_columns('users')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'token_version' not in _existing_columns():
+        op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if 'token_version' in _existing_columns():
+        op.drop_column('users', 'token_version')
@@ -0,0 +1,39 @@
+"""ticket sla cover index
+
+Covering index for the SLA compliance report: department, deadline, status
+and created_at are all read from the index, so the grouped aggregate never
+touches table rows.
+
+Revision ID: 8b2e4d6f1a93
+Revises: 3f9a1c2d7b40
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d6f1a93'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c2d7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existing_indexes():
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes('tickets')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'ix_tickets_sla_cover' not in _existing_indexes():
+        op.create_index('ix_tickets_sla_cover', 'tickets',
+                        ['department_id', 'sla_deadline', 'status', 'created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if 'ix_tickets_sla_cover' in _existing_indexes():
+        op.drop_index('ix_tickets_sla_cover', table_name='tickets')
@@ -0,0 +1,38 @@
+"""ticket row version
+
+tickets.row_version — bumped on every UPDATE and hashed into the tickets
+ETags, so two writes within the same second (updated_at has one-second
+resolution) still change the tag.
+
+Revision ID: 9c4e2b7d1f58
+Revises: 5d1f7a3c9e62
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e2b7d1f58'
+down_revision: Union[str, Sequence[str], None] = '5d1f7a3c9e62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existing_columns():
+    return {col['name'] for col in sa.inspect(op.get_bind()).get_columns('tickets')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'row_version' not in _existing_columns():
+        op.add_column('tickets', sa.Column('row_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if 'row_version' in _existing_columns():
+        op.drop_column('tickets', 'row_version')
@@ -27,6 +27,39 @@ def create_app(config_class=Config):
     ])
     limiter.init_app(app)
 
+    from app.utils.json_provider import init_json_provider
+    if init_json_provider(app):
+        logger.info("[App] Using orjson JSON provider")
+
+    from app.utils.compression import init_compression
+    if init_compression(app):
+        logger.info("[App] Response compression enabled")
+
+    # Ticket change tracking → incremental analytics rollups + latency histograms
+    from app.services.ticket_changes import init_change_tracking
+    from app.services.rollup_service import init_rollups
+    from app.services.latency_histograms import init_latency_histograms
+    init_change_tracking()
+    init_rollups()
+    init_latency_histograms()
+
+    # Live agent workload ledger, updated by ticket commits
+    from app.services.workload_ledger import workload_ledger
+    workload_ledger.init_app(app)
+
+    # Shared analytics/dashboard result cache, invalidated by ticket commits
+    from app.services.result_cache import result_cache
+    if result_cache.init_app(app):
+        logger.info(f"[App] Result cache enabled ({app.config['RESULT_CACHE_BACKEND']})")
+
+    # Login password verification on a bounded pool; bcrypt cost from config
+    from app.services.password_hashing import password_hashing
+    password_hashing.init_app(app)
+
+    # Departments / roles / SLA rules served from memory (app/services/reference_data.py)
+    from app.services.reference_data import reference_data
+    reference_data.init_app(app)
+
     logger.info("[App] Registering blueprints...")
     from app.routes.auth_routes import auth_bp
     from app.routes.admin_routes import admin_bp
@@ -37,6 +70,7 @@ def create_app(config_class=Config):
     from app.routes.team_lead_routes import team_lead_bp
     from app.routes.agent_routes import agent_bp
     from app.routes.activity_routes import activity_bp
+    from app.routes.stream_routes import stream_bp
 
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
@@ -47,16 +81,17 @@ def create_app(config_class=Config):
     app.register_blueprint(team_lead_bp, url_prefix='/api/team-lead')
     app.register_blueprint(agent_bp, url_prefix='/api/agent')
     app.register_blueprint(activity_bp, url_prefix='/api')
+    app.register_blueprint(stream_bp, url_prefix='/api/stream')
     logger.info("[App] Blueprints registered.")
     
     # Initialize background scheduler
-    logger.info("[App] Starting scheduler...")
-    from app.scheduler import init_scheduler
-    init_scheduler(app)
+    if app.config.get("SCHEDULER_ENABLED", True):
+        logger.info("[App] Starting scheduler...")
+        from app.scheduler import init_scheduler
+        init_scheduler(app)
 
     # JWT Identity/Lookup Loaders
     logger.info("[App] Configuring JWT loaders...")
-    from app.models import User
 
     @jwt.user_identity_loader
     def user_identity_lookup(user):
@@ -67,10 +102,18 @@ def create_app(config_class=Config):
             return str(user.get('id'))
         return str(user)
 
+    # Request principal from token claims / principal cache (app/utils/principal.py)
+    from app.utils.principal import init_principal_tracking, is_token_revoked, load_principal, principal_cache
+    init_principal_tracking()
+    principal_cache.init_app(app)
+
     @jwt.user_lookup_loader
     def user_lookup_callback(_jwt_header, jwt_data):
-        identity = jwt_data["sub"]
-        return db.session.get(User, int(identity))
+        return load_principal(jwt_data)
+
+    @jwt.token_in_blocklist_loader
+    def token_revoked_check(_jwt_header, jwt_data):
+        return is_token_revoked(jwt_data)
 
     # JWT Error Handlers for Debugging
     @jwt.invalid_token_loader
@@ -83,6 +126,11 @@ def create_app(config_class=Config):
         logger.error(f"❌ JWT MISSING: {error}")
         return jsonify({"success": False, "message": "Missing Authorization Header"}), 401
 
+    @jwt.revoked_token_loader
+    def revoked_token_callback(jwt_header, jwt_data):
+        logger.warning(f"JWT REVOKED: user {jwt_data.get('sub')} (token version {jwt_data.get('tv')})")
+        return jsonify({"success": False, "message": "Your access has changed — please log in again"}), 401
+
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_data):
         logger.error(f"❌ JWT EXPIRED: {jwt_data}")
@@ -95,6 +143,7 @@ def create_app(config_class=Config):
         try:
             db.create_all()
             logger.info("Database tables verified/created.")
+            reference_data.load()
         except Exception as e:
             logger.warning("WARNING: Could not connect to database!")
             logger.warning(f"   Error: {e}")
@@ -36,3 +36,62 @@ class Config:
     
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET", "jwt_secret_key")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.environ.get("JWT_EXPIRE_MINUTES", "60")))
+
+    # Background jobs (app/scheduler.py) — disable for one-off scripts/benchmarks
+    SCHEDULER_ENABLED = os.environ.get("SCHEDULER_ENABLED", "true").lower() == "true"
+
+    # Use the orjson-backed JSON provider (app/utils/json_provider.py) when available
+    FAST_JSON = os.environ.get("FAST_JSON", "true").lower() == "true"
+
+    # Response compression (app/utils/compression.py)
+    COMPRESS_ENABLED = os.environ.get("COMPRESS_ENABLED", "true").lower() == "true"
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", "1024"))  # bytes; smaller bodies go out uncompressed
+    COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", "6"))           # gzip 1-9
+    COMPRESS_BR_LEVEL = int(os.environ.get("COMPRESS_BR_LEVEL", "4"))     # brotli 0-11
+    COMPRESS_MIMETYPES = {
+        "application/json",
+        "application/x-ndjson",
+        "text/csv",
+        "text/plain",
+        "text/html",
+    }
+
+    # Shared result cache for analytics/dashboard endpoints (app/services/result_cache.py)
+    RESULT_CACHE_ENABLED = os.environ.get("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RESULT_CACHE_BACKEND = os.environ.get("RESULT_CACHE_BACKEND", "local")       # local | redis
+    RESULT_CACHE_TTL = int(os.environ.get("RESULT_CACHE_TTL", "60"))             # seconds; max staleness
+    RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "1000"))  # per worker (local backend)
+    REDIS_URL = os.environ.get("REDIS_URL", "")
+
+    # Live agent workload ledger (app/services/workload_ledger.py)
+    WORKLOAD_LEDGER_BACKEND = os.environ.get("WORKLOAD_LEDGER_BACKEND", "local")     # local | redis
+    WORKLOAD_RECONCILE_MINUTES = int(os.environ.get("WORKLOAD_RECONCILE_MINUTES", "5"))
+
+    # Batch auto-assignment (app/services/batch_assignment.py)
+    AGENT_DAILY_CAPACITY = int(os.environ.get("AGENT_DAILY_CAPACITY", "15"))        # max active tickets per agent
+    BATCH_ASSIGN_ENABLED = os.environ.get("BATCH_ASSIGN_ENABLED", "false").lower() == "true"   # opt-in: replaces agents claiming from the pool
+    BATCH_ASSIGN_MINUTES = int(os.environ.get("BATCH_ASSIGN_MINUTES", "5"))
+
+    # Reference data cache (app/services/reference_data.py) — how often workers re-check the shared version
+    REFERENCE_DATA_CHECK_SECONDS = int(os.environ.get("REFERENCE_DATA_CHECK_SECONDS", "5"))
+
+    # Request principal (app/utils/principal.py)
+    PRINCIPAL_SOURCE = os.environ.get("PRINCIPAL_SOURCE", "claims")                  # claims | cache | database
+    PRINCIPAL_CACHE_TTL = int(os.environ.get("PRINCIPAL_CACHE_TTL", "60"))           # seconds
+    PRINCIPAL_CACHE_MAX_ENTRIES = int(os.environ.get("PRINCIPAL_CACHE_MAX_ENTRIES", "5000"))
+    TOKEN_VERSION_CHECK_SECONDS = int(os.environ.get("TOKEN_VERSION_CHECK_SECONDS", "30"))  # max staleness of a revoked token
+
+    # Password hashing (app/services/password_hashing.py)
+    BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))                      # bcrypt cost; lower hashes are upgraded at login
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "4"))        # concurrent verifications
+    PASSWORD_HASH_QUEUE_MAX = int(os.environ.get("PASSWORD_HASH_QUEUE_MAX", "32"))   # waiting logins before 503
+    PASSWORD_VERIFY_TIMEOUT = float(os.environ.get("PASSWORD_VERIFY_TIMEOUT", "5"))  # seconds
+
+    # Bulk ticket operations (app/services/bulk_ticket_service.py)
+    BULK_TICKET_MAX = int(os.environ.get("BULK_TICKET_MAX", "100"))                  # tickets per request
+
+    # Parquet analytics snapshots for BI (app/services/snapshot_service.py)
+    ANALYTICS_SNAPSHOT_DIR = os.environ.get("ANALYTICS_SNAPSHOT_DIR", os.path.join(os.getcwd(), "snapshots"))
+
+    # Admin dashboard result lifetime, shared by all admin sessions
+    DASHBOARD_CACHE_SECONDS = int(os.environ.get("DASHBOARD_CACHE_SECONDS", "15"))
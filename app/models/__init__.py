@@ -16,3 +16,5 @@ from app.models.audit_log import AuditLog
 from app.models.system_activity_log import SystemActivityLog
 from app.models.feedback import Feedback
 from app.models.password_reset_request import PasswordResetRequest
+from app.models.ticket_daily_rollup import TicketDailyRollup
+from app.models.ticket_latency_histogram import TicketLatencyHistogram
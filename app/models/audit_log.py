@@ -3,6 +3,8 @@ from datetime import datetime, timezone
 
 def format_datetime(dt):
     if dt:
+        if dt.tzinfo is None:
+            return dt.isoformat() + "+00:00"
         return dt.replace(tzinfo=timezone.utc).isoformat()
     return None
 
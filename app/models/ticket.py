@@ -5,12 +5,29 @@ import json
 def format_datetime(dt):
     """Return an ISO 8601 string with explicit UTC offset (+00:00), or None."""
     if dt:
+        if dt.tzinfo is None:
+            # Fast path: DB values are naive UTC — skip building an aware copy.
+            return dt.isoformat() + "+00:00"
         return dt.replace(tzinfo=timezone.utc).isoformat()
     return None
 
 class Ticket(db.Model):
     __tablename__ = 'tickets'
-    
+
+    # ── Index pack — one per role-scoped access path ────────────────────────
+    # Keep in sync with the Alembic revisions in alembic/versions/ and
+    # scripts/explain_hot_queries.py.
+    __table_args__ = (
+        db.Index('ix_tickets_dept_status_assignee', 'department_id', 'status', 'assigned_to'),  # agent queue / TL pool
+        db.Index('ix_tickets_dept_created', 'department_id', 'created_at'),                    # TL lists, dept analytics
+        db.Index('ix_tickets_creator_created', 'created_by', 'created_at'),                    # employee lists
+        db.Index('ix_tickets_assignee_status', 'assigned_to', 'status'),                       # per-agent workload/performance
+        db.Index('ix_tickets_parent', 'parent_ticket_id'),                                     # child propagation
+        db.Index('ix_tickets_status_sla', 'status', 'sla_deadline'),                           # scheduler scans
+        db.Index('ix_tickets_created', 'created_at'),                                          # admin list, trends
+        db.Index('ix_tickets_sla_cover', 'department_id', 'sla_deadline', 'status', 'created_at'),  # SLA compliance (index-only)
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
@@ -35,6 +52,10 @@ class Ticket(db.Model):
 
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # Bumped by every UPDATE — ORM flushes and bulk_update_tickets alike.
+    # Conditional GET versions use it: updated_at only has one-second resolution.
+    row_version = db.Column(db.Integer, nullable=False, default=0, server_default='0',
+                            onupdate=db.literal_column('row_version') + 1)
     
     # Workflow Timestamps
     approved_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
@@ -71,8 +92,13 @@ class Ticket(db.Model):
         lazy='dynamic'
     )
 
-    def to_dict(self, role=None):
-        now = datetime.now(timezone.utc)
+    def to_dict(self, role=None, now=None, affected_users=None):
+        """
+        `now` and `affected_users` may be precomputed by serialize_tickets()
+        so list endpoints don't pay a clock read and a COUNT query per row.
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
         
         # SLA Countdown
         sla_remaining = 0
@@ -99,7 +125,12 @@ class Ticket(db.Model):
         is_employee = role == "EMPLOYEE"
         
         # Count of child tickets linked to this parent (affected users indicator)
-        affected_users = self.children.count() if self.parent_ticket_id is None else 0
+        if affected_users is None:
+            affected_users = self.children.count() if self.parent_ticket_id is None else 0
+
+        # Department name from the reference-data snapshot, not the relationship
+        from app.services.reference_data import reference_data
+        department = reference_data.department(self.department_id) if self.department_id else None
 
         return {
             "id": self.id,
@@ -107,7 +138,7 @@ class Ticket(db.Model):
             "title": self.title,
             "description": self.description,
             "department_id": self.department_id,
-            "department_name": self.department.name if self.department else None,
+            "department_name": department.name if department else None,
             "created_by": self.created_by,
             "created_by_name": self.creator.full_name if self.creator else None,
             "created_by_emp_id": self.creator.emp_id if self.creator else None,
@@ -139,3 +170,43 @@ class Ticket(db.Model):
             "is_child_ticket": self.parent_ticket_id is not None,
             "affected_users": affected_users,   # Count of child incidents (only >0 on parent tickets)
         }
+
+
+def serialize_tickets(tickets, role=None):
+    """
+    Serializes a list of tickets with per-list precomputation instead of
+    per-row lazy loads:
+      - one clock read shared by every SLA / auto-close countdown
+      - child counts (affected_users) for all parents in one grouped query
+      - users referenced by the list loaded in one IN query, so
+        ticket.creator / assigned_user resolve from the session identity map
+        without further SQL; department names come from reference_data
+    """
+    if not tickets:
+        return []
+
+    from app.models.user import User
+
+    parent_ids = [t.id for t in tickets if t.parent_ticket_id is None]
+    child_counts = {}
+    if parent_ids:
+        child_counts = dict(
+            db.session.query(Ticket.parent_ticket_id, db.func.count(Ticket.id))
+            .filter(Ticket.parent_ticket_id.in_(parent_ids))
+            .group_by(Ticket.parent_ticket_id)
+            .all()
+        )
+
+    user_ids = {t.created_by for t in tickets if t.created_by} | {t.assigned_to for t in tickets if t.assigned_to}
+    # Held in locals so the identity map keeps them alive while serializing.
+    users = User.query.filter(User.id.in_(user_ids)).all() if user_ids else []
+
+    now = datetime.now(timezone.utc)
+    return [
+        t.to_dict(
+            role=role,
+            now=now,
+            affected_users=child_counts.get(t.id, 0) if t.parent_ticket_id is None else 0,
+        )
+        for t in tickets
+    ]
@@ -0,0 +1,24 @@
+from app.extensions import db
+
+
+class TicketDailyRollup(db.Model):
+    """
+    Ticket counts per creation day, bucketed by current status and priority.
+    Two series share the table:
+        scope = 'DEPARTMENT' → scope_id = tickets.department_id
+        scope = 'CREATOR'    → scope_id = tickets.created_by
+    Maintained by app/services/rollup_service.py.
+    """
+    __tablename__ = 'ticket_daily_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('scope', 'scope_id', 'day', 'status', 'priority', name='uq_ticket_daily_rollup'),
+        db.Index('ix_ticket_daily_rollups_day', 'day'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.Enum('DEPARTMENT', 'CREATOR'), nullable=False)
+    scope_id = db.Column(db.Integer, nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    priority = db.Column(db.String(5), nullable=False)
+    ticket_count = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,24 @@
+from app.extensions import db
+
+
+class TicketLatencyHistogram(db.Model):
+    """
+    Log-bucketed latency counts per event day, department and priority.
+        metric = 'RESOLUTION'     → resolved_at - created_at, day of resolved_at
+        metric = 'TIME_TO_ASSIGN' → assigned_at - created_at, day of assigned_at
+    bucket is an index into the fixed log scale of
+    app/services/latency_histograms.py.  Maintained by that module.
+    """
+    __tablename__ = 'ticket_latency_histograms'
+    __table_args__ = (
+        db.UniqueConstraint('metric', 'department_id', 'priority', 'day', 'bucket', name='uq_ticket_latency_histogram'),
+        db.Index('ix_ticket_latency_histograms_metric_day', 'metric', 'day'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    metric = db.Column(db.Enum('RESOLUTION', 'TIME_TO_ASSIGN'), nullable=False)
+    department_id = db.Column(db.Integer, nullable=False)
+    priority = db.Column(db.String(5), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    bucket = db.Column(db.SmallInteger, nullable=False)
+    ticket_count = db.Column(db.Integer, nullable=False, default=0)
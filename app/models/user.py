@@ -1,6 +1,6 @@
 from app.extensions import db
 from datetime import datetime, timezone
-from app.utils.password_utils import hash_password, verify_password
+from app.utils.password_utils import hash_password, verify_and_rehash
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,6 +25,8 @@ class User(db.Model):
     role_id = db.Column(db.Integer, db.ForeignKey('roles.id'), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     require_password_change = db.Column(db.Boolean, default=False)
+    # Bumped when role / profile departments change — invalidates issued tokens (app/utils/principal.py)
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
@@ -35,18 +37,21 @@ class User(db.Model):
         self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        is_valid = verify_password(password, self.password_hash)
-        
-        # If valid and still using legacy hash, upgrade it to bcrypt
-        if is_valid and self.password_hash.startswith("pbkdf2:sha256:"):
-            from app.utils.password_utils import hash_password
-            self.password_hash = hash_password(password)
-            db.session.add(self)
-            db.session.flush()  # Don't commit — let the caller control the transaction
-            logger.info(f"✅ Upgraded hash to bcrypt for: {self.email}")
-            
+        is_valid, new_hash = verify_and_rehash(password, self.password_hash)
+        if new_hash:
+            self.upgrade_password_hash(new_hash)
         return is_valid
 
+    def upgrade_password_hash(self, new_hash):
+        """
+        Stores a rehashed password (legacy pbkdf2 → bcrypt, or a raised
+        BCRYPT_ROUNDS) after a successful verification.
+        """
+        self.password_hash = new_hash
+        db.session.add(self)
+        db.session.flush()  # Don't commit — let the caller control the transaction
+        logger.info(f"✅ Upgraded password hash for: {self.email}")
+
     def to_dict(self):
         data = {
             "id": self.id,
@@ -4,6 +4,7 @@ from app.models.system_activity_log import SystemActivityLog
 from app.models.user import User, AgentProfile, TeamLeadProfile
 from app.utils.decorators import roles_required
 from app.extensions import db
+from sqlalchemy.orm import contains_eager
 from datetime import datetime, timezone
 import logging
 
@@ -28,7 +29,9 @@ def get_team_activity_log():
     
     # Query logs
     # We join with User and then check AgentProfile or TeamLeadProfile for department_id
-    query = SystemActivityLog.query.join(User, SystemActivityLog.user_id == User.id)
+    query = SystemActivityLog.query.join(User, SystemActivityLog.user_id == User.id).options(
+        contains_eager(SystemActivityLog.user).joinedload(User.role)
+    )
     
     # Filtering by department:
     # Action taken by someone in the same department
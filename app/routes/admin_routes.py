@@ -1,6 +1,7 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from flask_jwt_extended import jwt_required, current_user
 from app.utils.decorators import roles_required
+from app.utils.date_filters import date_range_criteria
 from app.models.user import User
 from app.models.role import Role
 from app.models.audit_log import AuditLog
@@ -10,9 +11,15 @@ from app.services.auth_service import AuthService
 from app.models.team import Team
 from app.models.team_member import TeamMember
 from app.extensions import db
+from sqlalchemy import func, case
+from sqlalchemy.orm import joinedload
 from app.utils.logging_utils import log_activity
 from app.models import PasswordResetRequest
 from app.utils.password_utils import hash_password
+from app.services.result_cache import result_cache, cached_view, global_scope
+from app.services import export_service
+from app.services.reference_data import reference_data
+from app.utils.principal import principal_cache
 import logging
 import re
 import random
@@ -101,11 +108,12 @@ def update_user(user_id):
         # Note: department_id is stored on TeamLeadProfile/AgentProfile, not User directly.
 
         if role_name:
-            new_role = Role.query.filter_by(name=role_name).first()
-            if new_role:
-                user.role_id = new_role.id
+            new_role_id = reference_data.role_id(role_name)
+            if new_role_id:
+                user.role_id = new_role_id
 
         db.session.commit()
+        principal_cache.invalidate(user.id)
         
         log_activity(
             user_id=current_user.id,
@@ -145,6 +153,7 @@ def delete_user(user_id):
         user_name = user.full_name
         db.session.delete(user)
         db.session.commit()
+        principal_cache.invalidate(user_id)
         
         log_activity(
             user_id=current_user.id,
@@ -458,6 +467,7 @@ def handle_departments():
         )
         db.session.add(dept)
         db.session.commit()
+        reference_data.invalidate()
         
         log_activity(
             user_id=current_user.id,
@@ -502,6 +512,7 @@ def manage_department(dept_id):
         dept.name = data.get('name', dept.name)
         dept.description = data.get('description', dept.description)
         db.session.commit()
+        reference_data.invalidate()
         
         log_activity(
             user_id=current_user.id,
@@ -527,6 +538,7 @@ def manage_department(dept_id):
         dept_name = dept.name
         db.session.delete(dept)
         db.session.commit()
+        reference_data.invalidate()
         
         log_activity(
             user_id=current_user.id,
@@ -608,7 +620,7 @@ def create_staff():
                  "message": f"Invalid department '{dept_name}'. Use canonical names."
              }), 400
              
-        dept = Department.query.filter_by(name=normalized_dept).first()
+        dept = reference_data.department_by_name(normalized_dept)
         if not dept:
             logger.warning(f"Department '{normalized_dept}' not in DB")
             return jsonify({"success": False, "message": f"Department '{normalized_dept}' not initialized"}), 400
@@ -625,8 +637,8 @@ def create_staff():
         role_key = role_input.upper().replace(" ", "_").strip()
         role_name = ROLE_MAP.get(role_key, role_key)
         
-        role_obj = Role.query.filter_by(name=role_name).first()
-        if not role_obj:
+        role_id = reference_data.role_id(role_name)
+        if not role_id:
             logger.warning(f"Role mapping failed for '{role_input}' -> '{role_name}'")
             return jsonify({"success": False, "message": f"Role '{role_name}' not found"}), 400
 
@@ -726,7 +738,7 @@ def create_agent():
             "other": "Others"
         }
         normalized_dept = DEPT_NAME_MAP.get(dept_name.lower())
-        dept = Department.query.filter_by(name=normalized_dept).first() if normalized_dept else None
+        dept = reference_data.department_by_name(normalized_dept) if normalized_dept else None
         
         if not dept:
             return jsonify({"success": False, "message": f"Department '{dept_name}' not found or invalid"}), 400
@@ -743,8 +755,8 @@ def create_agent():
             team_lead = None
         
         # 5. Get Role Lookup (AGENT)
-        agent_role = Role.query.filter_by(name="AGENT").first()
-        if not agent_role:
+        agent_role_id = reference_data.role_id("AGENT")
+        if not agent_role_id:
              return jsonify({"success": False, "message": "Agent role not initialized"}), 500
 
         # --- SEQUENTIAL EMAIL GENERATION ---
@@ -815,7 +827,10 @@ def get_system_activity():
         date_from = request.args.get('date_from')
         date_to = request.args.get('date_to')
 
-        query = SystemActivityLog.query.order_by(SystemActivityLog.created_at.desc())
+        # Eager-load user + role: to_dict() reads both for every row.
+        query = SystemActivityLog.query.options(
+            joinedload(SystemActivityLog.user).joinedload(User.role)
+        ).order_by(SystemActivityLog.created_at.desc())
 
         if action_type:
             query = query.filter(SystemActivityLog.action_type == action_type)
@@ -853,81 +868,226 @@ def get_system_activity():
         logger.error(f"ERROR fetching activity logs: {str(e)}", exc_info=True)
         return jsonify({"success": False, "message": str(e)}), 500
 
-@admin_bp.route('/dashboard', methods=['GET'])
+# ── Streaming exports ───────────────────────────────────────────────────────
+def _export_response(name, batches, columns):
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in export_service.FORMATS:
+        return jsonify({"success": False, "message": f"format must be one of: {', '.join(export_service.FORMATS)}"}), 400
+    filename = f"{name}-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{fmt}"
+    response = Response(
+        stream_with_context(export_service.encode(fmt, batches, columns)),
+        mimetype=export_service.FORMATS[fmt],
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['X-Accel-Buffering'] = 'no'   # let nginx pass chunks through
+    return response
+
+
+@admin_bp.route('/export/tickets', methods=['GET'])
 @roles_required('ADMIN')
-def get_dashboard_metrics():
+def export_tickets():
     """
-    Fetch comprehensive dashboard metrics, risk distribution, and top risky tickets.
+    Streams every matching ticket as CSV (default) or NDJSON (?format=ndjson).
+
+    Query params:
+        date_from / date_to   created_at range
+        department_id         one department
+        status                one or more statuses (comma separated)
     """
-    try:
-        from app.models.ticket import Ticket
-        
-        # 1. Total Tickets
-        total_tickets = Ticket.query.count()
-        
-        # 2. High Risk Count (ai_score >= 70)
-        # Matches the 'critical' + 'high' distribution logic
-        high_risk_count = Ticket.query.filter(Ticket.ai_score >= 70).count()
-        
-        # 3. SLA Breached Count (deadline passed AND not RESOLVED/CLOSED)
-        sla_breached_count = Ticket.query.filter(
-            Ticket.sla_deadline < datetime.now(timezone.utc),
-            Ticket.status.notin_(["RESOLVED", "CLOSED"])
-        ).count()
-        
-        # 4. Escalated Count (escalation_required OR status == 'ESCALATED')
-        escalated_count = Ticket.query.filter(
+    from app.models.ticket import Ticket
+    criteria = date_range_criteria(Ticket.created_at)
+    dept_id = request.args.get('department_id', type=int)
+    if dept_id:
+        criteria.append(Ticket.department_id == dept_id)
+    status = request.args.get('status')
+    if status:
+        criteria.append(Ticket.status.in_([s.strip().upper() for s in status.split(',') if s.strip()]))
+
+    return _export_response('tickets', export_service.ticket_rows(criteria), export_service.TICKET_COLUMNS)
+
+
+@admin_bp.route('/export/system-activity', methods=['GET'])
+@roles_required('ADMIN')
+def export_system_activity():
+    """
+    Streams matching system activity logs as CSV (default) or NDJSON.
+
+    Query params: date_from / date_to, action_type, entity_type, user_id
+    (same filters as /system-activity).
+    """
+    criteria = date_range_criteria(SystemActivityLog.created_at)
+    action_type = request.args.get('action_type')
+    if action_type:
+        criteria.append(SystemActivityLog.action_type == action_type)
+    entity_type = request.args.get('entity_type')
+    if entity_type:
+        criteria.append(SystemActivityLog.entity_type == entity_type)
+    user_id = request.args.get('user_id', type=int)
+    if user_id:
+        criteria.append(SystemActivityLog.user_id == user_id)
+
+    return _export_response('system-activity', export_service.activity_rows(criteria), export_service.ACTIVITY_COLUMNS)
+
+
+# ── Parquet analytics snapshot ──────────────────────────────────────────────
+@admin_bp.route('/analytics-snapshot', methods=['POST'])
+@roles_required('ADMIN')
+def start_analytics_snapshot():
+    """
+    Starts a background Parquet snapshot (see scripts/export_snapshot.py).
+    Body (optional): {"full": false, "tables": ["tickets", ...]}
+    """
+    from flask import current_app
+    from app.services.snapshot_service import SnapshotService, TABLES, pa
+
+    if pa is None:
+        return jsonify({"success": False, "message": "pyarrow is not installed on the server"}), 503
+
+    data = request.get_json(silent=True) or {}
+    tables = data.get('tables') or None
+    if tables and any(t not in TABLES for t in tables):
+        return jsonify({"success": False, "message": f"tables must be among: {', '.join(TABLES)}"}), 400
+
+    root = current_app.config['ANALYTICS_SNAPSHOT_DIR']
+    started = SnapshotService.start_background(
+        current_app._get_current_object(), root, tables=tables, full=bool(data.get('full'))
+    )
+    if not started:
+        return jsonify({"success": False, "message": "A snapshot run is already in progress"}), 409
+    return jsonify({"success": True, "message": "Snapshot started"}), 202
+
+
+@admin_bp.route('/analytics-snapshot', methods=['GET'])
+@roles_required('ADMIN')
+def get_analytics_snapshot_status():
+    """Watermark / last run per table, and whether a run is active."""
+    from flask import current_app
+    from app.services.snapshot_service import SnapshotService
+
+    root = current_app.config['ANALYTICS_SNAPSHOT_DIR']
+    return jsonify({
+        "success": True,
+        "data": {
+            "running": SnapshotService.is_running(),
+            "directory": root,
+            "tables": SnapshotService.status(root),
+        }
+    }), 200
+
+
+def _compute_dashboard_metrics():
+    from app.models.ticket import Ticket
+
+    now = datetime.now(timezone.utc)
+    unresolved = Ticket.status.notin_(["RESOLVED", "CLOSED"])
+
+    def count_if(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    pending_resets = (
+        db.session.query(func.count(PasswordResetRequest.id))
+        .filter(PasswordResetRequest.status == 'PENDING')
+        .scalar_subquery()
+    )
+
+    # One scan of tickets for every counter (+ pending resets as a subquery)
+    row = db.session.query(
+        func.count(Ticket.id).label('total'),
+        # High risk (ai_score >= 70) — matches 'critical' + 'high' below
+        count_if(Ticket.ai_score >= 70).label('high_risk'),
+        # SLA breached: deadline passed AND not RESOLVED/CLOSED
+        count_if(db.and_(Ticket.sla_deadline < now, unresolved)).label('sla_breached'),
+        # Escalated: flagged, ESCALATED/HIGH_RISK status or ai_score >= 80, still open
+        count_if(db.and_(
             db.or_(
                 Ticket.escalation_required == True,
                 Ticket.status == 'ESCALATED',
                 Ticket.status == 'HIGH_RISK',
                 Ticket.ai_score >= 80
             ),
-            Ticket.status.notin_(["RESOLVED", "CLOSED"])
-        ).count()
-        
-        # 5. Risk Distribution (Categorize by ai_score)
-        critical = Ticket.query.filter(Ticket.ai_score >= 85).count()
-        high = Ticket.query.filter(Ticket.ai_score.between(70, 84)).count()
-        medium = Ticket.query.filter(Ticket.ai_score.between(40, 69)).count()
-        low = Ticket.query.filter(Ticket.ai_score < 40).count()
-        
-        # 6. Top 5 Risky Tickets
-        top_risky = Ticket.query.filter(
-            Ticket.status != "CLOSED"
-        ).order_by(
-            Ticket.ai_score.desc()
-        ).limit(5).all()
-        
-        return jsonify({
-            "success": True,
-            "metrics": {
-                "total_tickets": total_tickets,
-                "high_risk": high_risk_count,
-                "sla_breached": sla_breached_count,
-                "escalated": escalated_count,
-                "pending_reset_count": PasswordResetRequest.query.filter_by(status='PENDING').count()
-            },
-            "risk_distribution": {
-                "critical": critical,
-                "high": high,
-                "medium": medium,
-                "low": low
-            },
-            "top_risky_tickets": [
-                {
-                    "id": t.id,
-                    "ticket_number": t.ticket_number,
-                    "title": t.title,
-                    "status": t.status,
-                    "ai_score": t.ai_score
-                } for t in top_risky
-            ]
-        }), 200
-        
+            unresolved
+        )).label('escalated'),
+        # Risk distribution by ai_score
+        count_if(Ticket.ai_score >= 85).label('critical'),
+        count_if(Ticket.ai_score.between(70, 84)).label('high'),
+        count_if(Ticket.ai_score.between(40, 69)).label('medium'),
+        count_if(Ticket.ai_score < 40).label('low'),
+        pending_resets.label('pending_resets'),
+    ).one()
+
+    # Top 5 risky tickets — only the columns the card shows
+    top_risky = (
+        db.session.query(Ticket.id, Ticket.ticket_number, Ticket.title, Ticket.status, Ticket.ai_score)
+        .filter(Ticket.status != "CLOSED")
+        .order_by(Ticket.ai_score.desc())
+        .limit(5)
+        .all()
+    )
+
+    return {
+        "success": True,
+        "generated_at": now.isoformat(),
+        "metrics": {
+            "total_tickets": row.total,
+            "high_risk": int(row.high_risk or 0),
+            "sla_breached": int(row.sla_breached or 0),
+            "escalated": int(row.escalated or 0),
+            "pending_reset_count": row.pending_resets or 0
+        },
+        "risk_distribution": {
+            "critical": int(row.critical or 0),
+            "high": int(row.high or 0),
+            "medium": int(row.medium or 0),
+            "low": int(row.low or 0)
+        },
+        "top_risky_tickets": [
+            {
+                "id": t.id,
+                "ticket_number": t.ticket_number,
+                "title": t.title,
+                "status": t.status,
+                "ai_score": t.ai_score
+            } for t in top_risky
+        ]
+    }
+
+
+@admin_bp.route('/dashboard', methods=['GET'])
+@roles_required('ADMIN')
+@cached_view('admin.dashboard', scope=global_scope, ttl_setting='DASHBOARD_CACHE_SECONDS')
+def get_dashboard_metrics():
+    """
+    Fetch comprehensive dashboard metrics, risk distribution, and top risky tickets.
+    Every open admin tab auto-refreshes this; they share one cached result,
+    recomputed after ticket changes or at most every DASHBOARD_CACHE_SECONDS.
+    """
+    try:
+        return jsonify(_compute_dashboard_metrics()), 200
+
     except Exception as e:
         logger.error(f"ERROR fetching dashboard metrics: {str(e)}", exc_info=True)
         return jsonify({"success": False, "message": str(e)}), 500
+
+
+@admin_bp.route('/cache-stats', methods=['GET'])
+@roles_required('ADMIN')
+def get_cache_stats():
+    """Hit/miss counters of the shared result cache (this worker)."""
+    return jsonify({"success": True, "data": result_cache.stats()}), 200
+
+@admin_bp.route('/password-hashing/stats', methods=['GET'])
+@roles_required('ADMIN')
+def get_password_hashing_stats():
+    """Queue depth, rejections, timeouts and hashing latency of the login hashing pool (this worker)."""
+    from app.services.password_hashing import password_hashing
+    return jsonify({"success": True, "data": password_hashing.stats()}), 200
+
+@admin_bp.route('/reference-data/stats', methods=['GET'])
+@roles_required('ADMIN')
+def get_reference_data_stats():
+    """Hit/load counters and version of the reference data cache (this worker)."""
+    return jsonify({"success": True, "data": reference_data.stats()}), 200
+
 @admin_bp.route('/reset-password/requests', methods=['GET'])
 @roles_required('ADMIN')
 def get_reset_requests():
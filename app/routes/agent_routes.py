@@ -1,10 +1,14 @@
 import logging
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import current_user
-from app.models.ticket import Ticket
+from app.models.ticket import Ticket, serialize_tickets
 from app.utils.decorators import roles_required
 from app.utils.dept_isolation import assert_dept_access
+from app.services.ticket_service import TicketService
+from app.services.event_bus import publish_ticket_event, TICKET_ASSIGNED, TICKET_STATUS_CHANGED
+from app.utils.http_cache import compute_etag, is_not_modified, not_modified, attach_etag
 from app.extensions import db
+from sqlalchemy import func
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
@@ -39,7 +43,7 @@ def get_agent_tickets():
     agent_id = current_user.id
     dept_id = current_user.agent_profile.department_id if current_user.agent_profile else None
 
-    tickets = Ticket.query.filter(
+    query = Ticket.query.filter(
         Ticket.department_id == dept_id,
         Ticket.parent_ticket_id == None,    # ← Agents only see parent tickets
         db.or_(
@@ -51,17 +55,27 @@ def get_agent_tickets():
                 Ticket.status == 'APPROVED'
             )
         )
-    ).order_by(Ticket.created_at.desc()).all()
+    )
+
+    # Conditional GET — see app/utils/http_cache.py
+    total, last_updated, versions = query.with_entities(
+        func.count(Ticket.id), func.max(Ticket.updated_at), func.sum(Ticket.row_version)
+    ).one()
+    etag = compute_etag("agent-tickets", agent_id, total, last_updated, versions)
+    if is_not_modified(etag):
+        return not_modified(etag)
+
+    tickets = query.order_by(Ticket.created_at.desc()).all()
 
     result = []
-    for t in tickets:
-        d = t.to_dict()
+    for t, d in zip(tickets, serialize_tickets(tickets)):
         d['can_accept']  = (t.assigned_to is None and t.status == 'APPROVED')
         d['can_decline'] = (t.assigned_to == agent_id)
         d['can_resolve'] = (t.assigned_to == agent_id and t.status == 'IN_PROGRESS')
         result.append(d)
 
-    return jsonify({"success": True, "data": result}), 200
+    response = jsonify({"success": True, "data": result})
+    return attach_etag(response, etag), 200
 
 
 @agent_bp.route('/update-ticket', methods=['POST'])
@@ -123,12 +137,12 @@ def update_ticket():
             ticket.updated_at  = datetime.now(timezone.utc)
 
             # ── Propagate ACCEPT to all child tickets ────────────────────────
-            Ticket.query.filter_by(parent_ticket_id=ticket.id).update({
+            TicketService.propagate_to_children(ticket.id, {
                 "assigned_to": agent_id,
                 "status": "IN_PROGRESS",
                 "accepted_at": datetime.now(timezone.utc),
                 "updated_at": datetime.now(timezone.utc)
-            }, synchronize_session=False)
+            })
 
             _log(agent_id, ticket, "TICKET_ACCEPTED", f"Ticket accepted by agent {current_user.full_name}")
 
@@ -147,11 +161,11 @@ def update_ticket():
 
             # ── Propagate DECLINE to all child tickets ───────────────────────
             # Release children back to unassigned APPROVED state
-            Ticket.query.filter_by(parent_ticket_id=ticket.id).update({
+            TicketService.propagate_to_children(ticket.id, {
                 "assigned_to": None,
                 "status": "APPROVED",
                 "updated_at": datetime.now(timezone.utc)
-            }, synchronize_session=False)
+            })
 
             _log(agent_id, ticket, "TICKET_DECLINED", f"Ticket released back to pool by agent {current_user.full_name}")
 
@@ -170,15 +184,19 @@ def update_ticket():
 
             # ── Propagate RESOLVE to all child tickets ───────────────────────
             # All affected users automatically receive resolution
-            Ticket.query.filter_by(parent_ticket_id=ticket.id).update({
+            TicketService.propagate_to_children(ticket.id, {
                 "status": "RESOLVED",
                 "resolved_at": datetime.now(timezone.utc),
                 "updated_at": datetime.now(timezone.utc)
-            }, synchronize_session=False)
+            })
 
             _log(agent_id, ticket, "TICKET_RESOLVED", f"Ticket resolved by agent {current_user.full_name}")
 
         db.session.commit()
+        if action == 'ACCEPT':
+            publish_ticket_event(TICKET_ASSIGNED, ticket)
+        else:
+            publish_ticket_event(TICKET_STATUS_CHANGED, ticket)
         return jsonify({
             "success": True,
             "message": f"Action {action} performed successfully",
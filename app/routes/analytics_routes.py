@@ -2,8 +2,18 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, current_user
 from app.models.ticket import Ticket
 from app.models.user import User
+from app.models.ticket_daily_rollup import TicketDailyRollup
+from app.models.ticket_latency_histogram import TicketLatencyHistogram
+from app.models.feedback import Feedback
+from app.services.rollup_service import RollupService, DEPARTMENT, CREATOR
+from app.services.latency_histograms import LatencyHistogramService, METRICS
+from app.services.result_cache import cached_view, global_scope, FEEDBACK
+from app.utils.date_filters import date_range_criteria
+from app.utils.decorators import roles_required
+from app.utils.dept_isolation import get_user_scope
 from app.extensions import db
-from sqlalchemy import func, case
+from sqlalchemy import func, case, literal_column, true
+from sqlalchemy.exc import DBAPIError
 from datetime import datetime, timedelta, timezone
 
 import logging
@@ -11,22 +21,44 @@ logger = logging.getLogger(__name__)
 
 analytics_bp = Blueprint('analytics', __name__)
 
+# Allowed ?days= windows for the SLA compliance report
+SLA_WINDOWS = (7, 30, 90)
+
 
 # ─────────────────────────────────────────────
-# Helper: build base query scoped by role
+# Helper: role scope as WHERE criteria
 # ─────────────────────────────────────────────
-def _base_query():
+def _scope_criteria():
+    """
+    Returns (criteria, role).  Criteria are applied directly inside the
+    aggregate queries — never materialize the visible ticket ids in Python.
+    """
+    role = current_user.role.name if current_user.role else "EMPLOYEE"
+    if role == "ADMIN":
+        return [], role
+    elif role == "TEAM_LEAD":
+        dept_id = current_user.team_lead_profile.department_id if current_user.team_lead_profile else None
+        return [Ticket.department_id == dept_id], role
+    elif role == "AGENT":
+        dept_id = current_user.agent_profile.department_id if current_user.agent_profile else None
+        return [Ticket.department_id == dept_id], role
+    else:
+        return [Ticket.created_by == current_user.id], role
+
+
+def _rollup_criteria():
+    """Same role scope, expressed against ticket_daily_rollups."""
     role = current_user.role.name if current_user.role else "EMPLOYEE"
     if role == "ADMIN":
-        return Ticket.query, role
+        return [TicketDailyRollup.scope == DEPARTMENT]
     elif role == "TEAM_LEAD":
         dept_id = current_user.team_lead_profile.department_id if current_user.team_lead_profile else None
-        return Ticket.query.filter(Ticket.department_id == dept_id), role
+        return [TicketDailyRollup.scope == DEPARTMENT, TicketDailyRollup.scope_id == dept_id]
     elif role == "AGENT":
         dept_id = current_user.agent_profile.department_id if current_user.agent_profile else None
-        return Ticket.query.filter(Ticket.department_id == dept_id), role
+        return [TicketDailyRollup.scope == DEPARTMENT, TicketDailyRollup.scope_id == dept_id]
     else:
-        return Ticket.query.filter(Ticket.created_by == current_user.id), role
+        return [TicketDailyRollup.scope == CREATOR, TicketDailyRollup.scope_id == current_user.id]
 
 
 # ─────────────────────────────────────────────
@@ -34,30 +66,24 @@ def _base_query():
 # ─────────────────────────────────────────────
 @analytics_bp.route('/summary', methods=['GET'])
 @jwt_required()
+@cached_view('analytics.summary')
 def get_summary():
-    base_query, _ = _base_query()
-    total_tickets = base_query.count()
-    ticket_ids = [t.id for t in base_query.with_entities(Ticket.id).all()]
-
-    status_counts = (
-        db.session.query(Ticket.status, func.count(Ticket.id))
-        .filter(Ticket.id.in_(ticket_ids))
-        .group_by(Ticket.status)
-        .all()
-    )
-    priority_counts = (
-        db.session.query(Ticket.priority, func.count(Ticket.id))
-        .filter(Ticket.id.in_(ticket_ids))
-        .group_by(Ticket.priority)
-        .all()
-    )
+    # (status, priority) buckets from the daily rollups roll up into both summaries
+    rows = RollupService.status_priority_counts(_rollup_criteria())
+
+    total_tickets = 0
+    status_counts, priority_counts = {}, {}
+    for status, priority, count in rows:
+        total_tickets += count
+        status_counts[status] = status_counts.get(status, 0) + count
+        priority_counts[priority] = priority_counts.get(priority, 0) + count
 
     return jsonify({
         "success": True,
         "data": {
             "total_tickets": total_tickets,
-            "status_summary": dict(status_counts),
-            "priority_summary": dict(priority_counts)
+            "status_summary": status_counts,
+            "priority_summary": priority_counts
         }
     }), 200
 
@@ -67,29 +93,25 @@ def get_summary():
 # ─────────────────────────────────────────────
 @analytics_bp.route('/by-department', methods=['GET'])
 @jwt_required()
+@cached_view('analytics.by_department', scope=global_scope)
 def tickets_by_department():
     """Count total, open, resolved tickets per department."""
     try:
-        from app.models.department import Department
-        departments = Department.query.all()
+        from app.services.reference_data import reference_data
+        rows = RollupService.department_status_counts(
+            open_statuses=['OPEN', 'APPROVED', 'IN_PROGRESS', 'ESCALATED'],
+            resolved_statuses=['RESOLVED', 'CLOSED'],
+        )
         result = []
-        for dept in departments:
-            total = Ticket.query.filter_by(department_id=dept.id).count()
-            if total == 0:
+        for dept_id, total, open_count, resolved in rows:
+            department = reference_data.department(dept_id)
+            if not total or department is None:
                 continue
-            open_count = Ticket.query.filter(
-                Ticket.department_id == dept.id,
-                Ticket.status.in_(['OPEN', 'APPROVED', 'IN_PROGRESS', 'ESCALATED'])
-            ).count()
-            resolved = Ticket.query.filter(
-                Ticket.department_id == dept.id,
-                Ticket.status.in_(['RESOLVED', 'CLOSED'])
-            ).count()
             result.append({
-                "department": dept.name,
-                "total": total,
-                "open": open_count,
-                "resolved": resolved
+                "department": department.name,
+                "total": int(total),
+                "open": int(open_count or 0),
+                "resolved": int(resolved or 0)
             })
         result.sort(key=lambda x: x["total"], reverse=True)
         return jsonify({"success": True, "data": result}), 200
@@ -102,28 +124,17 @@ def tickets_by_department():
 # ─────────────────────────────────────────────
 @analytics_bp.route('/trend', methods=['GET'])
 @jwt_required()
+@cached_view('analytics.trend')
 def tickets_trend():
     """Daily ticket creation count for the last `days` days (default 30)."""
     try:
         days = int(request.args.get('days', 30))
         days = min(max(days, 7), 90)  # clamp 7–90
-        base_query, _ = _base_query()
 
         start = datetime.now(timezone.utc) - timedelta(days=days)
-        rows = (
-            db.session.query(
-                func.date(Ticket.created_at).label('day'),
-                func.count(Ticket.id).label('count')
-            )
-            .filter(Ticket.created_at.isnot(None))
-            .filter(Ticket.id.in_([t.id for t in base_query.with_entities(Ticket.id).all()]))
-            .group_by(func.date(Ticket.created_at))
-            .order_by(func.date(Ticket.created_at))
-            .all()
-        )
+        day_map = RollupService.daily_counts(_rollup_criteria(), since=(start + timedelta(days=1)).date())
 
         # Fill gaps with 0
-        day_map = {str(r.day): r.count for r in rows}
         result = []
         for i in range(days):
             d = (start + timedelta(days=i + 1)).date()
@@ -139,47 +150,91 @@ def tickets_trend():
 # ─────────────────────────────────────────────
 @analytics_bp.route('/agent-performance', methods=['GET'])
 @jwt_required()
+@cached_view('analytics.agent_performance', scope=global_scope)
 def agent_performance():
-    """Per-agent: assigned, resolved, avg resolution time (hours)."""
+    """
+    Per-agent: assigned, resolved, avg resolution time (hours) — one grouped query.
+
+    Query params:
+        date_from / date_to   restrict to tickets created in the range
+        department_id         restrict to tickets of one department
+        percentiles=true      add p50/p90 resolution hours (nearest-rank)
+    """
     try:
-        from app.models.role import Role
-        agent_role = Role.query.filter_by(name='AGENT').first()
-        if not agent_role:
+        from app.services.reference_data import reference_data
+        agent_role_id = reference_data.role_id('AGENT')
+        if not agent_role_id:
             return jsonify({"success": True, "data": []}), 200
 
-        agents = User.query.filter_by(role_id=agent_role.id, is_active=True).all()
+        ticket_filters = date_range_criteria(Ticket.created_at)
+        dept_id = request.args.get('department_id', type=int)
+        if dept_id:
+            ticket_filters.append(Ticket.department_id == dept_id)
+        want_percentiles = request.args.get('percentiles', 'false').lower() == 'true'
+
+        is_resolved = db.and_(Ticket.status.in_(['RESOLVED', 'CLOSED']), Ticket.resolved_at.isnot(None))
+        resolution_seconds = func.timestampdiff(literal_column('SECOND'), Ticket.created_at, Ticket.resolved_at)
+
+        rows = (
+            db.session.query(
+                User.id,
+                User.full_name,
+                User.emp_id,
+                func.count(Ticket.id).label('assigned'),
+                func.sum(case((is_resolved, 1), else_=0)).label('resolved'),
+                func.avg(case((is_resolved, resolution_seconds))).label('avg_seconds'),
+            )
+            .join(Ticket, Ticket.assigned_to == User.id)
+            .filter(User.role_id == agent_role_id, User.is_active == True, *ticket_filters)
+            .group_by(User.id, User.full_name, User.emp_id)
+            .all()
+        )
+
+        percentiles = {}
+        if want_percentiles and rows:
+            # Rank each agent's resolved tickets by duration; p-th percentile is
+            # the row at rank CEIL(p * n) within the agent's partition.
+            ranked = (
+                db.session.query(
+                    Ticket.assigned_to.label('agent_id'),
+                    resolution_seconds.label('seconds'),
+                    func.row_number().over(partition_by=Ticket.assigned_to, order_by=resolution_seconds).label('rn'),
+                    func.count().over(partition_by=Ticket.assigned_to).label('n'),
+                )
+                .filter(is_resolved, Ticket.assigned_to.in_([r.id for r in rows]), *ticket_filters)
+                .subquery()
+            )
+            for agent_id, p50, p90 in (
+                db.session.query(
+                    ranked.c.agent_id,
+                    func.max(case((ranked.c.rn == func.ceil(0.5 * ranked.c.n), ranked.c.seconds))),
+                    func.max(case((ranked.c.rn == func.ceil(0.9 * ranked.c.n), ranked.c.seconds))),
+                )
+                .group_by(ranked.c.agent_id)
+                .all()
+            ):
+                percentiles[agent_id] = (p50, p90)
+
+        def _hours(seconds):
+            return round(float(seconds) / 3600, 1) if seconds is not None else None
+
         result = []
-        for agent in agents:
-            assigned = Ticket.query.filter_by(assigned_to=agent.id).count()
-            if assigned == 0:
-                continue
-            resolved_tickets = Ticket.query.filter(
-                Ticket.assigned_to == agent.id,
-                Ticket.status.in_(['RESOLVED', 'CLOSED']),
-                Ticket.resolved_at.isnot(None)
-            ).all()
-            resolved_count = len(resolved_tickets)
-
-            # Average resolution time in hours
-            avg_hours = None
-            if resolved_count > 0:
-                total_seconds = 0
-                for t in resolved_tickets:
-                    if t.resolved_at and t.created_at:
-                        r_at = t.resolved_at.replace(tzinfo=timezone.utc) if t.resolved_at.tzinfo is None else t.resolved_at
-                        c_at = t.created_at.replace(tzinfo=timezone.utc) if t.created_at.tzinfo is None else t.created_at
-                        total_seconds += (r_at - c_at).total_seconds()
-                avg_hours = round(total_seconds / 3600 / resolved_count, 1)
-
-            resolution_rate = round((resolved_count / assigned) * 100, 1) if assigned else 0
-            result.append({
-                "agent": agent.full_name,
-                "emp_id": agent.emp_id or "",
-                "assigned": assigned,
+        for row in rows:
+            resolved_count = int(row.resolved or 0)
+            entry = {
+                "agent_id": row.id,
+                "agent": row.full_name,
+                "emp_id": row.emp_id or "",
+                "assigned": row.assigned,
                 "resolved": resolved_count,
-                "resolution_rate": resolution_rate,
-                "avg_resolution_hours": avg_hours
-            })
+                "resolution_rate": round((resolved_count / row.assigned) * 100, 1) if row.assigned else 0,
+                "avg_resolution_hours": _hours(row.avg_seconds) if resolved_count else None
+            }
+            if want_percentiles:
+                p50, p90 = percentiles.get(row.id, (None, None))
+                entry["p50_resolution_hours"] = _hours(p50)
+                entry["p90_resolution_hours"] = _hours(p90)
+            result.append(entry)
 
         result.sort(key=lambda x: x["resolution_rate"], reverse=True)
         return jsonify({"success": True, "data": result}), 200
@@ -192,56 +247,74 @@ def agent_performance():
 # ─────────────────────────────────────────────
 @analytics_bp.route('/sla-compliance', methods=['GET'])
 @jwt_required()
+@cached_view('analytics.sla_compliance')
 def sla_compliance():
-    """Global SLA compliance % + per-department breakdown."""
+    """
+    Global SLA compliance % + per-department breakdown, in one query.
+
+    ?days=7|30|90 restricts to tickets created in that window; any other
+    value (or none) covers all tickets.
+    """
     try:
         now = datetime.now(timezone.utc)
-        base_query, _ = _base_query()
-        ticket_ids = [t.id for t in base_query.with_entities(Ticket.id).all()]
+        criteria, _ = _scope_criteria()
+
+        window_days = request.args.get('days', type=int)
+        if window_days in SLA_WINDOWS:
+            criteria.append(Ticket.created_at >= now - timedelta(days=window_days))
+        else:
+            window_days = None
+
+        # Breached = deadline passed while still unresolved
+        is_breached = case(
+            (db.and_(Ticket.sla_deadline < now, Ticket.status.notin_(['RESOLVED', 'CLOSED'])), 1),
+            else_=0
+        )
 
-        # Only tickets that have an SLA deadline set
-        sla_tickets = Ticket.query.filter(
-            Ticket.id.in_(ticket_ids),
-            Ticket.sla_deadline.isnot(None)
-        ).all()
+        # Aggregate on tickets alone (index-only via ix_tickets_sla_cover),
+        # then attach department names in the same statement.
+        from app.models.department import Department
+        per_dept = (
+            db.session.query(
+                Ticket.department_id.label('department_id'),
+                func.count(Ticket.id).label('total'),
+                func.sum(is_breached).label('breached')
+            )
+            .filter(Ticket.sla_deadline.isnot(None), *criteria)
+            .group_by(Ticket.department_id)
+            .subquery()
+        )
+        rows = (
+            db.session.query(Department.name, per_dept.c.total, per_dept.c.breached)
+            .join(per_dept, per_dept.c.department_id == Department.id)
+            .all()
+        )
 
-        total_sla = len(sla_tickets)
+        total_sla = 0
         breached = 0
-        for t in sla_tickets:
-            sla_d = t.sla_deadline.replace(tzinfo=timezone.utc) if t.sla_deadline.tzinfo is None else t.sla_deadline
-            if sla_d < now and t.status not in ['RESOLVED', 'CLOSED']:
-                breached += 1
-        
-        met = total_sla - breached
-        compliance_pct = round((met / total_sla) * 100, 1) if total_sla else 100.0
-
-        # Per-department SLA compliance
-        from app.models.department import Department
-        departments = Department.query.all()
         dept_breakdown = []
-        for dept in departments:
-            dept_tickets = [t for t in sla_tickets if t.department_id == dept.id]
-            if not dept_tickets:
-                continue
-            dept_breached = 0
-            for t in dept_tickets:
-                sla_d = t.sla_deadline.replace(tzinfo=timezone.utc) if t.sla_deadline.tzinfo is None else t.sla_deadline
-                if sla_d < now and t.status not in ['RESOLVED', 'CLOSED']:
-                    dept_breached += 1
-            dept_met = len(dept_tickets) - dept_breached
-            dept_pct = round((dept_met / len(dept_tickets)) * 100, 1)
+        for row in rows:
+            dept_breached = int(row.breached or 0)
+            dept_met = row.total - dept_breached
+            total_sla += row.total
+            breached += dept_breached
             dept_breakdown.append({
-                "department": dept.name,
-                "total": len(dept_tickets),
+                "department": row.name,
+                "total": row.total,
                 "met": dept_met,
                 "breached": dept_breached,
-                "compliance_pct": dept_pct
+                "compliance_pct": round((dept_met / row.total) * 100, 1)
             })
+
+        met = total_sla - breached
+        compliance_pct = round((met / total_sla) * 100, 1) if total_sla else 100.0
+
         dept_breakdown.sort(key=lambda x: x["compliance_pct"])
 
         return jsonify({
             "success": True,
             "data": {
+                "window_days": window_days,
                 "total_with_sla": total_sla,
                 "met": met,
                 "breached": breached,
@@ -253,18 +326,73 @@ def sla_compliance():
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+def _top_suggestions(scoped, limit):
+    """
+    {suggestion: count} for the most frequent suggestions.
+    Expands the JSON arrays in SQL with JSON_TABLE (MySQL 8+); on servers
+    without it (e.g. MariaDB < 10.6) falls back to streaming just the
+    suggestions column and counting in Python.
+    """
+    suggestions = func.json_table(
+        Feedback.suggestions,
+        literal_column("'$[*]' COLUMNS (suggestion VARCHAR(255) PATH '$')")
+    ).table_valued('suggestion').alias('jt')
+
+    try:
+        rows = (
+            scoped(
+                db.session.query(suggestions.c.suggestion, func.count().label('n'))
+                .select_from(Feedback)
+                .join(suggestions, true())
+            )
+            .filter(suggestions.c.suggestion.isnot(None))
+            .group_by(suggestions.c.suggestion)
+            .order_by(func.count().desc())
+            .limit(limit)
+            .all()
+        )
+        return {suggestion: n for suggestion, n in rows}
+    except DBAPIError as e:
+        db.session.rollback()
+        logger.warning(f"JSON_TABLE unavailable, counting suggestions in Python: {e}")
+
+    counts = {}
+    query = scoped(db.session.query(Feedback.suggestions).select_from(Feedback)).filter(Feedback.suggestions.isnot(None))
+    for (items,) in query.yield_per(1000):
+        for item in items or []:
+            counts[item] = counts.get(item, 0) + 1
+    return dict(sorted(counts.items(), key=lambda x: x[1], reverse=True)[:limit])
+
+
 # ─────────────────────────────────────────────
 # 6. Feedback Summary
 # ─────────────────────────────────────────────
 @analytics_bp.route('/feedback-summary', methods=['GET'])
 @jwt_required()
+@cached_view('analytics.feedback_summary', scope=global_scope, extra_tags=(FEEDBACK,))
 def get_feedback_summary():
-    """Total feedback count, average rating and distribution per star."""
+    """
+    Total feedback count, average rating and distribution per star.
+
+    Query params:
+        date_from / date_to   restrict to feedback submitted in the range
+        department_id         restrict to feedback on that department's tickets
+    """
     try:
-        from app.models.feedback import Feedback
-        feedbacks = Feedback.query.all()
-        total = len(feedbacks)
+        criteria = date_range_criteria(Feedback.created_at)
+        dept_id = request.args.get('department_id', type=int)
+
+        def _scoped(query):
+            if dept_id:
+                query = query.join(Ticket, Ticket.id == Feedback.ticket_id).filter(Ticket.department_id == dept_id)
+            return query.filter(*criteria)
+
+        # One row per distinct rating value — total/avg/distribution derive from it
+        rating_rows = _scoped(
+            db.session.query(Feedback.rating, func.count(Feedback.id)).select_from(Feedback)
+        ).group_by(Feedback.rating).all()
 
+        total = sum(count for _, count in rating_rows)
         if total == 0:
             return jsonify({
                 "success": True,
@@ -276,21 +404,14 @@ def get_feedback_summary():
                 }
             }), 200
 
-        avg_rating = round(sum(f.rating for f in feedbacks) / total, 2)
+        avg_rating = round(sum(rating * count for rating, count in rating_rows) / total, 2)
 
         rating_distribution = {str(i): 0 for i in range(1, 6)}
-        for f in feedbacks:
-            key = str(max(1, min(5, f.rating)))
-            rating_distribution[key] = rating_distribution.get(key, 0) + 1
+        for rating, count in rating_rows:
+            key = str(max(1, min(5, rating)))
+            rating_distribution[key] += count
 
-        suggestion_counts = {}
-        for f in feedbacks:
-            if f.suggestions:
-                for s in f.suggestions:
-                    suggestion_counts[s] = suggestion_counts.get(s, 0) + 1
-
-        # Return top 5 suggestions
-        top_suggestions = dict(sorted(suggestion_counts.items(), key=lambda x: x[1], reverse=True)[:5])
+        top_suggestions = _top_suggestions(_scoped, limit=5)
 
         return jsonify({
             "success": True,
@@ -303,3 +424,62 @@ def get_feedback_summary():
         }), 200
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
+
+
+# ─────────────────────────────────────────────
+# 7. Latency Percentiles  (resolution / time-to-assign)
+# ─────────────────────────────────────────────
+@analytics_bp.route('/latency-percentiles', methods=['GET'])
+@roles_required('ADMIN', 'TEAM_LEAD', 'AGENT')
+@cached_view('analytics.latency_percentiles')
+def latency_percentiles():
+    """
+    p50/p90/p99 (seconds) of resolution time or time-to-assign, overall and
+    per priority, from the latency histograms — no ticket scan.
+
+    Query params:
+        metric=resolution|time_to_assign   (default resolution)
+        days                               events in the last N days (default 30, 1–365)
+        department_id                      ADMIN only; team leads / agents always
+                                           see their own department
+        priority                           restrict to one priority (P1–P4)
+    """
+    try:
+        metric = request.args.get('metric', 'resolution').upper()
+        if metric not in METRICS:
+            return jsonify({"success": False, "message": "metric must be 'resolution' or 'time_to_assign'"}), 400
+
+        days = min(max(request.args.get('days', 30, type=int), 1), 365)
+        since = (datetime.now(timezone.utc) - timedelta(days=days - 1)).date()
+
+        criteria = []
+        role, scope_dept_id, _ = get_user_scope(current_user)
+        dept_id = request.args.get('department_id', type=int) if role == 'ADMIN' else scope_dept_id
+        if role != 'ADMIN' or dept_id:
+            criteria.append(TicketLatencyHistogram.department_id == dept_id)
+        priority = request.args.get('priority')
+        if priority:
+            criteria.append(TicketLatencyHistogram.priority == priority.upper())
+
+        overall, by_priority = {}, {}
+        for prio, bucket, count in LatencyHistogramService.bucket_counts(metric, since, criteria):
+            overall[bucket] = overall.get(bucket, 0) + count
+            by_priority.setdefault(prio, {})
+            by_priority[prio][bucket] = by_priority[prio].get(bucket, 0) + count
+
+        return jsonify({
+            "success": True,
+            "data": {
+                "metric": metric,
+                "days": days,
+                "department_id": dept_id,
+                "unit": "seconds",
+                **LatencyHistogramService.percentiles(overall),
+                "by_priority": {
+                    prio: LatencyHistogramService.percentiles(buckets)
+                    for prio, buckets in sorted(by_priority.items())
+                },
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models import User, Role, PasswordResetRequest
 from app.extensions import db, limiter
+from app.services.password_hashing import PasswordHashingBusy
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, current_user
 import sqlalchemy as sa
 
@@ -89,6 +90,11 @@ def login():
         else:
             return jsonify({"success": False, "message": error}), 401
             
+    except PasswordHashingBusy as e:
+        logger.warning(f"LOGIN BUSY: {e}")
+        response = jsonify({"success": False, "message": "Login is busy, please retry in a moment"})
+        response.headers['Retry-After'] = '1'
+        return response, 503
     except Exception as e:
         logger.error(f"❌ LOGIN ERROR: {str(e)}", exc_info=True)
         return jsonify({"success": False, "message": "Server error"}), 500
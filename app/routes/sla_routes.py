@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from app.services.sla_service import SLAService
+from app.services.reference_data import reference_data
 from app.models.sla_rule import SLARule
 from app.utils.decorators import roles_required
 from app.extensions import db
@@ -15,6 +16,7 @@ def create_rule():
         data.get('priority'),
         data.get('sla_hours')
     )
+    reference_data.invalidate()
     return jsonify({"success": True, "data": rule.to_dict()}), 201
 
 @sla_bp.route('/rules', methods=['GET'])
@@ -42,6 +44,7 @@ def update_rule(id):
             return jsonify({"success": False, "message": "sla_hours must be a positive integer"}), 400
         rule.sla_hours = sla_hours
         db.session.commit()
+        reference_data.invalidate()
         return jsonify({"success": True, "data": rule.to_dict()}), 200
     except Exception as e:
         db.session.rollback()
@@ -53,4 +56,5 @@ def delete_rule(id):
     rule = SLARule.query.get_or_404(id)
     db.session.delete(rule)
     db.session.commit()
+    reference_data.invalidate()
     return jsonify({"success": True, "message": "Rule deleted"}), 200
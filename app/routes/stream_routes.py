@@ -0,0 +1,67 @@
+import json
+import logging
+from flask import Blueprint, Response, stream_with_context
+from flask_jwt_extended import jwt_required, current_user
+from app.services.event_bus import event_bus
+from app.utils.dept_isolation import get_user_scope
+
+logger = logging.getLogger(__name__)
+
+stream_bp = Blueprint('stream', __name__)
+
+# Comment frame sent when no event arrived for this long — keeps proxies and
+# mobile networks from closing an idle connection.
+HEARTBEAT_SECONDS = 15
+
+
+def _format_sse(event):
+    return (
+        f"id: {event['id']}\n"
+        f"event: {event['type']}\n"
+        f"data: {json.dumps(event)}\n\n"
+    )
+
+
+@stream_bp.route('/tickets', methods=['GET'])
+@jwt_required()
+def stream_ticket_events():
+    """
+    Server-Sent Events stream of ticket lifecycle changes.
+
+    Events are scoped exactly like apply_dept_filter():
+      ADMIN     → all tickets
+      TEAM_LEAD → tickets in their department
+      AGENT     → tickets in their department
+      EMPLOYEE  → tickets they created
+
+    Event types: TICKET_CREATED, TICKET_ASSIGNED, TICKET_STATUS_CHANGED,
+    TICKET_ESCALATED, TICKET_ESCALATION_RESOLVED, TICKET_AUTO_CLOSED,
+    TICKET_DELETED.  Each `data:` frame carries the ticket id, status,
+    assignment and priority so clients can patch their lists in place and
+    only re-fetch a ticket when they need the full detail.
+
+    NOTE: each open stream holds a worker thread — run behind a threaded or
+    async gunicorn worker class when enabling this in production.
+    """
+    # Resolve the scope now: current_user is not available once streaming starts.
+    scope = get_user_scope(current_user)
+    subscription = event_bus.subscribe(scope)
+    logger.info(f"[Stream] Subscriber connected (role={scope[0]}, dept={scope[1]}, user={scope[2]})")
+
+    def generate():
+        try:
+            yield f"retry: {HEARTBEAT_SECONDS * 1000}\n\n"
+            while True:
+                event = subscription.get(timeout=HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _format_sse(event)
+        finally:
+            event_bus.unsubscribe(subscription)
+            logger.info(f"[Stream] Subscriber disconnected (user={scope[2]}, dropped={subscription.dropped})")
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # disable nginx proxy buffering
+    return response
@@ -1,15 +1,22 @@
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import current_user
-from app.models.ticket import Ticket
+from app.models.ticket import Ticket, serialize_tickets
 from app.models.user import User, AgentProfile
 from app.models.role import Role
 from app.models.team import Team
 from app.models.team_member import TeamMember
 from app.utils.decorators import roles_required
 from app.utils.dept_isolation import apply_dept_filter, assert_dept_access
+from app.services.ticket_service import TicketService
+from app.services.event_bus import publish_ticket_event, TICKET_ASSIGNED, TICKET_STATUS_CHANGED
+from app.services.workload_ledger import workload_ledger
+from app.services.batch_assignment import BatchAssignmentService
+from app.services.bulk_ticket_service import BulkTicketService
+from app.utils.http_cache import compute_etag, is_not_modified, not_modified, attach_etag
 from app.extensions import db
-from datetime import datetime, timezone
+from sqlalchemy import func
+from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger(__name__)
 
@@ -42,14 +49,25 @@ def get_my_team_tickets():
     if not dept_id:
         return jsonify({"success": False, "message": "Team Lead has no department assigned"}), 403
 
-    tickets = Ticket.query.filter(
+    query = Ticket.query.filter(
         Ticket.department_id == dept_id,
         Ticket.status == 'OPEN',
         Ticket.assigned_to == None,
         Ticket.parent_ticket_id == None,    # ← Only show parent tickets, not children
-    ).order_by(Ticket.created_at.asc()).all()
+    )
+
+    # Conditional GET — see app/utils/http_cache.py
+    total, last_updated, versions = query.with_entities(
+        func.count(Ticket.id), func.max(Ticket.updated_at), func.sum(Ticket.row_version)
+    ).one()
+    etag = compute_etag("tl-my-tickets", current_user.id, total, last_updated, versions)
+    if is_not_modified(etag):
+        return not_modified(etag)
 
-    return jsonify({"success": True, "data": [t.to_dict() for t in tickets]}), 200
+    tickets = query.order_by(Ticket.created_at.asc()).all()
+
+    response = jsonify({"success": True, "data": serialize_tickets(tickets)})
+    return attach_etag(response, etag), 200
 
 
 @team_lead_bp.route('/tickets/<int:ticket_id>/related-reports', methods=['GET'])
@@ -141,6 +159,7 @@ def approve_ticket():
             description=f"Ticket approved by Team Lead {current_user.full_name}"
         )
         db.session.commit()
+        publish_ticket_event(TICKET_STATUS_CHANGED, ticket, previous_status='OPEN')
         return jsonify({
             "success": True,
             "message": "Ticket approved — now visible to agents in the pool",
@@ -189,13 +208,13 @@ def assign_ticket():
     ticket.updated_at = datetime.now(timezone.utc)
 
     # ── Propagate assignment to all child tickets ────────────────────────────
-    Ticket.query.filter_by(parent_ticket_id=ticket_id).update({
+    TicketService.propagate_to_children(ticket_id, {
         "assigned_to": agent_id,
         "status": "IN_PROGRESS",
         "assigned_at": datetime.now(timezone.utc),
         "accepted_at": datetime.now(timezone.utc), # Sync accepted_at
         "updated_at": datetime.now(timezone.utc)
-    }, synchronize_session=False)
+    })
 
     try:
         from app.services.audit_service import AuditService
@@ -211,6 +230,7 @@ def assign_ticket():
         )
         
         db.session.commit()
+        publish_ticket_event(TICKET_ASSIGNED, ticket)
         return jsonify({
             "success": True, 
             "message": f"Ticket assigned to {agent.full_name}",
@@ -226,63 +246,127 @@ def get_team_members():
     """
     Fetch support agents belonging to the logged-in Team Lead.
     Includes agents assigned directly on their profile and those assigned via Teams.
+
+    One query returns each agent with profile, department and the number of
+    parent tickets resolved today (UTC); active workload comes from the live
+    workload ledger.
     """
+    from app.models.department import Department
     lead_id = current_user.id
 
-    # 1. Get IDs from direct AgentProfile assignment
-    direct_ids = [p.user_id for p in AgentProfile.query.filter_by(team_lead_id=lead_id).all()]
+    # Agents assigned directly on their profile, or via a Team this lead runs
+    member_ids = db.union(
+        db.select(AgentProfile.user_id).where(AgentProfile.team_lead_id == lead_id),
+        db.select(TeamMember.user_id).join(Team, TeamMember.team_id == Team.id).where(Team.team_lead_id == lead_id),
+    )
 
-    # 2. Get IDs from Team membership associations
-    # We join TeamMember and Team where the team's lead is the current user
-    team_ids = [
-        row[0] for row in db.session.query(TeamMember.user_id)
-        .join(Team, TeamMember.team_id == Team.id)
-        .filter(Team.team_lead_id == lead_id)
+    day_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    resolved_today = func.count(Ticket.id)
+
+    rows = (
+        db.session.query(
+            User.id,
+            User.full_name,
+            User.email,
+            AgentProfile.location,
+            Department.name.label('department'),
+            resolved_today.label('resolved_today'),
+        )
+        .join(Role, Role.id == User.role_id)
+        .outerjoin(AgentProfile, AgentProfile.user_id == User.id)
+        .outerjoin(Department, Department.id == AgentProfile.department_id)
+        # Count parent resolutions only (children are tracked through parent)
+        .outerjoin(Ticket, db.and_(
+            Ticket.assigned_to == User.id,
+            Ticket.status.in_(["RESOLVED", "CLOSED"]),
+            Ticket.parent_ticket_id == None,
+            Ticket.resolved_at >= day_start,
+            Ticket.resolved_at < day_start + timedelta(days=1),
+        ))
+        .filter(User.id.in_(member_ids), Role.name == "AGENT")
+        .group_by(User.id, User.full_name, User.email, AgentProfile.location, Department.name)
         .all()
-    ]
+    )
 
-    # Combine all unique IDs
-    all_agent_ids = list(set(direct_ids + team_ids))
-
-    if not all_agent_ids:
-        return jsonify({"success": True, "data": []}), 200
-
-    # Fetch User objects for these IDs, ensuring they are actually AGENTS
-    agents = User.query.join(Role).filter(
-        User.id.in_(all_agent_ids),
-        Role.name == "AGENT"
-    ).all()
-
-    result = []
-    
-    for agent in agents:
-        # Only count parent tickets for workload (children are tracked through parent)
-        active_count = Ticket.query.filter(
-            Ticket.assigned_to == agent.id,
-            Ticket.status.in_(["OPEN", "IN_PROGRESS"]),
-            Ticket.parent_ticket_id == None,    # Count parent workload only
-        ).count()
-
-        resolved_today = Ticket.query.filter(
-            Ticket.assigned_to == agent.id,
-            Ticket.status.in_(["RESOLVED", "CLOSED"]),
-            Ticket.parent_ticket_id == None,    # Count parent resolutions only
-        ).count()
-
-        profile = agent.agent_profile
-        result.append({
-            "id": agent.id,
-            "full_name": agent.full_name,
-            "email": agent.email,
-            "department": profile.department.name if profile and profile.department else "",
-            "location": profile.location if profile else "",
-            "active_tickets": active_count,
-            "resolved_today": resolved_today,
-            "workload_status": f"Solved {resolved_today} tickets",
-            "daily_capacity": 15
-        })
+    # Active parent-ticket workload from the live ledger (no per-agent COUNT)
+    loads = workload_ledger.get_many([row.id for row in rows])
+    daily_capacity = current_app.config.get("AGENT_DAILY_CAPACITY", 15)
+
+    result = [
+        {
+            "id": row.id,
+            "full_name": row.full_name,
+            "email": row.email,
+            "department": row.department or "",
+            "location": row.location or "",
+            "active_tickets": loads[row.id].active,
+            "resolved_today": row.resolved_today,
+            "workload_status": f"Solved {row.resolved_today} tickets",
+            "daily_capacity": daily_capacity
+        }
+        for row in rows
+    ]
 
     return jsonify({
         "success": True,
         "data": result
     }), 200
+
+
+@team_lead_bp.route('/auto-assign', methods=['POST'])
+@roles_required('TEAM_LEAD', 'ADMIN')
+def batch_auto_assign():
+    """
+    Assigns every unassigned APPROVED ticket of the department to agents with
+    spare capacity, most urgent first (see app/services/batch_assignment.py).
+
+    Body (optional):
+        dry_run: true          return the plan without assigning
+        department_id: int     ADMIN only; team leads use their own department
+    """
+    data = request.get_json(silent=True) or {}
+    role = current_user.role.name if current_user.role else None
+    if role == 'ADMIN':
+        dept_id = data.get('department_id')
+        if not dept_id:
+            return jsonify({"success": False, "message": "department_id is required"}), 400
+    else:
+        dept_id = current_user.team_lead_profile.department_id if current_user.team_lead_profile else None
+        if dept_id is None:
+            return jsonify({"success": False, "message": "Team lead has no department"}), 400
+
+    try:
+        result = BatchAssignmentService.assign_department(
+            dept_id, actor_id=current_user.id, dry_run=bool(data.get('dry_run'))
+        )
+        return jsonify({"success": True, "data": result}), 200
+    except Exception as e:
+        logger.error(f"Error in batch auto-assign: {e}", exc_info=True)
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+@team_lead_bp.route('/bulk-action', methods=['POST'])
+@roles_required('TEAM_LEAD', 'ADMIN')
+def bulk_ticket_action():
+    """
+    Applies one action to many tickets in a single transaction
+    (see app/services/bulk_ticket_service.py).
+
+    Body:
+        action: approve | assign | close | escalate   (close is ADMIN only)
+        ticket_ids: [int, ...]                        at most BULK_TICKET_MAX
+        agent_id: int                                 required for assign
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        result = BulkTicketService.apply(
+            data.get('action'), data.get('ticket_ids'), current_user, agent_id=data.get('agent_id')
+        )
+        return jsonify({"success": True, "data": result}), 200
+    except PermissionError as e:
+        return jsonify({"success": False, "message": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in bulk ticket action: {e}", exc_info=True)
+        return jsonify({"success": False, "message": str(e)}), 500
@@ -1,11 +1,15 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from app.services.ticket_service import TicketService
-from app.models.ticket import Ticket
+from app.services.event_bus import event_bus, ticket_event_payload, TICKET_DELETED
+from app.services.result_cache import result_cache, FEEDBACK
+from app.models.ticket import Ticket, serialize_tickets
 from app.models.feedback import Feedback
 from app.utils.decorators import roles_required
 from app.utils.dept_isolation import apply_dept_filter
+from app.utils.http_cache import compute_etag, is_not_modified, not_modified, attach_etag
 from app.extensions import db
+from sqlalchemy import func
 from datetime import datetime, timedelta
 
 ticket_bp = Blueprint('tickets', __name__)
@@ -44,18 +48,12 @@ def get_tickets():
     if user_role == 'EMPLOYEE':
         # Employees see only their own tickets
         query = Ticket.query.filter_by(created_by=user_id).order_by(Ticket.created_at.desc())
-        if limit:
-            query = query.limit(limit)
-        tickets = query.all()
 
     elif user_role == 'TEAM_LEAD':
         # Team Lead sees ALL tickets in their department (all statuses)
         # for tracking purposes. Strict "OPEN+unassigned" view is at /team-lead/my-tickets
         dept_id = current_user.team_lead_profile.department_id if current_user.team_lead_profile else None
         query = Ticket.query.filter(Ticket.department_id == dept_id).order_by(Ticket.created_at.desc())
-        if limit:
-            query = query.limit(limit)
-        tickets = query.all()
 
     elif user_role == 'AGENT':
         # STRICT: Agents see only:
@@ -74,9 +72,6 @@ def get_tickets():
                 )
             )
         ).order_by(Ticket.created_at.desc())
-        if limit:
-            query = query.limit(limit)
-        tickets = query.all()
 
     elif user_role == 'ADMIN':
         # Admin unrestricted — sees all tickets globally
@@ -99,13 +94,25 @@ def get_tickets():
             )
             
         query = query.order_by(Ticket.created_at.desc())
-        if limit:
-            query = query.limit(limit)
-        tickets = query.all()
     else:
-        tickets = Ticket.query.filter_by(created_by=user_id).all()
+        query = Ticket.query.filter_by(created_by=user_id)
 
-    return jsonify({"success": True, "data": [t.to_dict(role=user_role) for t in tickets]}), 200
+    # ── Conditional GET: list version = (row count, newest updated_at, Σ row_version)
+    # Any create / update / delete inside this scope changes one of them, even
+    # several writes within the same second.
+    total, last_updated, versions = query.order_by(None).with_entities(
+        func.count(Ticket.id), func.max(Ticket.updated_at), func.sum(Ticket.row_version)
+    ).one()
+    etag = compute_etag("tickets", user_role, user_id, request.query_string.decode(), total, last_updated, versions)
+    if is_not_modified(etag):
+        return not_modified(etag)
+
+    if limit:
+        query = query.limit(limit)
+    tickets = query.all()
+
+    response = jsonify({"success": True, "data": serialize_tickets(tickets, role=user_role)})
+    return attach_etag(response, etag), 200
 
 def _build_progress(ticket):
     """
@@ -157,7 +164,14 @@ def _build_progress(ticket):
 @ticket_bp.route('/<int:id>', methods=['GET'])
 @jwt_required()
 def get_ticket(id):
-    ticket = Ticket.query.get_or_404(id)
+    # Load only the columns needed for access control and versioning first —
+    # a 304 never touches relationships, to_dict() or _build_progress().
+    ticket = db.session.query(
+        Ticket.id, Ticket.department_id, Ticket.created_by,
+        Ticket.assigned_to, Ticket.status, Ticket.updated_at, Ticket.row_version
+    ).filter(Ticket.id == id).first()
+    if ticket is None:
+        abort(404)
 
     user_id   = current_user.id
     user_role = current_user.role.name if current_user.role else "EMPLOYEE"
@@ -190,6 +204,14 @@ def get_ticket(id):
 
     # ADMIN — unrestricted access
 
+    # Role/user are part of the tag: AI fields are masked for employees and
+    # the can_* flags below depend on the calling agent.
+    etag = compute_etag("ticket", ticket.id, ticket.updated_at, ticket.row_version, user_role, user_id)
+    if is_not_modified(etag):
+        return not_modified(etag)
+
+    ticket = Ticket.query.get_or_404(id)
+
     ticket_dict = ticket.to_dict(role=user_role)
     if user_role == "AGENT":
         # can_accept if:
@@ -203,11 +225,12 @@ def get_ticket(id):
         ticket_dict['can_decline'] = (ticket.assigned_to == user_id)
         ticket_dict['can_resolve'] = (ticket.assigned_to == user_id and ticket.status == 'IN_PROGRESS')
 
-    return jsonify({
+    response = jsonify({
         "success": True,
         "data": ticket_dict,
         "progress": _build_progress(ticket)
-    }), 200
+    })
+    return attach_etag(response, etag), 200
 
 @ticket_bp.route('/<int:id>/assign', methods=['PATCH'])
 @roles_required('TEAM_LEAD')
@@ -274,6 +297,7 @@ def resolve_escalation(id):
 def delete_ticket(id):
     ticket = Ticket.query.get_or_404(id)
     ticket_num = ticket.ticket_number
+    event_payload = ticket_event_payload(ticket)
     db.session.delete(ticket)
     
     from app.utils.logging_utils import log_activity
@@ -286,6 +310,7 @@ def delete_ticket(id):
     )
     
     db.session.commit()
+    event_bus.publish(TICKET_DELETED, event_payload)
     return jsonify({"success": True, "message": "Ticket deleted"}), 200
 
 @ticket_bp.route('/<int:ticket_id>/feedback', methods=['POST'])
@@ -325,6 +350,7 @@ def create_feedback(ticket_id):
 
     db.session.add(new_feedback)
     db.session.commit()
+    result_cache.invalidate(FEEDBACK)
 
     return jsonify({"success": True, "data": new_feedback.to_dict()}), 201
 
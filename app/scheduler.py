@@ -8,6 +8,10 @@ from app.extensions import db
 from app.models.ticket import Ticket
 from app.models.user import User
 from app.services.audit_service import AuditService
+from app.services.ticket_service import TicketService
+from app.services.event_bus import (
+    publish_ticket_event, TICKET_ESCALATED, TICKET_STATUS_CHANGED, TICKET_AUTO_CLOSED,
+)
 from app.utils.logging_utils import log_activity
 
 logger = logging.getLogger(__name__)
@@ -72,6 +76,7 @@ def check_sla_breaches():
                     logger.error(f"Error auto-escalating ticket {ticket.id}: {e}", exc_info=True)
                 else:
                     db.session.commit()
+                    publish_ticket_event(TICKET_ESCALATED, ticket)
 
 def auto_approve_open_tickets():
     """Auto-approves OPEN tickets after 15 minutes."""
@@ -106,6 +111,7 @@ def auto_approve_open_tickets():
                     logger.error(f"Error auto-approving ticket {ticket.id}: {e}", exc_info=True)
                 else:
                     db.session.commit()
+                    publish_ticket_event(TICKET_STATUS_CHANGED, ticket, previous_status='OPEN')
 
 def auto_close_resolved_tickets():
     """Closes RESOLVED tickets after 10 minutes."""
@@ -128,11 +134,11 @@ def auto_close_resolved_tickets():
                     ticket.updated_at = now
 
                     # Synchronise children to CLOSED when the parent auto-closes
-                    Ticket.query.filter_by(parent_ticket_id=ticket.id).update({
+                    TicketService.propagate_to_children(ticket.id, {
                         "status": "CLOSED",
                         "closed_at": now,
                         "updated_at": now
-                    }, synchronize_session=False)
+                    })
 
                     # Resolve system user ID (admin@resolveiq.com)
                     admin = User.query.filter_by(email='admin@resolveiq.com').first()
@@ -156,6 +162,53 @@ def auto_close_resolved_tickets():
                     logger.error(f"Error auto-closing ticket {ticket.id}: {e}", exc_info=True)
                 else:
                     db.session.commit()
+                    publish_ticket_event(TICKET_AUTO_CLOSED, ticket, previous_status='RESOLVED')
+
+def reconcile_ticket_rollups():
+    """Rebuilds the analytics daily rollups and latency histograms from tickets (drift safety net)."""
+    if not _app: return
+    with _app.app_context():
+        # Full backfill only when empty; afterwards only what changed in the
+        # last week (scripts/rebuild_rollups.py does a full rebuild on demand)
+        last_week = (datetime.now(timezone.utc) - timedelta(days=7)).date()
+        try:
+            from app.services.rollup_service import RollupService
+            days = None if RollupService.is_empty() else RollupService.changed_days(last_week)
+            written = RollupService.rebuild(days=days)
+            logger.info(f"ROLLUPS: Rebuilt ticket daily rollups ({written} rows)")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error rebuilding ticket rollups: {e}", exc_info=True)
+
+        try:
+            from app.services.latency_histograms import LatencyHistogramService
+            since = None if LatencyHistogramService.is_empty() else last_week
+            written = LatencyHistogramService.rebuild(since=since)
+            logger.info(f"ROLLUPS: Rebuilt ticket latency histograms ({written} rows)")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error rebuilding latency histograms: {e}", exc_info=True)
+
+def reconcile_workload_ledger():
+    """Re-seeds the agent workload ledger from tickets (drift safety net)."""
+    if not _app: return
+    with _app.app_context():
+        try:
+            from app.services.workload_ledger import workload_ledger
+            agents = workload_ledger.reconcile()
+            logger.info(f"WORKLOAD: Reconciled workload ledger ({agents} agents with active tickets)")
+        except Exception as e:
+            logger.error(f"Error reconciling workload ledger: {e}", exc_info=True)
+
+def batch_assign_tickets():
+    """Assigns pending APPROVED tickets to agents with spare capacity, per department."""
+    if not _app: return
+    with _app.app_context():
+        from app.services.batch_assignment import BatchAssignmentService
+        assigned = BatchAssignmentService.assign_all_departments()
+        total = sum(assigned.values())
+        if total:
+            logger.info(f"BATCH-ASSIGN: {total} tickets assigned across {len(assigned)} departments")
 
 def init_scheduler(app):
     """
@@ -216,6 +269,37 @@ def init_scheduler(app):
         id="auto_approve_check",
         replace_existing=True
     )
+    # Nightly, plus once at startup so a fresh rollup table gets backfilled
+    _scheduler.add_job(
+        func=reconcile_ticket_rollups,
+        trigger="cron",
+        hour=2,
+        minute=30,
+        id="rollup_reconcile",
+        next_run_time=datetime.now(timezone.utc),
+        replace_existing=True
+    )
+
+    _scheduler.add_job(
+        func=reconcile_workload_ledger,
+        trigger="interval",
+        minutes=app.config.get("WORKLOAD_RECONCILE_MINUTES", 5),
+        id="workload_reconcile",
+        next_run_time=datetime.now(timezone.utc),
+        replace_existing=True
+    )
+
+    if app.config.get("BATCH_ASSIGN_ENABLED", False):
+        _scheduler.add_job(
+            func=batch_assign_tickets,
+            trigger="interval",
+            minutes=app.config.get("BATCH_ASSIGN_MINUTES", 5),
+            id="batch_assign",
+            replace_existing=True
+        )
 
     _scheduler.start()
+    if not app.config.get("BATCH_ASSIGN_ENABLED", False) and _scheduler.get_job("batch_assign"):
+        # Persisted by an earlier run with the job enabled
+        _scheduler.remove_job("batch_assign")
     logger.info("[Scheduler] Production-Safe Background Scheduler Started (SQLAlchemyJobStore active)")
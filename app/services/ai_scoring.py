@@ -47,18 +47,9 @@ class AIScoringService:
         # Modified to score >= 80 to match Android app's accuracy calculation
         escalation_required = 1 if score >= 80 else 0
         
-        # 5. SLA Calculation (Dynamic Lookup)
-        from app.models.sla_rule import SLARule
-        
-        sla_hours = 24  # Default for P4
-        if priority == 'P1': sla_hours = 4
-        elif priority == 'P2': sla_hours = 8
-        elif priority == 'P3': sla_hours = 16
-
-        if department_id:
-            rule = SLARule.query.filter_by(department_id=department_id, priority=priority).first()
-            if rule:
-                sla_hours = rule.sla_hours
+        # 5. SLA Calculation (department rule from the in-memory matrix, else default)
+        from app.services.sla_service import SLAService
+        sla_hours = SLAService.sla_hours(department_id, priority)
         
         from datetime import timezone
         sla_deadline = datetime.now(timezone.utc) + timedelta(hours=sla_hours)
@@ -1,9 +1,11 @@
 import logging
 from flask_jwt_extended import create_access_token
 from app.models.user import User, TeamLeadProfile, AgentProfile, EmployeeProfile
-from app.models.role import Role
+from app.services.reference_data import reference_data
 from app.extensions import db
 from app.utils.logging_utils import log_activity
+from app.utils.principal import principal_cache, principal_claims
+from app.services.password_hashing import PasswordHashingBusy, password_hashing
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +40,8 @@ class AuthService:
                 return None, f"EMP ID {emp_id} already exists"
 
             # 2. Get Role
-            role = Role.query.filter_by(name=role_name).first()
-            if not role:
+            role_id = reference_data.role_id(role_name)
+            if not role_id:
                 logger.error(f"Role '{role_name}' not found in database.")
                 return None, f"Role {role_name} not found"
 
@@ -48,7 +50,7 @@ class AuthService:
                 full_name=full_name,
                 email=email,
                 emp_id=emp_id,
-                role_id=role.id,
+                role_id=role_id,
                 is_active=True,
                 require_password_change=data.get('require_password_change', False) if role_name != 'EMPLOYEE' else False
             )
@@ -121,8 +123,14 @@ class AuthService:
             user = User.query.filter_by(email=email).first()
             if not user:
                 return None, "Incorrect email"
-            if not user.check_password(password):
+
+            # bcrypt runs on the bounded hashing pool; also yields the upgraded
+            # hash for legacy / low-cost hashes (app/services/password_hashing.py)
+            is_valid, new_hash = password_hashing.verify(password, user.password_hash)
+            if not is_valid:
                 return None, "Incorrect password"
+            if new_hash:
+                user.upgrade_password_hash(new_hash)
             
             # Log the login activity
             log_activity(
@@ -135,13 +143,15 @@ class AuthService:
             db.session.commit()
 
             # Generate JWT Token
-            access_token = create_access_token(identity=str(user.id))
+            access_token = create_access_token(identity=str(user.id), additional_claims=principal_claims(user))
 
             return {
                 "access_token": access_token,
                 "user": user.to_dict()
             }, None
                 
+        except PasswordHashingBusy:
+            raise
         except Exception as e:
             logger.error(f"Error during login: {str(e)}", exc_info=True)
             return None, f"Login error: {str(e)}"
@@ -209,6 +219,7 @@ class AuthService:
             )
             
             db.session.commit()
+            principal_cache.invalidate(user_id)
             return True, "Profile updated successfully"
             
         except Exception as e:
@@ -3,54 +3,93 @@
 """
 Auto-Assignment Service
 Automatically assigns tickets to teams based on department and workload.
+
+department_workloads() loads a department's team membership in one query
+and takes each member's load from the live workload ledger
+(app/services/workload_ledger.py), so an assignment decision costs the same
+however many teams, members and tickets the department has.
 """
 
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, Optional
 from sqlalchemy.orm import Session
 from app.models.team import Team
 from app.models.ticket import Ticket
-from app.services.risk_calculator import calculate_agent_workload
+from app.services.workload_ledger import workload_ledger
+
+
+@dataclass
+class DepartmentWorkload:
+    """Weighted workload per team and per team member of one department."""
+    team_load: Dict[int, int] = field(default_factory=dict)                 # team_id -> sum over all members
+    agent_load: Dict[int, Dict[int, int]] = field(default_factory=dict)     # team_id -> {agent user_id -> load}
+
+    def least_loaded_team(self) -> Optional[int]:
+        if not self.team_load:
+            return None
+        return min(self.team_load, key=lambda team_id: (self.team_load[team_id], team_id))
+
+    def least_loaded_agent(self, team_id: int) -> Optional[int]:
+        agents = self.agent_load.get(team_id)
+        if not agents:
+            return None
+        return min(agents, key=lambda user_id: (agents[user_id], user_id))
 
 
-def auto_assign_ticket_to_team(ticket: "Ticket", db: Session) -> Optional[int]:
+def department_workloads(department_id: int, db: Session, team_id: Optional[int] = None) -> DepartmentWorkload:
+    """
+    Weighted load per (team, member) for every team in the department — or
+    just `team_id`.  One membership query; loads come from the workload
+    ledger.  Teams without members and idle members are included with 0.
+    """
+    from app.models.team_member import TeamMember
+    from app.models.user import User
+    from app.models.role import Role
+
+    query = (
+        db.query(Team.id, TeamMember.user_id, Role.name)
+        .select_from(Team)
+        .outerjoin(TeamMember, TeamMember.team_id == Team.id)
+        .outerjoin(User, User.id == TeamMember.user_id)
+        .outerjoin(Role, Role.id == User.role_id)
+        .filter(Team.department_id == department_id)
+    )
+    if team_id is not None:
+        query = query.filter(Team.id == team_id)
+    members = query.all()
+
+    loads = workload_ledger.get_many({user_id for _, user_id, _ in members if user_id is not None})
+
+    workload = DepartmentWorkload()
+    for t_id, user_id, role_name in members:
+        load = loads[user_id].load if user_id is not None else 0
+        workload.team_load[t_id] = workload.team_load.get(t_id, 0) + load
+        workload.agent_load.setdefault(t_id, {})
+        if user_id is not None and role_name == "AGENT":
+            workload.agent_load[t_id][user_id] = load
+    return workload
+
+
+def auto_assign_ticket_to_team(ticket: "Ticket", db: Session,
+                               workloads: Optional[DepartmentWorkload] = None) -> Optional[int]:
     """
     Automatically assign a ticket to the best team in the department.
     
     Logic:
-    1. Find all teams in the ticket's department
-    2. Calculate workload for each team
-    3. Assign to team with lowest workload
+    1. Load the department's team workloads (one grouped query)
+    2. Assign to team with lowest workload
     
     Args:
         ticket: Ticket object with department_id set
         db: Database session
+        workloads: precomputed department_workloads() to reuse, if any
     
     Returns:
         team_id of assigned team, or None if no teams available
     """
-    # Get all teams in this department
-    teams = db.query(Team).filter(
-        Team.department_id == ticket.department_id
-    ).all()
-    
-    if not teams:
-        return None
-    
-    # If only one team, assign to it
-    if len(teams) == 1:
-        return teams[0].id
-    
-    # Calculate workload for each team
-    best_team = None
-    lowest_workload = float('inf')
-    
-    for team in teams:
-        workload = calculate_team_workload(team.id, db)
-        if workload < lowest_workload:
-            lowest_workload = workload
-            best_team = team
-    
-    return best_team.id if best_team else teams[0].id
+    if workloads is None:
+        workloads = department_workloads(ticket.department_id, db)
+    return workloads.least_loaded_team()
 
 
 def calculate_team_workload(team_id: int, db: Session) -> int:
@@ -66,57 +105,28 @@ def calculate_team_workload(team_id: int, db: Session) -> int:
     Returns:
         Total workload score
     """
-    from app.models.team_member import TeamMember
-    
-    # Get all agents in the team
-    team_members = db.query(TeamMember).filter(
-        TeamMember.team_id == team_id
-    ).all()
-    
-    if not team_members:
+    team = db.get(Team, team_id)
+    if team is None:
         return 0
-    
-    # Sum workloads of all agents
-    total_workload = 0
-    for member in team_members:
-        agent_workload = calculate_agent_workload(member.user_id, db)
-        total_workload += agent_workload
-    
-    return total_workload
+    return department_workloads(team.department_id, db, team_id=team_id).team_load.get(team_id, 0)
 
 
-def find_best_agent_in_team(team_id: int, db: Session) -> Optional[int]:
+def find_best_agent_in_team(team_id: int, db: Session,
+                            workloads: Optional[DepartmentWorkload] = None) -> Optional[int]:
     """
     Find the agent with the lowest workload in a team.
     
     Args:
         team_id: ID of the team
         db: Database session
+        workloads: precomputed department_workloads() to reuse, if any
     
     Returns:
         user_id of best agent, or None if no agents available
     """
-    from app.models.team_member import TeamMember
-    from app.models.user import User
-    from app.models.role import Role
-    
-    # Get all agents in the team
-    agents = db.query(User).join(TeamMember).join(Role).filter(
-        TeamMember.team_id == team_id,
-        Role.name == "AGENT"
-    ).all()
-    
-    if not agents:
-        return None
-    
-    # Find agent with lowest workload
-    best_agent = None
-    lowest_workload = float('inf')
-    
-    for agent in agents:
-        workload = calculate_agent_workload(agent.id, db)
-        if workload < lowest_workload:
-            lowest_workload = workload
-            best_agent = agent
-    
-    return best_agent.id if best_agent else None
+    if workloads is None:
+        team = db.get(Team, team_id)
+        if team is None:
+            return None
+        workloads = department_workloads(team.department_id, db, team_id=team_id)
+    return workloads.least_loaded_agent(team_id)
@@ -0,0 +1,221 @@
+"""
+app/services/batch_assignment.py
+
+Batch Auto-Assignment
+─────────────────────
+Assigns every unassigned APPROVED parent ticket of a department in one pass,
+instead of agents claiming them one at a time.
+
+  1. Tickets are taken most urgent first: earliest SLA deadline, then
+     highest ai_score, then oldest (tickets without a deadline go last).
+  2. Agents (active AGENT users of the department) sit in a min-heap keyed by
+     their current weighted load from the workload ledger.  Each ticket goes
+     to the least-loaded agent that still has capacity; capacity is
+     AGENT_DAILY_CAPACITY active tickets per agent.  An agent who DECLINED a
+     ticket (TICKET_DECLINED activity) is never handed that ticket again.
+  3. Writes are bulk: one UPDATE per receiving agent for the parents, one for
+     their children (through bulk_update_tickets, so rollups, histograms and
+     the ledger see them), one executemany activity-log insert
+     (log_activities — a single multi-row INSERT on MySQL) and a single
+     commit.  The candidate tickets are locked FOR UPDATE while planning so
+     a concurrent ACCEPT cannot double-assign.
+
+Runs on demand from the team lead endpoint POST /api/team-lead/auto-assign,
+and from the scheduler every BATCH_ASSIGN_MINUTES only when
+BATCH_ASSIGN_ENABLED is set — by default agents claim approved tickets from
+the pool themselves.
+"""
+
+import heapq
+import logging
+from datetime import datetime, timezone
+
+from flask import current_app
+
+from app.extensions import db
+from app.models.system_activity_log import SystemActivityLog
+from app.models.ticket import Ticket
+from app.services.ticket_changes import bulk_update_tickets
+from app.services.workload_ledger import PRIORITY_WEIGHTS, workload_ledger
+from app.utils.logging_utils import log_activities
+
+logger = logging.getLogger(__name__)
+
+
+def _department_agents(department_id):
+    from app.models.role import Role
+    from app.models.user import AgentProfile, User
+    rows = (
+        db.session.query(User.id)
+        .join(AgentProfile, AgentProfile.user_id == User.id)
+        .join(Role, Role.id == User.role_id)
+        .filter(AgentProfile.department_id == department_id, Role.name == 'AGENT', User.is_active == True)
+        .all()
+    )
+    return [r.id for r in rows]
+
+
+def _pending_tickets(department_id, lock):
+    query = (
+        db.session.query(Ticket.id, Ticket.priority)
+        .filter(
+            Ticket.department_id == department_id,
+            Ticket.status == 'APPROVED',
+            Ticket.assigned_to.is_(None),
+            Ticket.parent_ticket_id.is_(None),
+        )
+        .order_by(
+            Ticket.sla_deadline.is_(None),
+            Ticket.sla_deadline.asc(),
+            Ticket.ai_score.desc(),
+            Ticket.created_at.asc(),
+        )
+    )
+    if lock:
+        query = query.with_for_update()
+    return query.all()
+
+
+def _declined_by(ticket_ids):
+    """{ticket_id: {agent_id, ...}} of agents who declined each ticket."""
+    if not ticket_ids:
+        return {}
+    rows = (
+        db.session.query(SystemActivityLog.entity_id, SystemActivityLog.user_id)
+        .filter(
+            SystemActivityLog.action_type == 'TICKET_DECLINED',
+            SystemActivityLog.entity_type == 'TICKET',
+            SystemActivityLog.entity_id.in_(ticket_ids),
+        )
+        .distinct()
+        .all()
+    )
+    declined = {}
+    for ticket_id, agent_id in rows:
+        declined.setdefault(ticket_id, set()).add(agent_id)
+    return declined
+
+
+def plan_assignments(tickets, agent_loads, capacity, declined=None):
+    """
+    [(ticket_id, agent_id)] for tickets (already in urgency order) against
+    {agent_id: AgentLoad}, skipping the agents in declined[ticket_id].
+    Pure — no database access.
+    """
+    declined = declined or {}
+    heap = [
+        (load.load, load.active, agent_id)
+        for agent_id, load in agent_loads.items()
+        if load.active < capacity
+    ]
+    heapq.heapify(heap)
+
+    plan = []
+    for ticket_id, priority in tickets:
+        if not heap:
+            break
+        excluded = declined.get(ticket_id, ())
+        skipped = []
+        while heap and heap[0][2] in excluded:
+            skipped.append(heapq.heappop(heap))
+        if heap:
+            load, active, agent_id = heapq.heappop(heap)
+            plan.append((ticket_id, agent_id))
+            active += 1
+            if active < capacity:
+                heapq.heappush(heap, (load + PRIORITY_WEIGHTS.get(priority, 1), active, agent_id))
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+    return plan
+
+
+class BatchAssignmentService:
+    @staticmethod
+    def assign_department(department_id, actor_id=None, dry_run=False):
+        """
+        Assigns the department's pending tickets.  Commits unless dry_run.
+        Returns {"assigned": n, "remaining": n, "assignments": [...]}.
+        """
+        capacity = current_app.config.get('AGENT_DAILY_CAPACITY', 15)
+        try:
+            tickets = _pending_tickets(department_id, lock=not dry_run)
+            agents = _department_agents(department_id)
+            plan = plan_assignments(
+                tickets, workload_ledger.get_many(agents), capacity,
+                declined=_declined_by([t.id for t in tickets]),
+            ) if tickets and agents else []
+
+            if dry_run or not plan:
+                db.session.rollback()   # releases the row locks
+                return BatchAssignmentService._summary(plan, len(tickets))
+
+            now = datetime.now(timezone.utc)
+            by_agent = {}
+            for ticket_id, agent_id in plan:
+                by_agent.setdefault(agent_id, []).append(ticket_id)
+
+            for agent_id, ticket_ids in by_agent.items():
+                values = {
+                    "assigned_to": agent_id,
+                    "status": "IN_PROGRESS",
+                    "assigned_at": now,
+                    "accepted_at": now,
+                    "updated_at": now,
+                }
+                bulk_update_tickets([Ticket.id.in_(ticket_ids)], values)
+                bulk_update_tickets([Ticket.parent_ticket_id.in_(ticket_ids)], values)
+
+            log_activities([
+                {
+                    "user_id": actor_id,
+                    "action_type": "TICKET_ASSIGNED",
+                    "entity_type": "TICKET",
+                    "entity_id": ticket_id,
+                    "description": f"Batch auto-assigned to agent {agent_id}",
+                }
+                for ticket_id, agent_id in plan
+            ])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        BatchAssignmentService._publish([ticket_id for ticket_id, _ in plan])
+        logger.info(f"BATCH-ASSIGN: Department {department_id}: {len(plan)} of {len(tickets)} tickets assigned")
+        return BatchAssignmentService._summary(plan, len(tickets))
+
+    @staticmethod
+    def assign_all_departments(actor_id=None):
+        """Runs assign_department() for every department with pending tickets."""
+        department_ids = [
+            row[0] for row in db.session.query(Ticket.department_id).filter(
+                Ticket.status == 'APPROVED',
+                Ticket.assigned_to.is_(None),
+                Ticket.parent_ticket_id.is_(None),
+            ).distinct().all()
+        ]
+        db.session.rollback()
+
+        assigned = {}
+        for dept_id in department_ids:
+            try:
+                assigned[dept_id] = BatchAssignmentService.assign_department(dept_id, actor_id=actor_id)["assigned"]
+            except Exception as e:
+                logger.error(f"Error batch-assigning department {dept_id}: {e}", exc_info=True)
+        return assigned
+
+    @staticmethod
+    def _summary(plan, pending):
+        return {
+            "assigned": len(plan),
+            "remaining": pending - len(plan),
+            "assignments": [{"ticket_id": t, "agent_id": a} for t, a in plan],
+        }
+
+    @staticmethod
+    def _publish(ticket_ids):
+        from app.services.event_bus import event_bus, publish_ticket_event, TICKET_ASSIGNED
+        if not ticket_ids or not event_bus.has_subscribers():
+            return
+        for ticket in Ticket.query.filter(Ticket.id.in_(ticket_ids)).all():
+            publish_ticket_event(TICKET_ASSIGNED, ticket)
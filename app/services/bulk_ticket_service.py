@@ -0,0 +1,232 @@
+"""
+app/services/bulk_ticket_service.py
+
+Bulk Ticket Operations
+──────────────────────
+Applies one action — approve, assign, close or escalate — to many tickets in
+a single transaction, instead of one request / commit per ticket.
+
+  1. Validation is one query: the requested tickets are loaded (id,
+     department, status, parent) and locked FOR UPDATE.  A team lead's whole
+     request is rejected if any ticket belongs to another department; missing
+     tickets, child tickets and tickets in the wrong status are skipped and
+     reported back.
+  2. Writes are set-based: one UPDATE for the eligible parents and, for
+     assign / close, one UPDATE mirroring the change onto their children —
+     both through bulk_update_tickets, so rollups, histograms and the
+     workload ledger see them.
+  3. Audit and activity rows are written as plain parameter lists through
+     insert() — one executemany per table, which the MySQL driver sends as a
+     single multi-row INSERT (ORM objects would flush one INSERT each to read
+     back their ids); then a single commit.
+
+The transitions follow the single-ticket endpoints: approve OPEN tickets,
+assign any open ticket to an agent of the ticket's department, close
+RESOLVED tickets (ADMIN only), escalate open tickets to ESCALATED.
+"""
+
+import logging
+from datetime import datetime, timezone
+
+from flask import current_app
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models.audit_log import AuditLog
+from app.models.ticket import Ticket
+from app.services.ticket_changes import bulk_update_tickets
+from app.utils.logging_utils import log_activities
+
+logger = logging.getLogger(__name__)
+
+APPROVE = 'approve'
+ASSIGN = 'assign'
+CLOSE = 'close'
+ESCALATE = 'escalate'
+
+# action -> statuses a parent ticket may be in
+FROM_STATUSES = {
+    APPROVE: ('OPEN',),
+    ASSIGN: ('OPEN', 'APPROVED', 'IN_PROGRESS', 'ESCALATED'),
+    CLOSE: ('RESOLVED',),
+    ESCALATE: ('OPEN', 'APPROVED', 'IN_PROGRESS'),
+}
+
+# action -> roles allowed to perform it
+ROLES = {
+    APPROVE: ('TEAM_LEAD', 'ADMIN'),
+    ASSIGN: ('TEAM_LEAD', 'ADMIN'),
+    CLOSE: ('ADMIN',),
+    ESCALATE: ('TEAM_LEAD', 'ADMIN'),
+}
+
+ACTIONS = tuple(FROM_STATUSES)
+
+
+def _ticket_ids(raw, limit):
+    if not isinstance(raw, list) or not raw:
+        raise ValueError("ticket_ids must be a non-empty list")
+    try:
+        ids = list(dict.fromkeys(int(t) for t in raw))
+    except (TypeError, ValueError):
+        raise ValueError("ticket_ids must be integers")
+    if len(ids) > limit:
+        raise ValueError(f"At most {limit} tickets per bulk request")
+    return ids
+
+
+def _agent(agent_id):
+    from app.models.user import User
+    agent = db.session.get(User, agent_id) if agent_id else None
+    if agent is None:
+        raise ValueError("agent_id is required for assign")
+    if not agent.role or agent.role.name != 'AGENT':
+        raise ValueError("Can only assign tickets to Support Agents")
+    return agent
+
+
+class BulkTicketService:
+    @staticmethod
+    def apply(action, ticket_ids, user, agent_id=None):
+        """
+        Applies `action` to the tickets and commits.
+        Returns {"action", "updated": [ids], "children_updated": n, "skipped": [{ticket_id, reason}]}.
+        Raises ValueError on a bad request and PermissionError on a role or
+        department violation (nothing is written in either case).
+        """
+        role = user.role.name if user.role else None
+        if action not in ACTIONS:
+            raise ValueError(f"action must be one of: {', '.join(ACTIONS)}")
+        if role not in ROLES[action]:
+            raise PermissionError(f"Role {role} cannot {action} tickets")
+        ids = _ticket_ids(ticket_ids, current_app.config.get('BULK_TICKET_MAX', 100))
+
+        dept_id = None
+        if role == 'TEAM_LEAD':
+            dept_id = user.team_lead_profile.department_id if user.team_lead_profile else None
+            if dept_id is None:
+                raise PermissionError("Team lead has no department")
+
+        agent = _agent(agent_id) if action == ASSIGN else None
+        agent_dept = agent.agent_profile.department_id if agent and agent.agent_profile else None
+        if agent is not None and dept_id is not None and agent_dept != dept_id:
+            raise PermissionError("Agent belongs to a different department — cross-department assignment rejected")
+
+        try:
+            rows = (
+                db.session.query(Ticket.id, Ticket.department_id, Ticket.status, Ticket.parent_ticket_id)
+                .filter(Ticket.id.in_(ids))
+                .with_for_update()
+                .all()
+            )
+            if dept_id is not None:
+                foreign = sorted(r.id for r in rows if r.department_id != dept_id)
+                if foreign:
+                    raise PermissionError(f"Access denied: tickets {foreign} belong to a different department")
+
+            found = {r.id: r for r in rows}
+            eligible, skipped, previous = [], [], {}
+            for ticket_id in ids:
+                row = found.get(ticket_id)
+                if row is None:
+                    reason = "not found"
+                elif row.parent_ticket_id is not None:
+                    reason = "child ticket — act on its parent"
+                elif row.status not in FROM_STATUSES[action]:
+                    reason = f"status is {row.status}"
+                elif agent is not None and row.department_id != agent_dept:
+                    reason = "agent belongs to a different department"
+                else:
+                    eligible.append(ticket_id)
+                    previous[ticket_id] = row.status
+                    continue
+                skipped.append({"ticket_id": ticket_id, "reason": reason})
+
+            children = 0
+            if eligible:
+                values, child_values = BulkTicketService._values(action, user, agent)
+                bulk_update_tickets([Ticket.id.in_(eligible)], values)
+                if child_values:
+                    children = bulk_update_tickets([Ticket.parent_ticket_id.in_(eligible)], child_values)
+                BulkTicketService._log(action, user, agent, eligible)
+                db.session.commit()
+            else:
+                db.session.rollback()   # releases the row locks
+        except Exception:
+            db.session.rollback()
+            raise
+
+        BulkTicketService._publish(action, eligible, previous)
+        logger.info(f"BULK-{action.upper()}: {len(eligible)} of {len(ids)} tickets updated by user {user.id}")
+        return {
+            "action": action,
+            "updated": eligible,
+            "children_updated": children,
+            "skipped": skipped,
+        }
+
+    @staticmethod
+    def _values(action, user, agent):
+        """(parent values, child values | None) for the action."""
+        now = datetime.now(timezone.utc)
+        if action == APPROVE:
+            return {"status": "APPROVED", "approved_by": user.id, "approved_at": now, "updated_at": now}, None
+        if action == ASSIGN:
+            values = {
+                "assigned_to": agent.id,
+                "status": "IN_PROGRESS",
+                "assigned_at": now,
+                "accepted_at": now,
+                "updated_at": now,
+            }
+            return values, values
+        if action == CLOSE:
+            values = {"status": "CLOSED", "closed_at": now, "updated_at": now}
+            return values, values
+        return {"status": "ESCALATED", "escalation_required": True, "updated_at": now}, None
+
+    @staticmethod
+    def _log(action, user, agent, ticket_ids):
+        if action == APPROVE:
+            audit, action_type = "TL_APPROVED: Ticket approved (bulk)", "TICKET_APPROVED"
+            description = f"Ticket approved by {user.full_name} (bulk)"
+        elif action == ASSIGN:
+            audit, action_type = f"TL_ASSIGNED: Ticket assigned to agent {agent.full_name} (bulk)", "TICKET_ASSIGNED"
+            description = f"Ticket assigned to agent {agent.full_name} by {user.full_name} (bulk)"
+        elif action == CLOSE:
+            audit, action_type = "STATUS_UPDATED: RESOLVED -> CLOSED (bulk)", "MANUAL_CLOSED"
+            description = f"Ticket manually closed by {user.full_name} (bulk)"
+        else:
+            audit, action_type = "ESCALATED: Ticket manually escalated (bulk)", "TICKET_ESCALATED"
+            description = f"Ticket escalated by {user.full_name} (bulk)"
+
+        db.session.execute(insert(AuditLog), [
+            {"action": audit, "performed_by": user.id, "ticket_id": ticket_id}
+            for ticket_id in ticket_ids
+        ])
+        log_activities([
+            {
+                "user_id": user.id,
+                "action_type": action_type,
+                "entity_type": "TICKET",
+                "entity_id": ticket_id,
+                "description": description,
+            }
+            for ticket_id in ticket_ids
+        ])
+
+    @staticmethod
+    def _publish(action, ticket_ids, previous):
+        from app.services.event_bus import (
+            event_bus, publish_ticket_event,
+            TICKET_ASSIGNED, TICKET_ESCALATED, TICKET_STATUS_CHANGED,
+        )
+        if not ticket_ids or not event_bus.has_subscribers():
+            return
+        for ticket in Ticket.query.filter(Ticket.id.in_(ticket_ids)).all():
+            if action == ASSIGN:
+                publish_ticket_event(TICKET_ASSIGNED, ticket)
+            elif action == ESCALATE:
+                publish_ticket_event(TICKET_ESCALATED, ticket)
+            else:
+                publish_ticket_event(TICKET_STATUS_CHANGED, ticket, previous_status=previous[ticket.id])
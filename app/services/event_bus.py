@@ -0,0 +1,158 @@
+"""
+app/services/event_bus.py
+
+In-Process Ticket Event Bus
+───────────────────────────
+A small publish/subscribe hub used to push ticket lifecycle changes to
+connected clients (see app/routes/stream_routes.py) instead of having every
+dashboard poll the ticket list endpoints.
+
+  - publish_ticket_event() is called AFTER the mutating transaction commits,
+    from TicketService, the role-specific routes and the scheduler jobs.
+  - Every SSE connection owns a Subscription with a bounded queue.  Events are
+    filtered by the subscriber's department scope at publish time, so a
+    connection only ever receives events it is allowed to see.
+  - The bus is per-process: each worker fans out the events produced by its
+    own requests and its own scheduler instance.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+
+from app.utils.dept_isolation import scope_allows
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Event types
+# ─────────────────────────────────────────────────────────────────────────────
+TICKET_CREATED = "TICKET_CREATED"
+TICKET_ASSIGNED = "TICKET_ASSIGNED"
+TICKET_STATUS_CHANGED = "TICKET_STATUS_CHANGED"
+TICKET_ESCALATED = "TICKET_ESCALATED"
+TICKET_ESCALATION_RESOLVED = "TICKET_ESCALATION_RESOLVED"
+TICKET_AUTO_CLOSED = "TICKET_AUTO_CLOSED"
+TICKET_DELETED = "TICKET_DELETED"
+
+# Events whose effect is mirrored onto child tickets (see child propagation
+# in TicketService / agent_routes / scheduler).
+PROPAGATED_EVENTS = {TICKET_ASSIGNED, TICKET_STATUS_CHANGED, TICKET_AUTO_CLOSED}
+
+# Max undelivered events held per connection before the oldest are dropped.
+SUBSCRIBER_QUEUE_SIZE = 200
+
+
+class Subscription:
+    """A single consumer (usually one SSE connection) attached to the bus."""
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+
+    def offer(self, event):
+        """Enqueue without blocking; drops the oldest event when full."""
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        """Returns the next event, or None if nothing arrived within timeout."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBus:
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    def subscribe(self, scope):
+        sub = Subscription(scope)
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def publish(self, event_type, payload):
+        """
+        Fans an event out to every subscriber whose scope can see it.
+        payload must contain department_id and created_by for scope checks.
+        """
+        event = {
+            "id": next(self._sequence),
+            "type": event_type,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "data": payload,
+        }
+        with self._lock:
+            targets = list(self._subscribers)
+
+        for sub in targets:
+            if scope_allows(sub.scope, payload.get("department_id"), payload.get("created_by")):
+                sub.offer(event)
+        return event
+
+
+event_bus = EventBus()
+
+
+def ticket_event_payload(ticket, **extra):
+    payload = {
+        "ticket_id": ticket.id,
+        "ticket_number": ticket.ticket_number,
+        "department_id": ticket.department_id,
+        "created_by": ticket.created_by,
+        "assigned_to": ticket.assigned_to,
+        "status": ticket.status,
+        "priority": ticket.priority,
+        "escalation_required": ticket.escalation_required,
+        "parent_ticket_id": ticket.parent_ticket_id,
+    }
+    payload.update(extra)
+    return payload
+
+
+def publish_ticket_event(event_type, ticket, **extra):
+    """
+    Publishes a ticket event and, for propagated events on parent tickets,
+    one event per child ticket so the child's creator is notified as well.
+    Must be called after the transaction has been committed.
+    Never raises — a failed push must not fail the request that caused it.
+    """
+    if not event_bus.has_subscribers():
+        return
+    try:
+        event_bus.publish(event_type, ticket_event_payload(ticket, **extra))
+
+        if event_type in PROPAGATED_EVENTS and ticket.parent_ticket_id is None:
+            from app.extensions import db
+            from app.models.ticket import Ticket
+            children = db.session.query(
+                Ticket.id, Ticket.ticket_number, Ticket.department_id, Ticket.created_by,
+                Ticket.assigned_to, Ticket.status, Ticket.priority,
+                Ticket.escalation_required, Ticket.parent_ticket_id,
+            ).filter(Ticket.parent_ticket_id == ticket.id).all()
+            for child in children:
+                event_bus.publish(event_type, ticket_event_payload(child, **extra))
+    except Exception as e:
+        logger.warning(f"⚠️ Event publish failed for ticket {getattr(ticket, 'id', None)}: {e}")
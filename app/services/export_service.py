@@ -0,0 +1,138 @@
+"""
+app/services/export_service.py
+
+Streaming Exports
+─────────────────
+Row generators for bulk exports of tickets and system activity logs.
+
+  1. Column-only SELECTs (user / department names joined in SQL) — no ORM
+     objects are built, so nothing accumulates in the session.
+  2. Rows are fetched with a server-side cursor in batches of EXPORT_BATCH_SIZE
+     (yield_per), so memory stays flat however many rows match.
+  3. write_csv() / write_ndjson() turn a row generator into encoded chunks,
+     one per batch, suitable for a streamed Flask response.
+
+The generators must be consumed inside the app context of the request that
+created them (wrap with stream_with_context).
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from app.extensions import db
+from app.models.department import Department
+from app.models.system_activity_log import SystemActivityLog
+from app.models.ticket import Ticket, format_datetime
+from app.models.user import User
+from app.models.role import Role
+
+EXPORT_BATCH_SIZE = 1000
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+TICKET_COLUMNS = [
+    'id', 'ticket_number', 'title', 'department', 'status', 'priority',
+    'created_by', 'created_by_emp_id', 'assigned_to', 'issue_type', 'location',
+    'ai_score', 'sla_deadline', 'parent_ticket_id',
+    'created_at', 'resolved_at', 'closed_at',
+]
+
+ACTIVITY_COLUMNS = [
+    'id', 'user', 'role', 'action_type', 'entity_type', 'entity_id',
+    'description', 'created_at',
+]
+
+
+def _stream(stmt):
+    result = db.session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for partition in result.partitions():
+        yield [
+            {k: format_datetime(v) if isinstance(v, datetime) else v for k, v in row._mapping.items()}
+            for row in partition
+        ]
+
+
+def ticket_rows(criteria):
+    """Batches of ticket dicts (TICKET_COLUMNS) matching criteria, oldest first."""
+    creator = aliased(User)
+    assignee = aliased(User)
+    stmt = (
+        select(
+            Ticket.id,
+            Ticket.ticket_number,
+            Ticket.title,
+            Department.name.label('department'),
+            Ticket.status,
+            Ticket.priority,
+            creator.full_name.label('created_by'),
+            creator.emp_id.label('created_by_emp_id'),
+            assignee.full_name.label('assigned_to'),
+            Ticket.issue_type,
+            Ticket.location,
+            Ticket.ai_score,
+            Ticket.sla_deadline,
+            Ticket.parent_ticket_id,
+            Ticket.created_at,
+            Ticket.resolved_at,
+            Ticket.closed_at,
+        )
+        .outerjoin(Department, Department.id == Ticket.department_id)
+        .outerjoin(creator, creator.id == Ticket.created_by)
+        .outerjoin(assignee, assignee.id == Ticket.assigned_to)
+        .where(*criteria)
+        .order_by(Ticket.id)
+    )
+    return _stream(stmt)
+
+
+def activity_rows(criteria):
+    """Batches of activity-log dicts (ACTIVITY_COLUMNS) matching criteria, oldest first."""
+    stmt = (
+        select(
+            SystemActivityLog.id,
+            db.func.coalesce(User.full_name, 'System').label('user'),
+            db.func.coalesce(Role.name, 'N/A').label('role'),
+            SystemActivityLog.action_type,
+            SystemActivityLog.entity_type,
+            SystemActivityLog.entity_id,
+            SystemActivityLog.description,
+            SystemActivityLog.created_at,
+        )
+        .outerjoin(User, User.id == SystemActivityLog.user_id)
+        .outerjoin(Role, Role.id == User.role_id)
+        .where(*criteria)
+        .order_by(SystemActivityLog.id)
+    )
+    return _stream(stmt)
+
+
+# ── Encoders ────────────────────────────────────────────────────────────────
+def write_csv(batches, columns):
+    """Header line, then one UTF-8 chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    yield buffer.getvalue().encode('utf-8')
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+
+
+def write_ndjson(batches, columns=None):
+    """One JSON object per line, one chunk per batch."""
+    for batch in batches:
+        yield ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in batch).encode('utf-8')
+
+
+def encode(fmt, batches, columns):
+    return write_csv(batches, columns) if fmt == 'csv' else write_ndjson(batches, columns)
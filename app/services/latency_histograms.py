@@ -0,0 +1,203 @@
+"""
+app/services/latency_histograms.py
+
+Ticket Latency Histograms
+─────────────────────────
+Keeps ticket_latency_histograms (app/models/ticket_latency_histogram.py) so
+p50/p90/p99 of resolution time and time-to-assign are read from a few
+hundred bucket rows instead of scanning tickets.
+
+  1. Buckets are fixed and log-scaled (HDR-style): bucket b holds durations
+     in (2^((b-1)/4), 2^(b/4)] seconds, i.e. four buckets per doubling.  A
+     percentile is reported as its bucket's upper bound, which overstates
+     the exact value by at most ~19%.  Bucket 0 holds durations <= 1s.
+  2. Incremental: a ticket-change handler (app/services/ticket_changes.py)
+     removes a ticket's old contribution and adds its new one whenever
+     created_at / assigned_at / resolved_at / department / priority change —
+     so reopening a ticket (resolved_at cleared) takes it back out.
+  3. Rebuild: LatencyHistogramService.rebuild() recomputes the counts from
+     tickets (streamed, bucketed in Python so it matches the incremental
+     path exactly).  The scheduler's nightly rollup reconcile runs it.
+"""
+
+import logging
+import math
+from datetime import timezone
+
+from sqlalchemy import delete, func, select
+
+from app.extensions import db
+from app.models.ticket import Ticket
+from app.models.ticket_latency_histogram import TicketLatencyHistogram
+from app.services.rollup_service import upsert_counts
+
+logger = logging.getLogger(__name__)
+
+RESOLUTION = 'RESOLUTION'
+TIME_TO_ASSIGN = 'TIME_TO_ASSIGN'
+
+# metric -> Ticket column that ends the measured interval (starts at created_at)
+METRICS = {
+    RESOLUTION: 'resolved_at',
+    TIME_TO_ASSIGN: 'assigned_at',
+}
+
+BUCKETS_PER_DOUBLING = 4
+MAX_BUCKET = 120             # 2^30 s ≈ 34 years; anything longer is clamped
+
+_DEFAULT_PRIORITY = 'P4'
+_KEY_COLUMNS = ('metric', 'department_id', 'priority', 'day', 'bucket')
+_REBUILD_CHUNK = 1000
+
+
+def bucket_for(seconds):
+    """Bucket index of a duration in seconds."""
+    if seconds <= 1:
+        return 0
+    # Rounded so a bucket's own upper bound (2^(b/4), inexact in floating
+    # point) is not pushed into the next bucket by log2's rounding error
+    return min(math.ceil(round(BUCKETS_PER_DOUBLING * math.log2(seconds), 9)), MAX_BUCKET)
+
+
+def bucket_upper_seconds(bucket):
+    """Largest duration (seconds) counted in the bucket."""
+    return 2 ** (bucket / BUCKETS_PER_DOUBLING)
+
+
+def _naive_utc(dt):
+    if dt is not None and dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _entries(department_id, priority, created_at, ends):
+    """Histogram keys a ticket counts towards; ends = {metric: end datetime}."""
+    created_at = _naive_utc(created_at)
+    if created_at is None or department_id is None:
+        return []
+    keys = []
+    for metric, end in ends.items():
+        end = _naive_utc(end)
+        if end is None:
+            continue
+        seconds = max((end - created_at).total_seconds(), 0)
+        keys.append((metric, department_id, priority or _DEFAULT_PRIORITY, end.date(), bucket_for(seconds)))
+    return keys
+
+
+def _ticket_entries(values):
+    return _entries(
+        values.get('department_id'),
+        values.get('priority'),
+        values.get('created_at'),
+        {metric: values.get(field) for metric, field in METRICS.items()},
+    )
+
+
+def apply_ticket_changes(session, changes):
+    """Ticket-change handler: moves each ticket's latency samples between buckets."""
+    deltas = {}
+    for change in changes:
+        if change.old is not None:
+            for key in _ticket_entries(change.old):
+                deltas[key] = deltas.get(key, 0) - 1
+        if change.new is not None:
+            for key in _ticket_entries(change.new):
+                deltas[key] = deltas.get(key, 0) + 1
+
+    rows = [
+        dict(zip(_KEY_COLUMNS, key), ticket_count=delta)
+        for key, delta in deltas.items() if delta
+    ]
+    if rows:
+        upsert_counts(session.connection(), TicketLatencyHistogram.__table__, _KEY_COLUMNS, rows)
+
+
+def init_latency_histograms():
+    from app.services.ticket_changes import on_ticket_changes
+    on_ticket_changes(apply_ticket_changes)
+
+
+class LatencyHistogramService:
+    @staticmethod
+    def is_empty():
+        return db.session.query(TicketLatencyHistogram.id).first() is None
+
+    @staticmethod
+    def rebuild(since=None):
+        """
+        Recomputes the histograms — every day, or only event days >= `since`
+        (a date).  Commits.  Returns the number of histogram rows written.
+
+        The purge runs first, in a fresh transaction: its row / gap locks hold
+        back concurrent histogram upserts until the commit, and the tickets are
+        read afterwards, so a ticket change committed meanwhile is either in
+        the read or applied on top of the rebuilt rows — never purged and lost.
+        """
+        table = TicketLatencyHistogram.__table__
+        purge = delete(table)
+        if since is not None:
+            purge = purge.where(table.c.day >= since)
+
+        # End any transaction the caller opened (e.g. is_empty()) so the read
+        # snapshot below is taken after the purge, not before it
+        db.session.commit()
+        try:
+            db.session.execute(purge)
+
+            counts = {}
+            for metric, field in METRICS.items():
+                end_col = getattr(Ticket, field)
+                stmt = select(Ticket.department_id, Ticket.priority, Ticket.created_at, end_col).where(end_col.isnot(None))
+                if since is not None:
+                    stmt = stmt.where(end_col >= since)
+                result = db.session.execute(stmt.execution_options(yield_per=5000))
+                for dept_id, priority, created_at, end in result:
+                    for key in _entries(dept_id, priority, created_at, {metric: end}):
+                        counts[key] = counts.get(key, 0) + 1
+
+            rows = [dict(zip(_KEY_COLUMNS, key), ticket_count=n) for key, n in counts.items()]
+            for i in range(0, len(rows), _REBUILD_CHUNK):
+                db.session.execute(table.insert(), rows[i:i + _REBUILD_CHUNK])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return len(rows)
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+    @staticmethod
+    def bucket_counts(metric, since, criteria=()):
+        """[(priority, bucket, count)] for events on days >= since."""
+        h = TicketLatencyHistogram
+        rows = (
+            db.session.query(h.priority, h.bucket, func.sum(h.ticket_count))
+            .filter(h.metric == metric, h.day >= since, *criteria)
+            .group_by(h.priority, h.bucket)
+            .all()
+        )
+        return [(p, b, int(n)) for p, b, n in rows if n]
+
+    @staticmethod
+    def percentiles(bucket_counts, quantiles=(0.5, 0.9, 0.99)):
+        """
+        {count, p50, p90, ...} in seconds from {bucket: count} — nearest rank,
+        reported as the upper bound of the bucket holding that rank.
+        """
+        total = sum(bucket_counts.values())
+        result = {"count": total}
+        if not total:
+            for q in quantiles:
+                result[f"p{round(q * 100):g}"] = None
+            return result
+
+        ordered = sorted(bucket_counts.items())
+        for q in quantiles:
+            rank = max(1, math.ceil(q * total))
+            seen = 0
+            for bucket, n in ordered:
+                seen += n
+                if seen >= rank:
+                    result[f"p{round(q * 100):g}"] = round(bucket_upper_seconds(bucket))
+                    break
+        return result
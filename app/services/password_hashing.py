@@ -0,0 +1,141 @@
+"""
+app/services/password_hashing.py
+
+Bounded Password Hashing Pool
+─────────────────────────────
+Runs login password verification (bcrypt) on a small dedicated thread pool
+instead of inline on the request worker, so a burst of logins at shift start
+costs at most PASSWORD_HASH_WORKERS cores and cannot tie up every worker.
+
+  1. Bounded: at most PASSWORD_HASH_WORKERS hashes run at once and at most
+     PASSWORD_HASH_QUEUE_MAX more wait.  Beyond that, and when a request
+     has waited PASSWORD_VERIFY_TIMEOUT seconds, PasswordHashingBusy is
+     raised and the login endpoint answers 503 with Retry-After — latency
+     stays bounded instead of growing with the queue.
+  2. Rehash on login: verification also produces the upgraded hash for
+     legacy pbkdf2 hashes and bcrypt hashes below BCRYPT_ROUNDS
+     (app/utils/password_utils.py), in the same pool job.
+  3. stats() reports submitted / completed / rejected / timed-out jobs,
+     queue depth, and average / max queue wait and hashing time —
+     GET /api/admin/password-hashing/stats.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from app.utils.password_utils import configure_rounds, verify_and_rehash
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashingBusy(RuntimeError):
+    """The pool is saturated or the verification timed out — retry later."""
+
+
+class PasswordHashingPool:
+    def __init__(self):
+        self.workers = 4
+        self.queue_max = 32
+        self.timeout = 5.0
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+        self._stats = {
+            'submitted': 0, 'completed': 0, 'rejected': 0, 'timeouts': 0,
+            'wait_total': 0.0, 'wait_max': 0.0, 'run_total': 0.0, 'run_max': 0.0,
+        }
+        self._in_flight = 0
+
+    def init_app(self, app):
+        app.config.setdefault('BCRYPT_ROUNDS', 12)
+        app.config.setdefault('PASSWORD_HASH_WORKERS', 4)
+        app.config.setdefault('PASSWORD_HASH_QUEUE_MAX', 32)
+        app.config.setdefault('PASSWORD_VERIFY_TIMEOUT', 5)
+
+        configure_rounds(app.config['BCRYPT_ROUNDS'])
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.queue_max = app.config['PASSWORD_HASH_QUEUE_MAX']
+        self.timeout = app.config['PASSWORD_VERIFY_TIMEOUT']
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+            self._slots = threading.BoundedSemaphore(self.workers + self.queue_max)
+        app.extensions['password_hashing'] = self
+
+    def verify(self, password, password_hash):
+        """
+        (is_valid, new_hash) — see verify_and_rehash().  Raises
+        PasswordHashingBusy when the pool is full or the wait times out.
+        """
+        if self._executor is None:
+            return verify_and_rehash(password, password_hash)
+
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise PasswordHashingBusy("Too many logins in progress")
+
+        submitted_at = time.monotonic()
+        with self._lock:
+            self._stats['submitted'] += 1
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(self._run, submitted_at, password, password_hash)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            self._count('timeouts')
+            raise PasswordHashingBusy("Password verification timed out")
+
+    def _run(self, submitted_at, password, password_hash):
+        started = time.monotonic()
+        result = verify_and_rehash(password, password_hash)
+        finished = time.monotonic()
+        wait, run = started - submitted_at, finished - started
+        with self._lock:
+            s = self._stats
+            s['completed'] += 1
+            s['wait_total'] += wait
+            s['wait_max'] = max(s['wait_max'], wait)
+            s['run_total'] += run
+            s['run_max'] = max(s['run_max'], run)
+        return result
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _count(self, field):
+        with self._lock:
+            self._stats[field] += 1
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+            in_flight = self._in_flight
+        completed = s['completed']
+        return {
+            'workers': self.workers,
+            'queue_max': self.queue_max,
+            'timeout_seconds': self.timeout,
+            'in_flight': in_flight,
+            'queued': max(in_flight - self.workers, 0),
+            'submitted': s['submitted'],
+            'completed': completed,
+            'rejected': s['rejected'],
+            'timeouts': s['timeouts'],
+            'avg_wait_ms': round(s['wait_total'] / completed * 1000, 1) if completed else None,
+            'max_wait_ms': round(s['wait_max'] * 1000, 1),
+            'avg_hash_ms': round(s['run_total'] / completed * 1000, 1) if completed else None,
+            'max_hash_ms': round(s['run_max'] * 1000, 1),
+        }
+
+
+password_hashing = PasswordHashingPool()
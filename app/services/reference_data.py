@@ -0,0 +1,178 @@
+"""
+app/services/reference_data.py
+
+Reference Data Cache
+────────────────────
+One in-process snapshot of the small, rarely-changing tables — departments,
+roles, SLA rules and the issue-type → department mapping — so request paths
+resolve names and ids from memory instead of querying them every time.
+
+  1. Loading: the snapshot is built with three column-only queries, at
+     startup (create_app) and again whenever it is stale.
+  2. Versioned invalidation: routes that change departments or SLA rules
+     call reference_data.invalidate() after their commit, which bumps the
+     version; the next read reloads.  With REDIS_URL set the version also
+     lives in Redis (riq:refdata:version), so an invalidation on one worker
+     reaches the others within REFERENCE_DATA_CHECK_SECONDS.
+  3. Rows added outside the app (seed scripts) are picked up by a name / id
+     miss, which reloads at most once per REFERENCE_DATA_CHECK_SECONDS.
+  4. stats() reports hits (reads served from the snapshot), loads and
+     invalidations — see GET /api/admin/reference-data/stats.
+"""
+
+import logging
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from app.extensions import db
+from app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+DepartmentRef = namedtuple('DepartmentRef', 'id name description')
+
+_VERSION_KEY = 'riq:refdata:version'
+
+
+class _Snapshot:
+    def __init__(self, departments, roles, sla_hours):
+        from app.utils.dept_isolation import ISSUE_TYPE_TO_NAME
+        self.departments = {d.id: d for d in departments}                      # id -> DepartmentRef
+        self.department_ids = {d.name: d.id for d in departments}              # name -> id
+        self.roles = dict(roles)                                               # name -> id
+        self.sla_hours = dict(sla_hours)                                       # (department_id, priority) -> hours
+        self.issue_types = {                                                   # issue_type -> department id
+            issue_type: self.department_ids[name]
+            for issue_type, name in ISSUE_TYPE_TO_NAME.items()
+            if name in self.department_ids
+        }
+        self.loaded_at = datetime.now(timezone.utc)
+
+
+def _load():
+    from app.models.department import Department
+    from app.models.role import Role
+    from app.models.sla_rule import SLARule
+    departments = [
+        DepartmentRef(*row)
+        for row in db.session.query(Department.id, Department.name, Department.description).all()
+    ]
+    roles = db.session.query(Role.name, Role.id).all()
+    sla_rules = db.session.query(SLARule.department_id, SLARule.priority, SLARule.sla_hours).all()
+    return _Snapshot(departments, roles, {(d, p): h for d, p, h in sla_rules})
+
+
+class ReferenceData:
+    def __init__(self):
+        self.check_seconds = 5
+        self._client = None
+        self._snapshot = None
+        self._loaded_version = None
+        self._local_version = 0
+        self._shared_version = 0
+        self._next_check = 0.0
+        self._last_miss_reload = 0.0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'loads': 0, 'invalidations': 0}
+
+    def init_app(self, app):
+        app.config.setdefault('REFERENCE_DATA_CHECK_SECONDS', 5)
+        self.check_seconds = app.config['REFERENCE_DATA_CHECK_SECONDS']
+        self._client = get_redis(app)
+        app.extensions['reference_data'] = self
+
+    # ── Versioning ───────────────────────────────────────────────────────────
+    def _version(self):
+        if self._client is not None and time.monotonic() >= self._next_check:
+            try:
+                self._shared_version = int(self._client.get(_VERSION_KEY) or 0)
+            except Exception as e:
+                logger.warning(f"⚠️ Reference data version check failed: {e}")
+            self._next_check = time.monotonic() + self.check_seconds
+        return (self._local_version, self._shared_version)
+
+    def invalidate(self):
+        """Marks the snapshot stale; call after committing a department / role / SLA rule change."""
+        with self._lock:
+            self._local_version += 1
+            self._stats['invalidations'] += 1
+        if self._client is not None:
+            try:
+                self._shared_version = int(self._client.incr(_VERSION_KEY))
+            except Exception as e:
+                logger.warning(f"⚠️ Reference data invalidation failed in Redis: {e}")
+
+    def load(self):
+        """(Re)loads the snapshot now."""
+        version = self._version()
+        snapshot = _load()
+        with self._lock:
+            self._snapshot = snapshot
+            self._loaded_version = version
+            self._stats['loads'] += 1
+        return snapshot
+
+    def snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is not None and self._loaded_version == self._version():
+            with self._lock:
+                self._stats['hits'] += 1
+            return snapshot
+        return self.load()
+
+    def _reload_on_miss(self):
+        """Reloads after a lookup miss, at most once per check interval; True if it did."""
+        now = time.monotonic()
+        if now - self._last_miss_reload < self.check_seconds:
+            return False
+        self._last_miss_reload = now
+        self.load()
+        return True
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._stats)
+            snapshot = self._snapshot
+        reads = counters['hits'] + counters['loads']
+        counters['hit_rate'] = round(counters['hits'] / reads, 3) if reads else None
+        counters['version'] = list(self._version())
+        counters['shared'] = self._client is not None
+        counters['loaded_at'] = snapshot.loaded_at.isoformat() if snapshot else None
+        counters['departments'] = len(snapshot.departments) if snapshot else 0
+        counters['roles'] = len(snapshot.roles) if snapshot else 0
+        counters['sla_rules'] = len(snapshot.sla_hours) if snapshot else 0
+        return counters
+
+    # ── Lookups ──────────────────────────────────────────────────────────────
+    def _lookup(self, table, key):
+        snapshot = self.snapshot()
+        value = getattr(snapshot, table).get(key)
+        if value is None and self._reload_on_miss():
+            snapshot = self._snapshot
+            value = getattr(snapshot, table).get(key)
+        return snapshot, value
+
+    def department(self, department_id):
+        """DepartmentRef or None."""
+        return self._lookup('departments', department_id)[1]
+
+    def department_by_name(self, name):
+        """DepartmentRef or None."""
+        snapshot, department_id = self._lookup('department_ids', name)
+        return snapshot.departments.get(department_id)
+
+    def department_id_for_issue_type(self, issue_type):
+        """Department id for a canonical issue type, or None."""
+        return self._lookup('issue_types', issue_type)[1]
+
+    def role_id(self, name):
+        return self._lookup('roles', name)[1]
+
+    def sla_hours(self, department_id, priority):
+        """Configured SLA hours for (department, SLA rule priority), or None."""
+        return self.snapshot().sla_hours.get((department_id, priority))
+
+
+reference_data = ReferenceData()
@@ -0,0 +1,316 @@
+"""
+app/services/result_cache.py
+
+Shared Result Cache
+───────────────────
+Caches the JSON bodies of read-heavy analytics / dashboard endpoints so that
+every client looking at the same view (e.g. all team leads of one department
+refreshing their dashboard) costs one database round trip per change, not
+one per request.
+
+  1. Keys are built from the endpoint namespace, the caller's role scope
+     (see role_scope / global_scope) and the query string — never from the
+     user id alone, so identical views are shared across users.
+  2. Every entry is tagged ('all', 'dept:<id>', 'creator:<id>', ...).  Each
+     tag has a generation number that is part of the key; invalidate(tag)
+     bumps it, which orphans every entry built under the old generation.
+     Committed ticket changes (app/services/ticket_changes.py) invalidate the
+     tags of the departments / creators they touch.
+  3. Entries also expire after RESULT_CACHE_TTL seconds — the maximum
+     staleness for data the change events do not cover (SLA clocks, AI
+     scores, other workers when using the in-process backend).
+  4. Backends: an in-process LRU (default) or Redis (RESULT_CACHE_BACKEND =
+     'redis'), which shares entries and invalidations across workers.  Redis
+     errors degrade to cache misses.
+  5. Concurrent misses on the same key within a worker are collapsed: one
+     request computes, the others wait for it and reuse the result.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app, make_response, request
+from flask_jwt_extended import current_user
+
+from app.utils.dept_isolation import get_user_scope
+from app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+ALL = 'all'
+FEEDBACK = 'feedback'
+
+
+def dept_tag(department_id):
+    return f'dept:{department_id}'
+
+
+def creator_tag(user_id):
+    return f'creator:{user_id}'
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Backends
+# ─────────────────────────────────────────────────────────────────────────────
+class _LocalBackend:
+    """Per-process LRU with per-entry expiry."""
+
+    name = 'local'
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (expires_at, body)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def generations(self, tags):
+        with self._lock:
+            return [self._generations.get(tag, 0) for tag in tags]
+
+    def bump(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, body, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def size(self):
+        return len(self._entries)
+
+
+class _RedisBackend:
+    """Entries and tag generations in Redis, shared by every worker."""
+
+    name = 'redis'
+    PREFIX = 'riq:cache:'
+
+    def __init__(self, client):
+        self.client = client
+
+    def generations(self, tags):
+        values = self.client.mget([f'{self.PREFIX}gen:{tag}' for tag in tags])
+        return [int(v) if v is not None else 0 for v in values]
+
+    def bump(self, tags):
+        pipe = self.client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(f'{self.PREFIX}gen:{tag}')
+        pipe.execute()
+
+    def get(self, key):
+        return self.client.get(f'{self.PREFIX}v:{key}')
+
+    def set(self, key, body, ttl):
+        self.client.set(f'{self.PREFIX}v:{key}', body, ex=max(1, int(ttl)))
+
+    def size(self):
+        return None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cache
+# ─────────────────────────────────────────────────────────────────────────────
+class ResultCache:
+    def __init__(self):
+        self.enabled = False
+        self.default_ttl = 60
+        self._backend = None
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault('RESULT_CACHE_ENABLED', True)
+        app.config.setdefault('RESULT_CACHE_BACKEND', 'local')
+        app.config.setdefault('RESULT_CACHE_TTL', 60)
+        app.config.setdefault('RESULT_CACHE_MAX_ENTRIES', 1000)
+
+        self.enabled = bool(app.config['RESULT_CACHE_ENABLED'])
+        self.default_ttl = app.config['RESULT_CACHE_TTL']
+        self._backend = _LocalBackend(app.config['RESULT_CACHE_MAX_ENTRIES'])
+        if app.config['RESULT_CACHE_BACKEND'] == 'redis':
+            client = get_redis(app)
+            if client is not None:
+                self._backend = _RedisBackend(client)
+            else:
+                logger.warning("⚠️ RESULT_CACHE_BACKEND=redis but Redis is unavailable — using the in-process cache")
+        app.extensions['result_cache'] = self
+
+        from app.services.ticket_changes import on_ticket_commit
+        on_ticket_commit(invalidate_for_ticket_changes)
+        return self.enabled
+
+    # ── Stats ────────────────────────────────────────────────────────────────
+    def _count(self, namespace, field):
+        with self._stats_lock:
+            counters = self._stats.setdefault(namespace, {'hits': 0, 'misses': 0, 'errors': 0})
+            counters[field] += 1
+
+    def stats(self):
+        with self._stats_lock:
+            namespaces = {ns: dict(c) for ns, c in self._stats.items()}
+        for counters in namespaces.values():
+            lookups = counters['hits'] + counters['misses']
+            counters['hit_rate'] = round(counters['hits'] / lookups, 3) if lookups else None
+        return {
+            'enabled': self.enabled,
+            'backend': self._backend.name if self._backend else None,
+            'entries': self._backend.size() if self._backend else None,
+            'namespaces': namespaces,
+        }
+
+    # ── Keys / invalidation ──────────────────────────────────────────────────
+    def key_for(self, namespace, scope_key, tags, params):
+        generations = self._backend.generations(tags)
+        raw = '|'.join([
+            namespace,
+            scope_key,
+            '&'.join(f'{k}={v}' for k, v in sorted(params)),
+            ','.join(f'{t}:{g}' for t, g in zip(tags, generations)),
+        ])
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def invalidate(self, *tags):
+        if not (self.enabled and self._backend and tags):
+            return
+        try:
+            self._backend.bump(tags)
+        except Exception as e:
+            logger.warning(f"⚠️ Result cache invalidation failed for {tags}: {e}")
+
+    @contextmanager
+    def _single_flight(self, key):
+        with self._flights_lock:
+            flight = self._flights.setdefault(key, [threading.Lock(), 0])
+            flight[1] += 1
+        try:
+            with flight[0]:
+                yield
+        finally:
+            with self._flights_lock:
+                flight[1] -= 1
+                if flight[1] == 0:
+                    self._flights.pop(key, None)
+
+    def get_or_compute(self, namespace, scope_key, tags, params, ttl, compute):
+        """
+        Cached body for the view, or compute() -> (body | None).  A None body
+        is returned to the caller but never stored.
+        """
+        try:
+            key = self.key_for(namespace, scope_key, tags, params)
+            body = self._backend.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ Result cache unavailable ({namespace}): {e}")
+            self._count(namespace, 'errors')
+            return compute()
+
+        if body is not None:
+            self._count(namespace, 'hits')
+            return body
+
+        with self._single_flight(key):
+            # Whoever held the flight lock may have filled it meanwhile
+            body = self._backend.get(key)
+            if body is not None:
+                self._count(namespace, 'hits')
+                return body
+            self._count(namespace, 'misses')
+            body = compute()
+            if body is not None:
+                try:
+                    self._backend.set(key, body, ttl)
+                except Exception as e:
+                    logger.warning(f"⚠️ Result cache store failed ({namespace}): {e}")
+                    self._count(namespace, 'errors')
+            return body
+
+
+result_cache = ResultCache()
+
+
+def invalidate_for_ticket_changes(changes):
+    """Ticket commit handler: bumps the tags of every scope the changes touch."""
+    tags = {ALL}
+    for change in changes:
+        for values in (change.old, change.new):
+            if values is None:
+                continue
+            if values.get('department_id') is not None:
+                tags.add(dept_tag(values['department_id']))
+            if values.get('created_by') is not None:
+                tags.add(creator_tag(values['created_by']))
+    result_cache.invalidate(*sorted(tags))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# View decorator
+# ─────────────────────────────────────────────────────────────────────────────
+def global_scope():
+    """Same response for every caller allowed to reach the endpoint."""
+    return ALL, [ALL]
+
+
+def role_scope():
+    """Scope of apply_dept_filter(): all tickets, one department, or own tickets."""
+    role, dept_id, user_id = get_user_scope(current_user)
+    if role == 'ADMIN':
+        return ALL, [ALL]
+    if role in ('TEAM_LEAD', 'AGENT'):
+        return dept_tag(dept_id), [dept_tag(dept_id)]
+    return creator_tag(user_id), [creator_tag(user_id)]
+
+
+def cached_view(namespace, scope=role_scope, extra_tags=(), ttl_setting=None):
+    """
+    Serves a JSON GET endpoint through the result cache.  Place it below the
+    auth decorator — the scope function reads current_user.  Only 200
+    responses are cached; errors always go through the view.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not result_cache.enabled:
+                return fn(*args, **kwargs)
+
+            scope_key, tags = scope()
+            tags = list(tags) + list(extra_tags)
+            params = list(request.args.items(multi=True)) + list(kwargs.items())
+            ttl = current_app.config.get(ttl_setting or 'RESULT_CACHE_TTL', result_cache.default_ttl)
+            uncached = []
+
+            def compute():
+                response = make_response(fn(*args, **kwargs))
+                uncached.append(response)
+                if response.status_code != 200 or response.is_streamed or response.mimetype != 'application/json':
+                    return None
+                return response.get_data()
+
+            body = result_cache.get_or_compute(namespace, scope_key, tags, params, ttl, compute)
+            if uncached:
+                return uncached[0]
+            return current_app.response_class(body, status=200, mimetype='application/json')
+        return wrapper
+    return decorator
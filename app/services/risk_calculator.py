@@ -170,29 +170,14 @@ def calculate_agent_workload(agent_id: int, db: Session) -> int:
     
     Args:
         agent_id: ID of the agent
-        db: Database session
+        db: Database session (unused — kept for call compatibility)
     
     Returns:
-        Workload score (sum of weighted active tickets)
+        Workload score (sum of weighted active tickets), from the live
+        workload ledger (app/services/workload_ledger.py)
     """
-    from app.models.ticket import Ticket
-    
-    # Get all active tickets assigned to this agent
-    active_tickets = db.query(Ticket).filter(
-        Ticket.assigned_agent_id == agent_id,
-        Ticket.status.in_(["ASSIGNED", "IN_PROGRESS", "WAITING_FOR_USER"])
-    ).all()
-    
-    # Weight by priority
-    weight_map = {
-        "P1_CRITICAL": 5,
-        "P2_HIGH": 3,
-        "P3_MEDIUM": 2,
-        "P4_LOW": 1
-    }
-    
-    total_workload = sum(weight_map.get(ticket.priority, 1) for ticket in active_tickets)
-    return total_workload
+    from app.services.workload_ledger import workload_ledger
+    return workload_ledger.get(agent_id).load
 
 
 def get_avg_resolution_time(ticket_type: str, priority: str, db: Session) -> float:
@@ -0,0 +1,206 @@
+"""
+app/services/rollup_service.py
+
+Daily Ticket Rollups
+────────────────────
+Keeps ticket_daily_rollups (see app/models/ticket_daily_rollup.py) in step
+with the tickets table so analytics endpoints read at most one row per
+(day, status, priority) per series instead of scanning tickets.
+
+  1. Incremental: a ticket-change handler (app/services/ticket_changes.py)
+     turns every insert / update / delete into ±1 deltas and upserts them in
+     the same transaction as the ticket write.
+  2. Rebuild: RollupService.rebuild() recomputes the rollups from tickets
+     with two INSERT ... SELECT ... GROUP BY statements.  Run once after
+     deploying (scripts/rebuild_rollups.py).  The scheduler also runs it at
+     startup and nightly to correct drift from writes made outside the app
+     (manual SQL, restores) — in full only while the table is empty,
+     otherwise for the creation days of tickets updated in the last 7 days
+     (rollups file a ticket's current status under its creation day, so an
+     old ticket resolved yesterday re-counts an old day).  Drift the
+     window cannot see — deleted tickets, writes that leave updated_at
+     untouched, anything older — needs scripts/rebuild_rollups.py.
+"""
+
+import logging
+
+from sqlalchemy import case, delete, func, insert, literal, select
+
+from app.extensions import db
+from app.models.ticket import Ticket
+from app.models.ticket_daily_rollup import TicketDailyRollup
+
+logger = logging.getLogger(__name__)
+
+DEPARTMENT = 'DEPARTMENT'
+CREATOR = 'CREATOR'
+
+# Column defaults on Ticket — used when a row somehow carries NULL
+_DEFAULT_STATUS = 'OPEN'
+_DEFAULT_PRIORITY = 'P4'
+
+_KEY_COLUMNS = ('scope', 'scope_id', 'day', 'status', 'priority')
+
+
+def _bucket_keys(values):
+    """Rollup keys a ticket with these tracked values counts towards."""
+    created_at = values.get('created_at')
+    if created_at is None:
+        return []
+    day = created_at.date()
+    status = values.get('status') or _DEFAULT_STATUS
+    priority = values.get('priority') or _DEFAULT_PRIORITY
+    keys = []
+    if values.get('department_id') is not None:
+        keys.append((DEPARTMENT, values['department_id'], day, status, priority))
+    if values.get('created_by') is not None:
+        keys.append((CREATOR, values['created_by'], day, status, priority))
+    return keys
+
+
+def upsert_counts(connection, table, key_columns, rows):
+    """
+    Adds each row's ticket_count to the existing row with the same key
+    (inserting it if missing) — one multi-row statement.
+    """
+    if connection.dialect.name == 'mysql':
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_duplicate_key_update(ticket_count=table.c.ticket_count + stmt.inserted.ticket_count)
+    else:
+        # SQLite (local scripts / benchmarks)
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={'ticket_count': table.c.ticket_count + stmt.excluded.ticket_count},
+        )
+    connection.execute(stmt, rows)
+
+
+def apply_ticket_changes(session, changes):
+    """Ticket-change handler: folds the changes into per-bucket deltas and upserts them."""
+    deltas = {}
+    for change in changes:
+        if change.old is not None:
+            for key in _bucket_keys(change.old):
+                deltas[key] = deltas.get(key, 0) - 1
+        if change.new is not None:
+            for key in _bucket_keys(change.new):
+                deltas[key] = deltas.get(key, 0) + 1
+
+    rows = [
+        dict(zip(_KEY_COLUMNS, key), ticket_count=delta)
+        for key, delta in deltas.items() if delta
+    ]
+    if rows:
+        upsert_counts(session.connection(), TicketDailyRollup.__table__, _KEY_COLUMNS, rows)
+
+
+def init_rollups():
+    from app.services.ticket_changes import on_ticket_changes
+    on_ticket_changes(apply_ticket_changes)
+
+
+class RollupService:
+    @staticmethod
+    def is_empty():
+        return db.session.query(TicketDailyRollup.id).first() is None
+
+    @staticmethod
+    def changed_days(since):
+        """Creation days (dates) of tickets updated at or after `since`."""
+        rows = (
+            db.session.query(func.date(Ticket.created_at))
+            .filter(Ticket.updated_at >= since, Ticket.created_at.isnot(None))
+            .distinct()
+            .all()
+        )
+        return sorted(row[0] for row in rows)
+
+    @staticmethod
+    def rebuild(since=None, days=None):
+        """
+        Recomputes rollups from tickets — every day, only days >= `since`
+        (a date), or only the given `days` (dates).  Commits.  Returns the
+        number of rollup rows written.
+        """
+        table = TicketDailyRollup.__table__
+        day = func.date(Ticket.created_at)
+        status = func.coalesce(Ticket.status, _DEFAULT_STATUS)
+        priority = func.coalesce(Ticket.priority, _DEFAULT_PRIORITY)
+
+        if days is not None:
+            days = list(days)
+            if not days:
+                return 0
+
+        purge = delete(table)
+        if since is not None:
+            purge = purge.where(table.c.day >= since)
+        if days is not None:
+            purge = purge.where(table.c.day.in_(days))
+
+        written = 0
+        try:
+            db.session.execute(purge)
+            for scope, scope_col in ((DEPARTMENT, Ticket.department_id), (CREATOR, Ticket.created_by)):
+                grouped = (
+                    select(literal(scope), scope_col, day, status, priority, func.count(Ticket.id))
+                    .where(Ticket.created_at.isnot(None))
+                    .group_by(scope_col, day, status, priority)
+                )
+                if since is not None:
+                    grouped = grouped.where(Ticket.created_at >= since)
+                if days is not None:
+                    grouped = grouped.where(day.in_(days))
+                result = db.session.execute(
+                    insert(table).from_select(list(_KEY_COLUMNS) + ['ticket_count'], grouped)
+                )
+                written += result.rowcount or 0
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return written
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+    @staticmethod
+    def status_priority_counts(criteria):
+        """[(status, priority, count)] summed over every day."""
+        r = TicketDailyRollup
+        rows = (
+            db.session.query(r.status, r.priority, func.sum(r.ticket_count))
+            .filter(*criteria)
+            .group_by(r.status, r.priority)
+            .all()
+        )
+        return [(s, p, int(n)) for s, p, n in rows if n]
+
+    @staticmethod
+    def daily_counts(criteria, since):
+        """{date: count} of tickets created on each day >= since."""
+        r = TicketDailyRollup
+        rows = (
+            db.session.query(r.day, func.sum(r.ticket_count))
+            .filter(r.day >= since, *criteria)
+            .group_by(r.day)
+            .all()
+        )
+        return {str(d): int(n) for d, n in rows if n}
+
+    @staticmethod
+    def department_status_counts(open_statuses, resolved_statuses):
+        """[(department_id, total, open, resolved)] across all days."""
+        r = TicketDailyRollup
+        return (
+            db.session.query(
+                r.scope_id,
+                func.sum(r.ticket_count),
+                func.sum(case((r.status.in_(open_statuses), r.ticket_count), else_=0)),
+                func.sum(case((r.status.in_(resolved_statuses), r.ticket_count), else_=0)),
+            )
+            .filter(r.scope == DEPARTMENT)
+            .group_by(r.scope_id)
+            .all()
+        )
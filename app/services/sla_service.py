@@ -1,9 +1,23 @@
 from app.extensions import db
 from app.models.sla_rule import SLARule
+from app.services.reference_data import reference_data
+
+# Ticket priority (P1-P4) -> SLARule.priority enum
+TICKET_PRIORITY_TO_RULE = {
+    'P1': 'CRITICAL',
+    'P2': 'HIGH',
+    'P3': 'MEDIUM',
+    'P4': 'LOW',
+}
+
+# Used when a department has no rule for the priority
+DEFAULT_SLA_HOURS = {'P1': 4, 'P2': 8, 'P3': 16, 'P4': 24}
+
 
 class SLAService:
     @staticmethod
     def create_or_update_rule(department_id, priority, sla_hours):
+        priority = TICKET_PRIORITY_TO_RULE.get(priority, priority)
         rule = SLARule.query.filter_by(department_id=department_id, priority=priority).first()
         if rule:
             rule.sla_hours = sla_hours
@@ -13,3 +27,16 @@ class SLAService:
         
         db.session.commit()
         return rule
+
+    @staticmethod
+    def sla_hours(department_id, priority):
+        """
+        SLA hours for a ticket priority (P1-P4) in a department, read from the
+        in-memory rule matrix (app/services/reference_data.py) — no query.
+        Falls back to DEFAULT_SLA_HOURS when no rule is configured.
+        """
+        if department_id:
+            hours = reference_data.sla_hours(department_id, TICKET_PRIORITY_TO_RULE.get(priority))
+            if hours is not None:
+                return hours
+        return DEFAULT_SLA_HOURS.get(priority, DEFAULT_SLA_HOURS['P4'])
@@ -0,0 +1,250 @@
+"""
+app/services/snapshot_service.py
+
+Analytics Parquet Snapshots
+───────────────────────────
+Writes tickets, ticket_ai, feedback and system_activity_logs to a Parquet
+dataset under ANALYTICS_SNAPSHOT_DIR so BI / offline analysis reads files
+instead of querying the OLTP database.
+
+  1. Layout: <dir>/<table>/month=YYYY-MM/department_id=N/part-<run>-<n>.parquet
+     (hive-style; system_activity_logs has no department and is partitioned
+     by month only).  The month is taken from the row's creation time.
+     Every row carries _snapshot_at, the time of the run that wrote it.
+  2. Incremental: each table keeps a watermark (max of its change column —
+     updated_at for tickets, analyzed_at / created_at for the others) in
+     <dir>/_watermarks.json.  A run only exports rows changed since the
+     watermark (minus WATERMARK_OVERLAP, to catch transactions that
+     committed late) and APPENDS new part files.  A ticket updated twice thus
+     appears in two files — readers keep the row with the latest
+     _snapshot_at per id.  full=True rebuilds a table from scratch.
+  3. Rows are streamed from the database with yield_per and written in
+     batches of SNAPSHOT_BATCH_SIZE, so memory is bounded per batch.
+
+Requires pyarrow (optional dependency); snapshot() raises RuntimeError when
+it is missing.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.types import JSON, Boolean, DateTime, Float, Integer
+
+from app.extensions import db
+from app.models.feedback import Feedback
+from app.models.system_activity_log import SystemActivityLog
+from app.models.ticket import Ticket
+from app.models.ticket_ai import TicketAI
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_BATCH_SIZE = 50000
+WATERMARK_OVERLAP = timedelta(minutes=5)
+_WATERMARK_FILE = '_watermarks.json'
+
+# Serializes runs within a process (CLI + endpoint + scheduler)
+_run_lock = threading.Lock()
+
+
+def _tickets():
+    return (
+        select(*Ticket.__table__.columns),
+        Ticket.updated_at, Ticket.created_at, Ticket.department_id,
+    )
+
+
+def _ticket_ai():
+    return (
+        select(*TicketAI.__table__.columns, Ticket.department_id)
+        .join(Ticket, Ticket.id == TicketAI.ticket_id),
+        TicketAI.analyzed_at, TicketAI.analyzed_at, Ticket.department_id,
+    )
+
+
+def _feedback():
+    return (
+        select(*Feedback.__table__.columns, Ticket.department_id)
+        .join(Ticket, Ticket.id == Feedback.ticket_id),
+        Feedback.created_at, Feedback.created_at, Ticket.department_id,
+    )
+
+
+def _activity():
+    return (
+        select(*SystemActivityLog.__table__.columns),
+        SystemActivityLog.created_at, SystemActivityLog.created_at, None,
+    )
+
+
+# table name -> () -> (select, watermark column, month column, department column | None)
+TABLES = {
+    'tickets': _tickets,
+    'ticket_ai': _ticket_ai,
+    'feedback': _feedback,
+    'system_activity_logs': _activity,
+}
+
+
+def _arrow_type(sql_type):
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp('us', tz='UTC')
+    return pa.string()   # String, Text, Enum, JSON (serialized)
+
+
+def _schema(stmt, partition_cols):
+    fields = [pa.field(c.name, _arrow_type(c.type)) for c in stmt.selected_columns]
+    fields.append(pa.field('_snapshot_at', pa.timestamp('us', tz='UTC')))
+    fields += [pa.field(name, pa.string()) for name in partition_cols]
+    return pa.schema(fields)
+
+
+def _read_watermarks(root):
+    path = os.path.join(root, _WATERMARK_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_watermarks(root, watermarks):
+    path = os.path.join(root, _WATERMARK_FILE)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(watermarks, f, indent=2)
+    os.replace(tmp, path)
+
+
+class SnapshotService:
+    @staticmethod
+    def status(root):
+        """Watermark and last run per table."""
+        return _read_watermarks(root)
+
+    @staticmethod
+    def snapshot(root, tables=None, full=False):
+        """
+        Exports the given tables (default: all) into the dataset at `root`.
+        Returns {table: rows_written}.
+        """
+        if not _run_lock.acquire(blocking=False):
+            raise RuntimeError("A snapshot run is already in progress")
+        try:
+            return SnapshotService._run(root, tables, full)
+        finally:
+            _run_lock.release()
+
+    @staticmethod
+    def is_running():
+        return _run_lock.locked()
+
+    @staticmethod
+    def start_background(app, root, tables=None, full=False):
+        """
+        Runs a snapshot on a daemon thread; False if a run is already active.
+        The run lock is taken here and released by the thread, so two
+        concurrent calls cannot both start a run.
+        """
+        if not _run_lock.acquire(blocking=False):
+            return False
+
+        def run():
+            with app.app_context():
+                try:
+                    SnapshotService._run(root, tables, full)
+                except Exception as e:
+                    logger.error(f"[Snapshot] Run failed: {e}", exc_info=True)
+                finally:
+                    db.session.remove()
+                    _run_lock.release()
+
+        try:
+            threading.Thread(target=run, name='analytics-snapshot', daemon=True).start()
+        except Exception:
+            _run_lock.release()
+            raise
+        return True
+
+    @staticmethod
+    def _run(root, tables, full):
+        """snapshot() body — the caller holds _run_lock."""
+        if pa is None:
+            raise RuntimeError("pyarrow is not installed — pip install pyarrow to write Parquet snapshots")
+        os.makedirs(root, exist_ok=True)
+        watermarks = _read_watermarks(root)
+        written = {}
+        for name in tables or TABLES:
+            written[name] = SnapshotService._snapshot_table(root, name, watermarks, full)
+            _write_watermarks(root, watermarks)
+        return written
+
+    @staticmethod
+    def _snapshot_table(root, name, watermarks, full):
+        stmt, changed_col, month_col, dept_col = TABLES[name]()
+        table_dir = os.path.join(root, name)
+        run_at = datetime.now(timezone.utc)
+        run_id = run_at.strftime('%Y%m%dT%H%M%S')
+
+        state = watermarks.get(name, {})
+        if full:
+            shutil.rmtree(table_dir, ignore_errors=True)
+            state = {}
+        if state.get('watermark'):
+            since = datetime.fromisoformat(state['watermark']) - WATERMARK_OVERLAP
+            stmt = stmt.where(changed_col >= since)
+
+        # department_id is restored from the directory name on read (hive partitioning)
+        partition_cols = ['month'] + (['department_id'] if dept_col is not None else [])
+        schema = _schema(stmt, ['month'])
+        json_cols = [c.name for c in stmt.selected_columns if isinstance(c.type, JSON)]
+        changed_key, month_key = changed_col.name, month_col.name
+
+        rows_written, max_changed = 0, None
+        result = db.session.execute(stmt.execution_options(yield_per=SNAPSHOT_BATCH_SIZE))
+        for batch_no, partition in enumerate(result.partitions()):
+            records = []
+            for row in partition:
+                record = dict(row._mapping)
+                for col in json_cols:
+                    if record[col] is not None and not isinstance(record[col], str):
+                        record[col] = json.dumps(record[col], ensure_ascii=False)
+                month = record.get(month_key)
+                record['month'] = month.strftime('%Y-%m') if month else 'unknown'
+                record['_snapshot_at'] = run_at
+                changed = record.get(changed_key)
+                if changed is not None and (max_changed is None or changed > max_changed):
+                    max_changed = changed
+                records.append(record)
+
+            pq.write_to_dataset(
+                pa.Table.from_pylist(records, schema=schema),
+                root_path=table_dir,
+                partition_cols=partition_cols,
+                basename_template=f'part-{run_id}-{batch_no}-{{i}}.parquet',
+            )
+            rows_written += len(records)
+
+        if max_changed is not None:
+            state['watermark'] = max_changed.isoformat()
+        state['last_run_at'] = run_at.isoformat()
+        state['last_run_rows'] = rows_written
+        watermarks[name] = state
+        logger.info(f"[Snapshot] {name}: {rows_written} rows written ({'full' if full else 'incremental'})")
+        return rows_written
@@ -0,0 +1,215 @@
+"""
+app/services/ticket_changes.py
+
+Ticket Change Tracking
+──────────────────────
+Captures the old/new values of the ticket columns that derived data (daily
+rollups, workload counters, caches) is keyed on, and hands them to registered
+handlers INSIDE the flushing transaction — a rollback undoes the derived
+writes together with the ticket change.
+
+  1. ORM inserts/updates/deletes of Ticket objects are picked up by session
+     flush events automatically.
+  2. Set-based UPDATEs bypass the ORM, so they must go through
+     bulk_update_tickets(), which snapshots the affected rows first and
+     reports the same changes.  Child propagation uses it via
+     TicketService.propagate_to_children().
+  3. Handlers are registered with on_ticket_changes() and receive
+     (session, changes); they may write through session.connection() but
+     must not add/modify ORM objects (we are already inside a flush).
+  4. Handlers registered with on_ticket_commit() receive the changes of a
+     whole transaction once it has COMMITTED (never on rollback) — for
+     side effects outside the database such as cache invalidation.
+"""
+
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy import event, inspect, select, update
+
+from app.extensions import db
+from app.models.ticket import Ticket
+
+logger = logging.getLogger(__name__)
+
+# Columns derived data is keyed on
+TRACKED_FIELDS = (
+    "department_id", "created_by", "assigned_to", "status", "priority",
+    "created_at", "parent_ticket_id", "assigned_at", "resolved_at",
+)
+
+_OLD_VALUES_KEY = "_ticket_old_values"
+_PENDING_COMMIT_KEY = "_ticket_changes_pending_commit"
+
+_handlers = []
+_commit_handlers = []
+
+
+@dataclass
+class TicketChange:
+    """old is None for inserts, new is None for deletes."""
+    ticket_id: int
+    old: dict = None
+    new: dict = None
+
+    @property
+    def op(self):
+        if self.old is None:
+            return "insert"
+        if self.new is None:
+            return "delete"
+        return "update"
+
+
+def on_ticket_changes(handler):
+    """Registers handler(session, changes). Usable as a decorator."""
+    if handler not in _handlers:
+        _handlers.append(handler)
+    return handler
+
+
+def on_ticket_commit(handler):
+    """Registers handler(changes), called after the transaction commits."""
+    if handler not in _commit_handlers:
+        _commit_handlers.append(handler)
+    return handler
+
+
+def _dispatch(session, changes):
+    if not changes:
+        return
+    for handler in _handlers:
+        handler(session, changes)
+    if _commit_handlers:
+        session.info.setdefault(_PENDING_COMMIT_KEY, []).extend(changes)
+
+
+def _row_values(row):
+    return {f: getattr(row, f) for f in TRACKED_FIELDS}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ORM flush tracking
+# ─────────────────────────────────────────────────────────────────────────────
+def _known_old_values(obj):
+    """Pre-flush values from attribute history, or None if any is not loaded."""
+    state = inspect(obj)
+    old = {}
+    for f in TRACKED_FIELDS:
+        hist = state.attrs[f].history
+        if hist.deleted:
+            old[f] = hist.deleted[0]
+        elif hist.unchanged:
+            old[f] = hist.unchanged[0]
+        else:
+            return None   # expired/unloaded, or overwritten without loading
+    return old
+
+
+def _before_flush(session, flush_context, instances):
+    tickets = [
+        o for o in session.dirty
+        if isinstance(o, Ticket) and any(inspect(o).attrs[f].history.added for f in TRACKED_FIELDS)
+    ]
+    tickets += [o for o in session.deleted if isinstance(o, Ticket)]
+    if not tickets:
+        return
+
+    old_values, missing = {}, []
+    for obj in tickets:
+        if obj.id is None:
+            continue
+        known = _known_old_values(obj)
+        if known is None:
+            missing.append(obj.id)
+        else:
+            old_values[obj.id] = known
+
+    if missing:
+        # Still pre-UPDATE: the database holds the old values
+        cols = [getattr(Ticket, f) for f in TRACKED_FIELDS]
+        with session.no_autoflush:
+            rows = session.execute(select(Ticket.id, *cols).where(Ticket.id.in_(missing))).all()
+        for row in rows:
+            old_values[row.id] = _row_values(row)
+
+    session.info[_OLD_VALUES_KEY] = old_values
+
+
+def _after_flush(session, flush_context):
+    old_values = session.info.pop(_OLD_VALUES_KEY, {})
+    changes = []
+
+    for obj in session.new:
+        if isinstance(obj, Ticket):
+            changes.append(TicketChange(obj.id, new=_row_values(obj)))
+
+    for obj in session.dirty:
+        if isinstance(obj, Ticket) and obj.id in old_values:
+            new = _row_values(obj)
+            if new != old_values[obj.id]:
+                changes.append(TicketChange(obj.id, old=old_values[obj.id], new=new))
+
+    for obj in session.deleted:
+        if isinstance(obj, Ticket) and obj.id in old_values:
+            changes.append(TicketChange(obj.id, old=old_values[obj.id]))
+
+    _dispatch(session, changes)
+
+
+def _after_commit(session):
+    changes = session.info.pop(_PENDING_COMMIT_KEY, None)
+    if not changes:
+        return
+    for handler in _commit_handlers:
+        try:
+            handler(changes)
+        except Exception as e:
+            # The data is already committed — never fail the caller over a side effect
+            logger.warning(f"⚠️ Ticket commit handler {handler.__name__} failed: {e}")
+
+
+def _after_rollback(session):
+    session.info.pop(_OLD_VALUES_KEY, None)
+    session.info.pop(_PENDING_COMMIT_KEY, None)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Set-based updates
+# ─────────────────────────────────────────────────────────────────────────────
+def bulk_update_tickets(criteria, values, session=None):
+    """
+    UPDATE tickets SET **values WHERE *criteria, reporting the per-row
+    changes to the handlers.  The affected rows are snapshotted (and locked)
+    first, so the update is applied to exactly the rows that were reported.
+    Returns the number of rows updated.
+    """
+    session = session or db.session
+    cols = [getattr(Ticket, f) for f in TRACKED_FIELDS]
+    rows = session.execute(select(Ticket.id, *cols).where(*criteria).with_for_update()).all()
+    if not rows:
+        return 0
+
+    ids = [row.id for row in rows]
+    session.execute(
+        update(Ticket).where(Ticket.id.in_(ids)).values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+    changes = []
+    for row in rows:
+        old = _row_values(row)
+        new = dict(old, **{k: v for k, v in values.items() if k in TRACKED_FIELDS})
+        if new != old:
+            changes.append(TicketChange(row.id, old=old, new=new))
+    _dispatch(session, changes)
+    return len(ids)
+
+
+def init_change_tracking():
+    """Attaches the flush listeners to the Flask-SQLAlchemy session (idempotent)."""
+    if not event.contains(db.session, "before_flush", _before_flush):
+        event.listen(db.session, "before_flush", _before_flush)
+        event.listen(db.session, "after_flush", _after_flush)
+        event.listen(db.session, "after_commit", _after_commit)
+        event.listen(db.session, "after_rollback", _after_rollback)
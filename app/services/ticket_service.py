@@ -4,6 +4,11 @@ from app.extensions import db
 from app.models.ticket import Ticket
 from app.services.ai_scoring import AIScoringService
 from app.services.audit_service import AuditService
+from app.services.ticket_changes import bulk_update_tickets
+from app.services.event_bus import (
+    publish_ticket_event, TICKET_CREATED, TICKET_ASSIGNED,
+    TICKET_STATUS_CHANGED, TICKET_ESCALATION_RESOLVED,
+)
 from app.utils.logging_utils import log_activity
 from app.utils.ticket_id_generator import generate_ticket_number
 from app.utils.dept_isolation import resolve_department_id
@@ -143,6 +148,10 @@ class TicketService:
                             ticket.sla_deadline = datetime.now(timezone.utc) + timedelta(hours=user_sla_hours)
 
                 db.session.add(ticket)
+                if parent_ticket:
+                    # Bump the parent's version so its affected_users count is
+                    # re-served to clients holding a cached copy (ETag).
+                    parent_ticket.updated_at = datetime.now(timezone.utc)
                 db.session.flush() 
 
                 # 3. Generate ticket number (locks for update)
@@ -161,6 +170,7 @@ class TicketService:
                 AuditService.log_action(f"Created ticket: {title}", user_id, ticket.id)
 
                 db.session.commit()
+                publish_ticket_event(TICKET_CREATED, ticket)
 
                 # Attach parent_ticket reference for route layer to use in response
                 ticket._parent_ticket = parent_ticket
@@ -191,13 +201,13 @@ class TicketService:
         
         # ── Propagate assignment to all child tickets ────────────────────────────
         # Child tickets inherit the same agent and status as the parent
-        Ticket.query.filter_by(parent_ticket_id=ticket_id).update({
+        TicketService.propagate_to_children(ticket_id, {
             "assigned_to": agent_id,
             "status": "IN_PROGRESS",
             "assigned_at": datetime.now(timezone.utc),
             "accepted_at": datetime.now(timezone.utc), # Sync accepted_at
             "updated_at": datetime.now(timezone.utc)
-        }, synchronize_session=False)
+        })
 
         # Log Activity
         log_activity(
@@ -211,6 +221,7 @@ class TicketService:
         db.session.commit()
 
         AuditService.log_action(f"Assigned ticket to agent {agent_id}", lead_id, ticket_id)
+        publish_ticket_event(TICKET_ASSIGNED, ticket)
         return ticket
 
     @staticmethod
@@ -279,9 +290,7 @@ class TicketService:
                 if new_status == "CLOSED":
                     child_updates["closed_at"] = datetime.now(timezone.utc)
 
-                Ticket.query.filter_by(parent_ticket_id=ticket.id).update(
-                    child_updates, synchronize_session=False
-                )
+                TicketService.propagate_to_children(ticket.id, child_updates)
 
             # Log Activity
             action_type = "STATUS_UPDATED"
@@ -307,7 +316,8 @@ class TicketService:
                 user.id, 
                 ticket.id
             )
-            
+
+            publish_ticket_event(TICKET_STATUS_CHANGED, ticket, previous_status=current_status)
             return ticket
         except Exception as e:
             db.session.rollback()
@@ -336,4 +346,14 @@ class TicketService:
         )
         AuditService.log_action(description, user_id, ticket.id)
         db.session.commit()
+        publish_ticket_event(TICKET_ESCALATION_RESOLVED, ticket)
         return ticket
+
+    @staticmethod
+    def propagate_to_children(parent_id, values):
+        """
+        Mirrors `values` onto every child of the parent ticket in one UPDATE.
+        Goes through bulk_update_tickets() so derived data (rollups) sees the
+        child changes too.  Does not commit.
+        """
+        return bulk_update_tickets([Ticket.parent_ticket_id == parent_id], values)
@@ -0,0 +1,236 @@
+"""
+app/services/workload_ledger.py
+
+Live Agent Workload Ledger
+──────────────────────────
+Per-agent active ticket count and priority-weighted load, kept in memory (or
+in Redis) so assignment and team views read workload in O(1) instead of
+counting tickets.
+
+  1. What counts: parent tickets assigned to the agent whose status is in
+     ACTIVE_STATUSES, weighted by PRIORITY_WEIGHTS.
+  2. Updates: a ticket commit handler (app/services/ticket_changes.py) turns
+     every committed assignment / status / priority change — TicketService,
+     the role routes, child propagation and the scheduler jobs alike — into
+     ±deltas on the old and new assignee.  Rolled-back changes never reach it.
+  3. Reconcile: reconcile() replaces the ledger with one grouped query over
+     tickets, correcting drift from writes made outside the app.  The
+     scheduler runs it every WORKLOAD_RECONCILE_MINUTES — in the one process
+     that owns the scheduler.  A read runs it inline before the first
+     reconcile and, with the in-process backend, once the ledger is older
+     than WORKLOAD_RECONCILE_MINUTES.
+  4. Backends: in-process dict (default) or a Redis hash
+     (WORKLOAD_LEDGER_BACKEND = 'redis'), shared by every worker.  The
+     in-process ledger only sees commits made by its own worker, so with
+     several workers it can lag by up to WORKLOAD_RECONCILE_MINUTES —
+     multi-worker deployments should use Redis.  Redis errors fall back to
+     reconciling the in-process ledger.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import case, func
+
+from app.extensions import db
+from app.models.ticket import Ticket
+from app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Statuses that occupy an agent, and how much each priority weighs
+ACTIVE_STATUSES = ("APPROVED", "IN_PROGRESS", "ESCALATED")
+PRIORITY_WEIGHTS = {"P1": 5, "P2": 3, "P3": 2, "P4": 1}
+
+
+@dataclass(frozen=True)
+class AgentLoad:
+    active: int = 0
+    load: int = 0
+
+
+EMPTY = AgentLoad()
+
+
+def _contribution(values):
+    """(agent_id, 1, weight) if the ticket occupies its assignee, else None."""
+    if values is None:
+        return None
+    agent_id = values.get('assigned_to')
+    if agent_id is None or values.get('parent_ticket_id') is not None:
+        return None
+    if values.get('status') not in ACTIVE_STATUSES:
+        return None
+    return agent_id, 1, PRIORITY_WEIGHTS.get(values.get('priority'), 1)
+
+
+def _db_totals():
+    """{agent_id: AgentLoad} straight from tickets — one grouped query."""
+    weight = case(*[(Ticket.priority == p, w) for p, w in PRIORITY_WEIGHTS.items()], else_=1)
+    rows = (
+        db.session.query(Ticket.assigned_to, func.count(Ticket.id), func.sum(weight))
+        .filter(
+            Ticket.assigned_to.isnot(None),
+            Ticket.status.in_(ACTIVE_STATUSES),
+            Ticket.parent_ticket_id.is_(None),
+        )
+        .group_by(Ticket.assigned_to)
+        .all()
+    )
+    return {agent_id: AgentLoad(int(n), int(w or 0)) for agent_id, n, w in rows}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Backends
+# ─────────────────────────────────────────────────────────────────────────────
+class _LocalBackend:
+    name = 'local'
+
+    def __init__(self):
+        self.max_age = 300
+        self._loads = {}
+        self._reconciled_at = None
+        self._lock = threading.Lock()
+
+    def is_ready(self):
+        """Seeded, and recently enough that other workers' commits are reflected."""
+        reconciled_at = self._reconciled_at
+        return reconciled_at is not None and time.monotonic() - reconciled_at < self.max_age
+
+    def get_many(self, agent_ids):
+        with self._lock:
+            return {a: self._loads.get(a, EMPTY) for a in agent_ids}
+
+    def apply(self, deltas):
+        with self._lock:
+            for agent_id, (d_active, d_load) in deltas.items():
+                cur = self._loads.get(agent_id, EMPTY)
+                self._loads[agent_id] = AgentLoad(max(cur.active + d_active, 0), max(cur.load + d_load, 0))
+
+    def replace(self, totals):
+        with self._lock:
+            self._loads = dict(totals)
+            self._reconciled_at = time.monotonic()
+
+
+class _RedisBackend:
+    name = 'redis'
+    KEY = 'riq:workload'
+    READY_KEY = 'riq:workload:ready'
+
+    def __init__(self, client):
+        self.client = client
+
+    def is_ready(self):
+        return bool(self.client.exists(self.READY_KEY))
+
+    def get_many(self, agent_ids):
+        agent_ids = list(agent_ids)
+        if not agent_ids:
+            return {}
+        fields = [f for a in agent_ids for f in (f'{a}:active', f'{a}:load')]
+        values = self.client.hmget(self.KEY, fields)
+        return {
+            a: AgentLoad(max(int(values[2 * i] or 0), 0), max(int(values[2 * i + 1] or 0), 0))
+            for i, a in enumerate(agent_ids)
+        }
+
+    def apply(self, deltas):
+        pipe = self.client.pipeline(transaction=False)
+        for agent_id, (d_active, d_load) in deltas.items():
+            if d_active:
+                pipe.hincrby(self.KEY, f'{agent_id}:active', d_active)
+            if d_load:
+                pipe.hincrby(self.KEY, f'{agent_id}:load', d_load)
+        pipe.execute()
+
+    def replace(self, totals):
+        mapping = {}
+        for agent_id, value in totals.items():
+            mapping[f'{agent_id}:active'] = value.active
+            mapping[f'{agent_id}:load'] = value.load
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(self.KEY)
+        if mapping:
+            pipe.hset(self.KEY, mapping=mapping)
+        pipe.set(self.READY_KEY, 1)
+        pipe.execute()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Ledger
+# ─────────────────────────────────────────────────────────────────────────────
+class WorkloadLedger:
+    def __init__(self):
+        self._local = _LocalBackend()
+        self._backend = self._local
+
+    def init_app(self, app):
+        app.config.setdefault('WORKLOAD_LEDGER_BACKEND', 'local')
+        app.config.setdefault('WORKLOAD_RECONCILE_MINUTES', 5)
+        self._local.max_age = app.config['WORKLOAD_RECONCILE_MINUTES'] * 60
+        if app.config['WORKLOAD_LEDGER_BACKEND'] == 'redis':
+            client = get_redis(app)
+            if client is not None:
+                self._backend = _RedisBackend(client)
+            else:
+                logger.warning("⚠️ WORKLOAD_LEDGER_BACKEND=redis but Redis is unavailable — using the in-process ledger")
+        app.extensions['workload_ledger'] = self
+
+        from app.services.ticket_changes import on_ticket_commit
+        on_ticket_commit(apply_ticket_commit)
+
+    @property
+    def backend_name(self):
+        return self._backend.name
+
+    def reconcile(self):
+        """Replaces the ledger with totals from tickets.  Returns the number of agents with load."""
+        totals = _db_totals()
+        try:
+            self._backend.replace(totals)
+        except Exception as e:
+            logger.warning(f"⚠️ Workload ledger reconcile failed on {self._backend.name}: {e} — using the in-process ledger")
+            self._backend = self._local
+            self._local.replace(totals)
+        return len(totals)
+
+    def get_many(self, agent_ids):
+        """{agent_id: AgentLoad} — zero load for agents with no active tickets."""
+        try:
+            if not self._backend.is_ready():
+                self.reconcile()
+            return self._backend.get_many(agent_ids)
+        except Exception as e:
+            logger.warning(f"⚠️ Workload ledger read failed on {self._backend.name}: {e} — using the in-process ledger")
+            self._backend = self._local
+            if not self._local.is_ready():
+                self.reconcile()
+            return self._local.get_many(agent_ids)
+
+    def get(self, agent_id):
+        return self.get_many([agent_id])[agent_id]
+
+    def apply_changes(self, changes):
+        deltas = {}
+        for change in changes:
+            for values, sign in ((change.old, -1), (change.new, 1)):
+                contribution = _contribution(values)
+                if contribution is None:
+                    continue
+                agent_id, active, load = contribution
+                d_active, d_load = deltas.get(agent_id, (0, 0))
+                deltas[agent_id] = (d_active + sign * active, d_load + sign * load)
+        deltas = {a: d for a, d in deltas.items() if d != (0, 0)}
+        if deltas and self._backend.is_ready():
+            self._backend.apply(deltas)
+
+
+workload_ledger = WorkloadLedger()
+
+
+def apply_ticket_commit(changes):
+    """Ticket commit handler."""
+    workload_ledger.apply_changes(changes)
@@ -0,0 +1,131 @@
+"""
+app/utils/compression.py
+
+Response Compression
+────────────────────
+after_request hook that gzip/brotli-encodes API responses for clients that
+send Accept-Encoding.  Installed in create_app() when COMPRESS_ENABLED is set.
+
+  1. Only mimetypes in COMPRESS_MIMETYPES are touched (text/event-stream is
+     deliberately absent — SSE frames must not sit in a compressor buffer).
+  2. Buffered responses smaller than COMPRESS_MIN_SIZE are sent as-is.
+  3. Streamed responses (exports, generators) are compressed chunk by chunk
+     through an incremental compressor, so the body is never held in memory.
+  4. brotli is used when the `brotli` package is installed and the client
+     prefers it; otherwise gzip.
+  5. 304s, HEAD requests, passthrough files and already-encoded bodies are
+     left alone.  Strong ETags are downgraded to weak ones since the bytes
+     on the wire differ from the identity representation.
+"""
+
+import gzip
+import zlib
+from flask import request, current_app
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+def _supported_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def _choose_encoding():
+    """Best encoding the client accepts, or None."""
+    best = request.accept_encodings.best_match(_supported_encodings())
+    return best if best in _supported_encodings() else None
+
+
+def _compress_bytes(data, encoding, config):
+    if encoding == "br":
+        return brotli.compress(data, quality=config["COMPRESS_BR_LEVEL"])
+    return gzip.compress(data, compresslevel=config["COMPRESS_LEVEL"])
+
+
+class _StreamCompressor:
+    """Uniform compress()/finish() wrapper over zlib and brotli incremental encoders."""
+
+    def __init__(self, encoding, config):
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=config["COMPRESS_BR_LEVEL"])
+            self._compress, self._finish = self._obj.process, self._obj.finish
+        else:
+            # wbits=31 → gzip container
+            self._obj = zlib.compressobj(config["COMPRESS_LEVEL"], zlib.DEFLATED, 31)
+            self._compress, self._finish = self._obj.compress, self._obj.flush
+
+    def compress(self, chunk):
+        return self._compress(chunk)
+
+    def finish(self):
+        return self._finish()
+
+
+def _compress_stream(chunks, original, compressor):
+    try:
+        for chunk in chunks:
+            out = compressor.compress(chunk)
+            if out:
+                yield out
+        tail = compressor.finish()
+        if tail:
+            yield tail
+    finally:
+        close = getattr(original, "close", None)
+        if close is not None:
+            close()
+
+
+def _compress_response(response):
+    config = current_app.config
+
+    if response.mimetype not in config["COMPRESS_MIMETYPES"]:
+        return response
+
+    # Representation varies with Accept-Encoding even when this one is sent uncompressed
+    response.vary.add("Accept-Encoding")
+
+    if (
+        request.method == "HEAD"
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        original = response.response
+        response.response = _compress_stream(
+            response.iter_encoded(), original, _StreamCompressor(encoding, config)
+        )
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < config["COMPRESS_MIN_SIZE"]:
+            return response
+        response.set_data(_compress_bytes(data, encoding, config))
+
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Registers the compression hook if enabled. Returns True if installed."""
+    if not app.config.get("COMPRESS_ENABLED", True):
+        return False
+    app.config.setdefault("COMPRESS_MIMETYPES", {"application/json"})
+    app.config.setdefault("COMPRESS_MIN_SIZE", 1024)
+    app.config.setdefault("COMPRESS_LEVEL", 6)
+    app.config.setdefault("COMPRESS_BR_LEVEL", 4)
+    app.after_request(_compress_response)
+    return True
@@ -0,0 +1,39 @@
+"""
+app/utils/date_filters.py
+
+Request date-range filters
+──────────────────────────
+?date_from= / ?date_to= query parameters (ISO dates or datetimes) turned into
+SQLAlchemy criteria on a timestamp column — shared by the analytics and
+admin export endpoints.
+"""
+
+from datetime import datetime, timedelta
+
+from flask import request
+
+
+def date_range_criteria(column):
+    """
+    ?date_from= / ?date_to= as criteria on `column`.  A bare date for date_to
+    includes that whole day.  Invalid values are ignored, as in the admin
+    activity-log filters.
+    """
+    criteria = []
+    date_from = request.args.get('date_from')
+    date_to = request.args.get('date_to')
+    if date_from:
+        try:
+            criteria.append(column >= datetime.fromisoformat(date_from))
+        except ValueError:
+            pass
+    if date_to:
+        try:
+            dt = datetime.fromisoformat(date_to)
+            if len(date_to) == 10:
+                criteria.append(column < dt + timedelta(days=1))
+            else:
+                criteria.append(column <= dt)
+        except ValueError:
+            pass
+    return criteria
@@ -10,7 +10,7 @@ def roles_required(*roles):
             if not current_user:
                 return jsonify({"success": False, "message": "User not found"}), 404
             
-            # Use the role object relationship we added to User model
+            # Role comes from the token's principal claims — no user query (app/utils/principal.py)
             user_role = current_user.role.name if current_user.role else "EMPLOYEE"
             
             if user_role not in roles:
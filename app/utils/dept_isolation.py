@@ -5,8 +5,11 @@ Department Isolation Utility
 ─────────────────────────────
 Provides:
   1. ISSUE_TYPE_TO_NAME  — canonical Issue Type → department NAME mapping
-  2. resolve_department_id() — dynamically looks up the correct dept_id from the DB
+  2. resolve_department_id() — looks up the correct dept_id in the cached
+     reference data (app/services/reference_data.py)
   3. apply_dept_filter()  — attaches role-aware dept isolation to a SQLAlchemy query
+  4. get_user_scope() / scope_allows() — the same rules as a detached tuple +
+     in-memory check (used by the ticket event stream)
 
 CRITICAL: Uses DB name lookup (not hardcoded IDs) so this works regardless of
 which IDs MySQL assigns after a fresh migration.
@@ -29,28 +32,6 @@ ISSUE_TYPE_TO_NAME = {
     "Other": "Others",
 }
 
-# In-process cache: populated on first use to avoid repeated DB queries.
-_dept_id_cache = {}  # { "Network Issues": 1, "Hardware Failure": 2, ... }
-
-
-def _get_dept_id_by_name(dept_name: str) -> int:
-    """
-    Fetch and cache the department ID for the given canonical department name.
-    Raises ValueError if the department is not found in the database.
-    """
-    if dept_name in _dept_id_cache:
-        return _dept_id_cache[dept_name]
-
-    from app.models.department import Department
-    dept = Department.query.filter_by(name=dept_name).first()
-    if dept is None:
-        raise ValueError(
-            f"Department '{dept_name}' not found in the database. "
-            "Make sure you have run the setup/seed script first."
-        )
-    _dept_id_cache[dept_name] = dept.id
-    return dept.id
-
 
 def resolve_department_id(issue_type: str) -> int:
     """
@@ -66,22 +47,30 @@ def resolve_department_id(issue_type: str) -> int:
     Raises:
         ValueError: If issue_type is not one of the valid values.
     """
+    from app.services.reference_data import reference_data
+
     dept_name = ISSUE_TYPE_TO_NAME.get(issue_type)
     if dept_name is None:
         valid = ", ".join(f'"{k}"' for k in ISSUE_TYPE_TO_NAME)
         raise ValueError(
             f"Invalid issue_type '{issue_type}'. Must be one of: {valid}"
         )
-    return _get_dept_id_by_name(dept_name)
+    dept_id = reference_data.department_id_for_issue_type(issue_type)
+    if dept_id is None:
+        raise ValueError(
+            f"Department '{dept_name}' not found in the database. "
+            "Make sure you have run the setup/seed script first."
+        )
+    return dept_id
 
 
 def clear_dept_cache():
     """
-    Clears the in-process department ID cache.
+    Marks the cached reference data (app/services/reference_data.py) stale.
     Useful during tests or after DB resets.
     """
-    global _dept_id_cache
-    _dept_id_cache = {}
+    from app.services.reference_data import reference_data
+    reference_data.invalidate()
 
 
 def apply_dept_filter(query, user, Ticket):
@@ -127,6 +116,35 @@ def apply_dept_filter(query, user, Ticket):
     return query.filter(Ticket.created_by == user.id)
 
 
+def get_user_scope(user):
+    """
+    Captures the same role rules as apply_dept_filter() as a plain tuple
+    (role, department_id, user_id) that can outlive the request — e.g. for
+    long-lived streaming connections that must not touch current_user later.
+    """
+    role = user.role.name if user.role else "EMPLOYEE"
+    dept_id = None
+    if role == "TEAM_LEAD":
+        dept_id = user.team_lead_profile.department_id if user.team_lead_profile else None
+    elif role == "AGENT":
+        dept_id = user.agent_profile.department_id if user.agent_profile else None
+    return (role, dept_id, user.id)
+
+
+def scope_allows(scope, department_id, created_by):
+    """
+    In-memory counterpart of apply_dept_filter(): True if a ticket with the
+    given department_id / created_by is visible to the scope tuple returned
+    by get_user_scope().
+    """
+    role, dept_id, user_id = scope
+    if role == "ADMIN":
+        return True
+    if role in ("TEAM_LEAD", "AGENT"):
+        return dept_id is not None and department_id == dept_id
+    return created_by == user_id
+
+
 def assert_dept_access(ticket, user):
     """
     Raises PermissionError if user's department does not match the ticket's
@@ -0,0 +1,39 @@
+"""
+app/utils/http_cache.py
+
+Conditional GET helpers (weak ETags)
+────────────────────────────────────
+Endpoints compute a cheap version tag (e.g. from tickets.updated_at and row_version) BEFORE
+loading relationships or serializing.  If the client already holds that
+version (If-None-Match) we answer 304 Not Modified with an empty body.
+
+Tags are weak (W/"...") — time-derived fields such as sla_remaining_seconds
+may drift between two responses carrying the same tag.
+"""
+
+import hashlib
+from flask import request, make_response
+
+
+def compute_etag(*parts):
+    """Builds an opaque tag from the given version parts (ids, timestamps, counts...)."""
+    raw = "|".join("" if p is None else str(p) for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def is_not_modified(etag):
+    """True if the request's If-None-Match already contains this (weak) tag."""
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified(etag):
+    """Empty 304 response carrying the tag."""
+    response = make_response("", 304)
+    return attach_etag(response, etag)
+
+
+def attach_etag(response, etag):
+    """Sets a weak ETag and forces revalidation on every use."""
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
@@ -0,0 +1,65 @@
+"""
+app/utils/json_provider.py
+
+Fast JSON Provider
+──────────────────
+Drop-in replacement for Flask's DefaultJSONProvider backed by orjson.
+Installed in create_app() when FAST_JSON is enabled and orjson is importable;
+otherwise Flask's stdlib-json provider stays in place.
+
+  - datetimes are serialized natively; naive values are treated as UTC and
+    emitted with an explicit +00:00 offset (same output as format_datetime)
+  - response bodies are built from bytes directly, skipping the str round trip
+  - anything orjson can't handle natively (Decimal, etc.) falls back to the
+    default provider's `default` hook
+"""
+
+import logging
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+
+    def _options(self):
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if not (self.compact if self.compact is not None else not self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _dumps_bytes(self, obj):
+        return orjson.dumps(obj, default=self.default, option=self._options())
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Callers asking for stdlib-specific options (cls=, indent=...) get stdlib json.
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """Installs FastJSONProvider if enabled and available. Returns True if installed."""
+    if not app.config.get("FAST_JSON", True):
+        return False
+    if orjson is None:
+        logger.warning("[App] orjson not installed — using default JSON provider")
+        return False
+    app.json = FastJSONProvider(app)
+    return True
@@ -1,5 +1,6 @@
 from app.extensions import db
 from app.models.system_activity_log import SystemActivityLog
+from sqlalchemy import insert
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,3 +23,18 @@ def log_activity(user_id, action_type, entity_type, entity_id, description):
     except Exception as e:
         # We don't want logging to crash the main transaction, but we should know if it fails
         logger.warning(f"⚠️ Activity Logging Error: {str(e)}")
+
+
+def log_activities(rows):
+    """
+    Bulk variant of log_activity() for many entries at once.
+    `rows` are dicts with user_id, action_type, entity_type, entity_id and
+    description.  Sent as one executemany INSERT (a single multi-row INSERT
+    on MySQL) in the current transaction.  Does NOT commit the transaction.
+    """
+    if not rows:
+        return
+    try:
+        db.session.execute(insert(SystemActivityLog), rows)
+    except Exception as e:
+        logger.warning(f"⚠️ Activity Logging Error: {str(e)}")
@@ -1,7 +1,26 @@
+import os
+
 from passlib.context import CryptContext
 from werkzeug.security import check_password_hash as werkzeug_verify
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+LEGACY_PREFIX = "pbkdf2:sha256:"
+
+# bcrypt cost factor (log2 rounds).  Hashes below it are upgraded on the next
+# successful login (see needs_rehash) — raising BCRYPT_ROUNDS strengthens
+# existing passwords gradually.
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+)
+
+
+def configure_rounds(rounds: int):
+    """Applies a bcrypt cost factor from app config (create_app)."""
+    pwd_context.update(bcrypt__rounds=rounds, bcrypt__min_rounds=rounds)
 
 
 def hash_password(password: str) -> str:
@@ -10,7 +29,7 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, password_hash: str) -> bool:
     # Handle legacy werkzeug hashes
-    if password_hash and password_hash.startswith("pbkdf2:sha256:"):
+    if password_hash and password_hash.startswith(LEGACY_PREFIX):
         return werkzeug_verify(password_hash, plain_password)
     
     # Handle passlib bcrypt hashes
@@ -18,3 +37,25 @@ def verify_password(plain_password: str, password_hash: str) -> bool:
         return pwd_context.verify(plain_password, password_hash)
     except Exception:
         return False
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True for legacy pbkdf2 hashes and bcrypt hashes below the configured cost."""
+    if not password_hash or password_hash.startswith(LEGACY_PREFIX):
+        return True
+    try:
+        return pwd_context.needs_update(password_hash)
+    except Exception:
+        return False
+
+
+def verify_and_rehash(plain_password: str, password_hash: str):
+    """
+    (is_valid, new_hash) — new_hash is set when the password matched and the
+    stored hash should be replaced (legacy scheme or outdated cost).
+    """
+    if not verify_password(plain_password, password_hash):
+        return False, None
+    if needs_rehash(password_hash):
+        return True, hash_password(plain_password)
+    return True, None
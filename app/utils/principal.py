@@ -0,0 +1,349 @@
+"""
+app/utils/principal.py
+
+Claims-Based Principal
+──────────────────────
+Resolves the caller of an authenticated request from the signed JWT instead
+of loading the User (and its role / profile rows) from the database on every
+request.
+
+  1. Login embeds principal_claims(user) in the access token: role name,
+     each profile's (id, department_id) and the user's token_version.
+  2. The JWT user loader returns a Principal built from those claims.  It
+     answers what route handlers, roles_required and the dept-isolation
+     helpers read — id, role.name, team_lead_profile / agent_profile
+     (.id, .department_id) — without touching the database.
+  3. Full user loading is opt-in: principal.user loads the User row; any
+     other attribute (full_name, to_dict(), ...) is delegated to it, so
+     handlers that need the full record still work and pay for it.
+  4. Token versioning: changing a user's role, or the department / existence
+     of one of their profiles, bumps users.token_version (session flush
+     hook, below); deleting the user revokes outright.  Tokens carrying an
+     older version are rejected as revoked, so the change takes effect at
+     the next login.  The current version is cached per worker for
+     TOKEN_VERSION_CHECK_SECONDS — the longest a stale token can outlive a
+     change made on another worker.
+
+PRINCIPAL_SOURCE picks the strategy: 'claims' (above, default), 'cache' —
+every token resolves through PrincipalCache, a short-TTL LRU of principals
+loaded with one query — or 'database', the User row per request.  Tokens
+issued before claims existed always go through the cache in 'claims' mode.
+"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from flask import current_app
+from sqlalchemy import event, inspect, select, update
+
+from app.extensions import db
+
+CLAIM_ROLE = 'role'
+CLAIM_TEAM_LEAD_PROFILE = 'tlp'     # [profile id, department_id]
+CLAIM_AGENT_PROFILE = 'agp'         # [profile id, department_id]
+CLAIM_VERSION = 'tv'
+
+_BUMP_KEY = '_principal_version_bumps'
+_PENDING_COMMIT_KEY = '_principal_version_bumps_pending_commit'
+
+_MAX_CACHED_VERSIONS = 10000
+
+
+def principal_claims(user):
+    """Additional JWT claims describing the user (see Principal)."""
+    def profile(p):
+        return [p.id, p.department_id] if p is not None else None
+
+    return {
+        CLAIM_ROLE: user.role.name if user.role else 'EMPLOYEE',
+        CLAIM_TEAM_LEAD_PROFILE: profile(user.team_lead_profile),
+        CLAIM_AGENT_PROFILE: profile(user.agent_profile),
+        CLAIM_VERSION: user.token_version or 0,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Principal
+# ─────────────────────────────────────────────────────────────────────────────
+class _RoleRef:
+    def __init__(self, name):
+        self.name = name
+
+
+class _ProfileRef:
+    """id / department_id from the token; other attributes load the real profile."""
+
+    def __init__(self, principal, relation, profile_id, department_id):
+        self._principal = principal
+        self._relation = relation
+        self.id = profile_id
+        self.department_id = department_id
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(getattr(self._principal.user, self._relation), name)
+
+
+class Principal:
+    _user = None
+
+    def __init__(self, user_id, role_name, team_lead_profile=None, agent_profile=None, token_version=0,
+                 full_name=None, is_active=None):
+        self.id = user_id
+        self.role = _RoleRef(role_name)
+        self.token_version = token_version
+        # Only set when known (principal cache); otherwise read from the User
+        if full_name is not None:
+            self.full_name = full_name
+        if is_active is not None:
+            self.is_active = is_active
+        self.team_lead_profile = (
+            _ProfileRef(self, 'team_lead_profile', *team_lead_profile) if team_lead_profile else None
+        )
+        self.agent_profile = (
+            _ProfileRef(self, 'agent_profile', *agent_profile) if agent_profile else None
+        )
+
+    @classmethod
+    def from_claims(cls, jwt_data):
+        return cls(
+            int(jwt_data['sub']),
+            jwt_data.get(CLAIM_ROLE) or 'EMPLOYEE',
+            team_lead_profile=jwt_data.get(CLAIM_TEAM_LEAD_PROFILE),
+            agent_profile=jwt_data.get(CLAIM_AGENT_PROFILE),
+            token_version=jwt_data.get(CLAIM_VERSION, 0),
+        )
+
+    @property
+    def user(self):
+        """The full User row — loaded on first access."""
+        if self._user is None:
+            from app.models.user import User
+            self._user = db.session.get(User, self.id)
+        return self._user
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        user = self.user
+        if user is None:
+            raise AttributeError(name)
+        return getattr(user, name)
+
+    def __repr__(self):
+        return f"<Principal {self.id} {self.role.name}>"
+
+
+def load_principal(jwt_data):
+    """
+    JWT user loader, by PRINCIPAL_SOURCE:
+      claims    Principal from the token's claims; tokens without claims
+                (issued before they existed) go through the principal cache
+      cache     Principal from the principal cache for every token
+      database  the User row, loaded per request
+    """
+    source = current_app.config.get('PRINCIPAL_SOURCE', 'claims')
+    user_id = int(jwt_data['sub'])
+    if source == 'claims' and CLAIM_VERSION in jwt_data:
+        return Principal.from_claims(jwt_data)
+    if source in ('claims', 'cache'):
+        return principal_cache.get(user_id, jwt_data.get(CLAIM_VERSION))
+    from app.models.user import User
+    return db.session.get(User, user_id)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Principal cache
+# ─────────────────────────────────────────────────────────────────────────────
+# What the cache holds — never ORM objects, which belong to one request's session
+_PrincipalRecord = namedtuple(
+    '_PrincipalRecord', 'user_id role_name team_lead_profile agent_profile token_version full_name is_active'
+)
+
+
+def _load_record(user_id):
+    """Role, profiles and is_active of a user in one query; None if the user does not exist."""
+    from app.models.role import Role
+    from app.models.user import AgentProfile, TeamLeadProfile, User
+    row = (
+        db.session.query(
+            User.id, Role.name, User.token_version, User.full_name, User.is_active,
+            TeamLeadProfile.id, TeamLeadProfile.department_id,
+            AgentProfile.id, AgentProfile.department_id,
+        )
+        .outerjoin(Role, Role.id == User.role_id)
+        .outerjoin(TeamLeadProfile, TeamLeadProfile.user_id == User.id)
+        .outerjoin(AgentProfile, AgentProfile.user_id == User.id)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if row is None:
+        return None
+    uid, role_name, version, full_name, is_active, tlp_id, tlp_dept, agp_id, agp_dept = row
+    return _PrincipalRecord(
+        uid, role_name or 'EMPLOYEE',
+        [tlp_id, tlp_dept] if tlp_id is not None else None,
+        [agp_id, agp_dept] if agp_id is not None else None,
+        version or 0, full_name, bool(is_active),
+    )
+
+
+class PrincipalCache:
+    """
+    LRU of principal records keyed by (user id, token version), each kept for
+    PRINCIPAL_CACHE_TTL seconds.  invalidate(user_id) drops every entry of a
+    user; it is called after user updates / deletes and on token-version
+    bumps.  Per worker — other workers see a change within the TTL.
+    """
+
+    def __init__(self):
+        self.ttl = 60
+        self.max_entries = 5000
+        self._entries = OrderedDict()     # (user_id, version) -> (record, expires_at)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault('PRINCIPAL_CACHE_TTL', 60)
+        app.config.setdefault('PRINCIPAL_CACHE_MAX_ENTRIES', 5000)
+        self.ttl = app.config['PRINCIPAL_CACHE_TTL']
+        self.max_entries = app.config['PRINCIPAL_CACHE_MAX_ENTRIES']
+        app.extensions['principal_cache'] = self
+
+    def get(self, user_id, token_version=None):
+        """A fresh Principal for the user, or None if the user does not exist."""
+        key = (user_id, token_version)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                record = entry[0]
+            else:
+                record = None
+
+        if record is None:
+            record = _load_record(user_id)
+            if record is None:
+                return None
+            with self._lock:
+                self._entries[key] = (record, now + self.ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return Principal(
+            record.user_id, record.role_name,
+            team_lead_profile=record.team_lead_profile,
+            agent_profile=record.agent_profile,
+            token_version=record.token_version,
+            full_name=record.full_name,
+            is_active=record.is_active,
+        )
+
+    def invalidate(self, *user_ids):
+        ids = set(user_ids)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in ids]:
+                del self._entries[key]
+
+
+principal_cache = PrincipalCache()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Token versions
+# ─────────────────────────────────────────────────────────────────────────────
+_versions = {}          # user_id -> (token_version | None, expires_at)
+_versions_lock = threading.Lock()
+
+
+def current_token_version(user_id):
+    """users.token_version (None if the user no longer exists), cached briefly."""
+    now = time.monotonic()
+    cached = _versions.get(user_id)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+
+    from app.models.user import User
+    version = db.session.execute(select(User.token_version).where(User.id == user_id)).scalar_one_or_none()
+    ttl = current_app.config.get('TOKEN_VERSION_CHECK_SECONDS', 30)
+    with _versions_lock:
+        if len(_versions) >= _MAX_CACHED_VERSIONS:
+            _versions.clear()
+        _versions[user_id] = (version, now + ttl)
+    return version
+
+
+def forget_token_versions(user_ids):
+    with _versions_lock:
+        for user_id in user_ids:
+            _versions.pop(user_id, None)
+
+
+def is_token_revoked(jwt_data):
+    """JWT blocklist loader: tokens whose version is behind the user's are revoked."""
+    if CLAIM_VERSION not in jwt_data:
+        return False
+    version = current_token_version(int(jwt_data['sub']))
+    return version is None or version != jwt_data[CLAIM_VERSION]
+
+
+# ── Version bumps ────────────────────────────────────────────────────────────
+def _changed(obj, field):
+    return bool(inspect(obj).attrs[field].history.added)
+
+
+def _before_flush(session, flush_context, instances):
+    from app.models.user import AgentProfile, TeamLeadProfile, User
+    bumps = set()
+    for obj in session.dirty:
+        if isinstance(obj, User) and _changed(obj, 'role_id'):
+            bumps.add(obj.id)
+        elif isinstance(obj, (TeamLeadProfile, AgentProfile)) and _changed(obj, 'department_id'):
+            bumps.add(obj.user_id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            bumps.add(obj.id)
+        elif isinstance(obj, (TeamLeadProfile, AgentProfile)):
+            bumps.add(obj.user_id)
+    for obj in session.new:
+        if isinstance(obj, (TeamLeadProfile, AgentProfile)):
+            bumps.add(obj.user_id)
+
+    bumps.discard(None)
+    if bumps:
+        session.info.setdefault(_BUMP_KEY, set()).update(bumps)
+
+
+def _after_flush(session, flush_context):
+    bumps = session.info.pop(_BUMP_KEY, None)
+    if not bumps:
+        return
+    from app.models.user import User
+    session.connection().execute(
+        update(User).where(User.id.in_(bumps)).values(token_version=User.token_version + 1)
+    )
+    session.info.setdefault(_PENDING_COMMIT_KEY, set()).update(bumps)
+
+
+def _after_commit(session):
+    bumps = session.info.pop(_PENDING_COMMIT_KEY, None)
+    if bumps:
+        forget_token_versions(bumps)
+        principal_cache.invalidate(*bumps)
+
+
+def _after_rollback(session):
+    session.info.pop(_BUMP_KEY, None)
+    session.info.pop(_PENDING_COMMIT_KEY, None)
+
+
+def init_principal_tracking():
+    """Attaches the token-version flush listeners (idempotent)."""
+    if not event.contains(db.session, "before_flush", _before_flush):
+        event.listen(db.session, "before_flush", _before_flush)
+        event.listen(db.session, "after_flush", _after_flush)
+        event.listen(db.session, "after_commit", _after_commit)
+        event.listen(db.session, "after_rollback", _after_rollback)
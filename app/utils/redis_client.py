@@ -0,0 +1,42 @@
+"""
+app/utils/redis_client.py
+
+Optional Redis Connection
+─────────────────────────
+One lazily-created client per process, built from REDIS_URL.  Redis is an
+optional dependency: when the package is missing or REDIS_URL is empty,
+get_redis() returns None and callers keep their in-process behaviour.
+"""
+
+import logging
+import threading
+
+try:
+    import redis
+except ImportError:  # optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_redis(app):
+    """Shared Redis client for the app's REDIS_URL, or None if unavailable."""
+    global _client
+    if _client is not None:
+        return _client
+
+    url = app.config.get("REDIS_URL")
+    if not url:
+        return None
+    if redis is None:
+        logger.warning("⚠️ REDIS_URL is set but the redis package is not installed")
+        return None
+
+    with _client_lock:
+        if _client is None:
+            # Short timeouts: a slow Redis must degrade to a cache miss, not a hung request
+            _client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+    return _client
@@ -6,6 +6,7 @@ Format:  IQ-IT-2026-XXXXXX
 
 CHANGE: Department ID ranges are now built DYNAMICALLY from the DB so this
 works after any migration or DB reset (IDs are no longer hardcoded as 6-10).
+The name → ID mapping is read from the cached reference data.
 
 Each department owns a numeric range of 100,000 numbers, indexed by the
 alphabetical order of department names (for stability across resets):
@@ -31,52 +32,30 @@ DEPT_NAME_SORT_ORDER = [
     "Software Installation",                  # slot 4
 ]
 
-# Cache: {dept_id: (range_start, range_end)}
-_dept_ranges_cache = {}
-
-
-def _build_ranges():
-    """
-    Build and cache the dept_id → (start, end) range map.
-    Queries the DB once and maps names → IDs using DEPT_NAME_SORT_ORDER
-    so each department always owns the same range slot.
-    """
-    from app.models.department import Department
-
-    depts = Department.query.all()
-    name_to_id = {d.name: d.id for d in depts}
-
-    for slot, name in enumerate(DEPT_NAME_SORT_ORDER):
-        dept_id = name_to_id.get(name)
-        if dept_id is not None:
-            start = slot * RANGE_SIZE
-            end = start + RANGE_SIZE - 1
-            _dept_ranges_cache[dept_id] = (start, end)
-
 
 def _get_range(department_id: int):
     """
     Return (range_start, range_end) for the given department ID.
-    Builds the cache on first call.
+    Department names → IDs come from the cached reference data
+    (app/services/reference_data.py), so this costs no query per ticket.
     """
-    if not _dept_ranges_cache:
-        _build_ranges()
-    if department_id not in _dept_ranges_cache:
-        # Try rebuilding (DB may have been seeded after first call)
-        _dept_ranges_cache.clear()
-        _build_ranges()
-    if department_id not in _dept_ranges_cache:
+    from app.services.reference_data import reference_data
+
+    dept = reference_data.department(department_id)
+    slot = DEPT_NAME_SORT_ORDER.index(dept.name) if dept and dept.name in DEPT_NAME_SORT_ORDER else None
+    if slot is None:
         raise ValueError(
             f"Unknown department_id '{department_id}'. "
             "Make sure departments are seeded (run setup_db.py)."
         )
-    return _dept_ranges_cache[department_id]
+    start = slot * RANGE_SIZE
+    return start, start + RANGE_SIZE - 1
 
 
 def clear_range_cache():
-    """Clear the cached ranges — useful after DB resets in tests."""
-    global _dept_ranges_cache
-    _dept_ranges_cache = {}
+    """Mark the cached reference data stale — useful after DB resets in tests."""
+    from app.services.reference_data import reference_data
+    reference_data.invalidate()
 
 
 def generate_ticket_number(department_id: int) -> str:
@@ -0,0 +1,164 @@
+"""
+scripts/bench_serialization.py
+
+Benchmarks ticket-list serialization before/after the fast JSON path on a
+synthetic fixture (default 10k tickets) in an in-memory SQLite database, so
+it runs without MySQL.
+
+  before : Ticket.to_dict() per row (lazy relationship loads + COUNT per row,
+           legacy format_datetime) rendered by Flask's stdlib JSON provider
+  after  : serialize_tickets() rendered by FastJSONProvider (orjson)
+
+Usage:
+    python scripts/bench_serialization.py [--tickets 10000] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import insert
+from sqlalchemy.pool import StaticPool
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Department, Role, User, Ticket
+import app.models.ticket as ticket_module
+from app.models.ticket import serialize_tickets
+from app.utils.json_provider import FastJSONProvider, orjson
+
+
+class BenchConfig(Config):
+    SCHEDULER_ENABLED = False
+    RESULT_CACHE_ENABLED = False      # measure the query path, not cache hits
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "poolclass": StaticPool,
+        "connect_args": {"check_same_thread": False},
+    }
+
+
+def _legacy_format_datetime(dt):
+    if dt:
+        return dt.replace(tzinfo=timezone.utc).isoformat()
+    return None
+
+
+def seed(n_tickets):
+    roles = {name: Role(name=name) for name in ("ADMIN", "TEAM_LEAD", "AGENT", "EMPLOYEE")}
+    db.session.add_all(roles.values())
+    depts = [Department(name=f"Dept {i}") for i in range(5)]
+    db.session.add_all(depts)
+    db.session.flush()
+
+    users = []
+    for i in range(60):
+        role = roles["AGENT"] if i < 10 else roles["EMPLOYEE"]
+        users.append(User(full_name=f"User {i}", email=f"user{i}@bench.local",
+                          emp_id=f"EMP{i:04d}", password_hash="x", role_id=role.id))
+    db.session.add_all(users)
+    db.session.flush()
+    agents, employees = users[:10], users[10:]
+
+    now = datetime.now(timezone.utc)
+    statuses = ["OPEN", "APPROVED", "IN_PROGRESS", "RESOLVED", "CLOSED"]
+    rows = []
+    for i in range(n_tickets):
+        created = now - timedelta(minutes=i)
+        status = statuses[i % len(statuses)]
+        rows.append({
+            "id": i + 1,
+            "title": f"Bench ticket {i}",
+            "description": "Printer on floor 3 is not responding to print jobs. " * 4,
+            "department_id": depts[i % 5].id,
+            "ticket_number": f"IQ-IT-2026-{i:06d}",
+            "created_by": employees[i % len(employees)].id,
+            "assigned_to": agents[i % len(agents)].id if status != "OPEN" else None,
+            "status": status,
+            "priority": f"P{(i % 4) + 1}",
+            "ai_score": i % 100,
+            "breach_risk": (i % 100) / 100.0,
+            "escalation_required": i % 7 == 0,
+            "ai_explanation": {"summary": "Synthetic benchmark ticket", "factors": ["severity", "impact"]},
+            "sla_hours": 24,
+            "sla_deadline": created + timedelta(hours=24),
+            "created_at": created,
+            "updated_at": created,
+            "resolved_at": created + timedelta(hours=2) if status in ("RESOLVED", "CLOSED") else None,
+            "issue_type": "Other",
+            # ~10% children, attached to the first 100 parents
+            "parent_ticket_id": (i % 100) + 1 if i >= 1000 and i % 10 == 0 else None,
+        })
+    db.session.execute(insert(Ticket), rows)
+    db.session.commit()
+
+
+def _load_tickets():
+    db.session.expunge_all()
+    return Ticket.query.order_by(Ticket.created_at.desc()).all()
+
+
+def run_before(app):
+    ticket_module.format_datetime = _legacy_format_datetime
+    try:
+        provider = DefaultJSONProvider(app)
+        tickets = _load_tickets()
+        start = time.perf_counter()
+        data = [t.to_dict(role="ADMIN") for t in tickets]
+        body = provider.response({"success": True, "data": data}).get_data()
+        return time.perf_counter() - start, len(body)
+    finally:
+        ticket_module.format_datetime = _fast_format_datetime
+
+
+def run_after(app):
+    provider = FastJSONProvider(app)
+    tickets = _load_tickets()
+    start = time.perf_counter()
+    data = serialize_tickets(tickets, role="ADMIN")
+    body = provider.response({"success": True, "data": data}).get_data()
+    return time.perf_counter() - start, len(body)
+
+
+_fast_format_datetime = ticket_module.format_datetime
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson is not installed — pip install orjson")
+        sys.exit(1)
+
+    app = create_app(BenchConfig)
+    with app.test_request_context():
+        print(f"Seeding {args.tickets} tickets...")
+        seed(args.tickets)
+
+        results = {}
+        for label, fn in (("before", run_before), ("after", run_after)):
+            timings = []
+            for _ in range(args.repeat):
+                elapsed, size = fn(app)
+                timings.append(elapsed)
+            results[label] = (statistics.median(timings), size)
+
+    print(f"\n{'variant':<8} {'median (ms)':>12} {'body (KB)':>10}")
+    for label, (elapsed, size) in results.items():
+        print(f"{label:<8} {elapsed * 1000:>12.1f} {size / 1024:>10.1f}")
+    speedup = results["before"][0] / results["after"][0] if results["after"][0] else float("inf")
+    print(f"\nspeedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
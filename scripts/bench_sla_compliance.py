@@ -0,0 +1,143 @@
+"""
+scripts/bench_sla_compliance.py
+
+Times GET /api/analytics/sla-compliance (all tickets and the 7/30/90-day
+windows) against a synthetic dataset, as an ADMIN (the widest scope).
+
+Defaults to in-memory SQLite.  For numbers that mean anything in production
+point --url at a scratch MySQL database (never the application database):
+
+    python scripts/bench_sla_compliance.py \\
+        --url "mysql+pymysql://root:pw@127.0.0.1:3306/resolveiq_bench" \\
+        --tickets 1000000 --budget-ms 100
+
+The dataset is only seeded when the tickets table is empty, so repeated
+runs against the same scratch database reuse it.
+Exit code: 0 = every median within --budget-ms, 1 = over budget.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+from sqlalchemy.pool import StaticPool
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Department, Role, User, Ticket
+
+BATCH_SIZE = 20_000
+STATUSES = ["OPEN", "APPROVED", "IN_PROGRESS", "RESOLVED", "CLOSED", "ESCALATED"]
+
+
+def make_config(url):
+    class BenchConfig(Config):
+        SCHEDULER_ENABLED = False
+        RESULT_CACHE_ENABLED = False      # measure the query path, not cache hits
+        SQLALCHEMY_DATABASE_URI = url
+        if url.startswith("sqlite"):
+            SQLALCHEMY_ENGINE_OPTIONS = {
+                "poolclass": StaticPool,
+                "connect_args": {"check_same_thread": False},
+            }
+    return BenchConfig
+
+
+def seed(n_tickets, n_departments=5):
+    admin_role = Role.query.filter_by(name="ADMIN").first() or Role(name="ADMIN")
+    db.session.add(admin_role)
+    depts = [Department(name=f"Bench Dept {i}") for i in range(n_departments)]
+    db.session.add_all(depts)
+    db.session.flush()
+    admin = User(full_name="Bench Admin", email="bench-admin@bench.local",
+                 password_hash="x", role_id=admin_role.id)
+    db.session.add(admin)
+    db.session.flush()
+
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(n_tickets):
+        created = now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+        rows.append({
+            "title": f"Bench ticket {i}",
+            "description": "Synthetic SLA benchmark ticket",
+            "department_id": depts[i % n_departments].id,
+            "created_by": admin.id,
+            "status": rng.choice(STATUSES),
+            "priority": f"P{rng.randint(1, 4)}",
+            "sla_hours": 24,
+            "sla_deadline": created + timedelta(hours=24),
+            "created_at": created,
+            "updated_at": created,
+        })
+        if len(rows) == BATCH_SIZE:
+            db.session.execute(insert(Ticket), rows)
+            rows = []
+    if rows:
+        db.session.execute(insert(Ticket), rows)
+    db.session.commit()
+    return admin
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite://", help="scratch database URL (default: in-memory SQLite)")
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    if args.url == Config.SQLALCHEMY_DATABASE_URI:
+        print("Refusing to seed the application database — pass a scratch --url")
+        sys.exit(2)
+
+    app = create_app(make_config(args.url))
+    with app.app_context():
+        if db.session.query(Ticket.id).first() is None:
+            print(f"Seeding {args.tickets} tickets...")
+            start = time.perf_counter()
+            admin = seed(args.tickets)
+            print(f"Seeded in {time.perf_counter() - start:.1f}s")
+        else:
+            admin = User.query.filter_by(email="bench-admin@bench.local").first()
+            print("Reusing existing dataset")
+        token = create_access_token(identity=admin)
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    over_budget = False
+
+    print(f"\n{'window':<8} {'median (ms)':>12} {'max (ms)':>10}")
+    for window in (None, 7, 30, 90):
+        url = "/api/analytics/sla-compliance" + (f"?days={window}" if window else "")
+        client.get(url, headers=headers)  # warm-up
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            response = client.get(url, headers=headers)
+            timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                print(f"Request failed ({response.status_code}): {response.get_data(as_text=True)}")
+                sys.exit(1)
+        median = statistics.median(timings)
+        over_budget |= median > args.budget_ms
+        print(f"{str(window or 'all'):<8} {median:>12.1f} {max(timings):>10.1f}")
+
+    if over_budget:
+        print(f"\nOver budget ({args.budget_ms:.0f} ms)")
+        sys.exit(1)
+    print(f"\nAll windows within {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+scripts/explain_hot_queries.py
+
+Runs EXPLAIN against every hot tickets query (ticket_routes, agent_routes,
+team_lead_routes, analytics_routes, scheduler) and fails if any plan reads
+the tickets table with a full scan (EXPLAIN type = ALL).
+
+Representative ids (a department, an agent, an employee, a parent ticket)
+are picked from the live database.  On near-empty tables MySQL may prefer a
+scan even when a usable index exists — run ANALYZE TABLE tickets first, and
+check `possible_keys` in the report.
+
+Usage:
+    python scripts/explain_hot_queries.py [--verbose]
+Exit code: 0 = all plans indexed, 1 = at least one full scan.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import func, select
+
+from app import create_app
+from app.extensions import db
+from app.models.ticket import Ticket
+from app.models.user import AgentProfile, EmployeeProfile
+
+
+def _sample_ids():
+    """Picks real ids so the optimizer sees realistic selectivity."""
+    agent = db.session.execute(select(AgentProfile.user_id, AgentProfile.department_id).limit(1)).first()
+    employee = db.session.execute(select(EmployeeProfile.user_id).limit(1)).first()
+    parent = db.session.execute(
+        select(Ticket.parent_ticket_id).where(Ticket.parent_ticket_id.isnot(None)).limit(1)
+    ).first()
+    dept_id = agent.department_id if agent else 1
+    return {
+        "dept_id": dept_id,
+        "agent_id": agent.user_id if agent else 1,
+        "employee_id": employee.user_id if employee else 1,
+        "parent_id": parent.parent_ticket_id if parent else 1,
+    }
+
+
+def hot_queries(ids):
+    """(name, statement) pairs mirroring the filters the routes/jobs issue."""
+    now = datetime.now(timezone.utc)
+    dept_id, agent_id = ids["dept_id"], ids["agent_id"]
+    agent_scope = db.and_(
+        Ticket.department_id == dept_id,
+        db.or_(
+            Ticket.assigned_to == agent_id,
+            db.and_(Ticket.assigned_to == None, Ticket.status == 'APPROVED'),
+        ),
+    )
+
+    return [
+        # ── ticket_routes.get_tickets ────────────────────────────────────────
+        ("tickets: employee list",
+         select(Ticket).where(Ticket.created_by == ids["employee_id"]).order_by(Ticket.created_at.desc())),
+        ("tickets: team lead list",
+         select(Ticket).where(Ticket.department_id == dept_id).order_by(Ticket.created_at.desc())),
+        ("tickets: agent list",
+         select(Ticket).where(agent_scope).order_by(Ticket.created_at.desc())),
+        ("tickets: admin list (limit 50)",
+         select(Ticket).order_by(Ticket.created_at.desc()).limit(50)),
+        ("tickets: admin list by department",
+         select(Ticket).where(Ticket.department_id == dept_id).order_by(Ticket.created_at.desc())),
+        ("tickets: duplicate detection",
+         select(Ticket).where(
+             Ticket.department_id == dept_id,
+             Ticket.status.in_(["OPEN", "APPROVED", "IN_PROGRESS"]),
+             Ticket.parent_ticket_id.is_(None),
+             Ticket.created_at >= now - timedelta(minutes=15),
+         ).order_by(Ticket.created_at.asc()).limit(1)),
+
+        # ── agent_routes ─────────────────────────────────────────────────────
+        ("agent: my tickets",
+         select(Ticket).where(agent_scope, Ticket.parent_ticket_id == None).order_by(Ticket.created_at.desc())),
+        ("agent: list etag",
+         select(func.count(Ticket.id), func.max(Ticket.updated_at)).where(agent_scope, Ticket.parent_ticket_id == None)),
+
+        # ── team_lead_routes ─────────────────────────────────────────────────
+        ("team lead: my tickets",
+         select(Ticket).where(
+             Ticket.department_id == dept_id,
+             Ticket.status == 'OPEN',
+             Ticket.assigned_to == None,
+             Ticket.parent_ticket_id == None,
+         ).order_by(Ticket.created_at.asc())),
+        ("team lead: related reports",
+         select(Ticket).where(Ticket.parent_ticket_id == ids["parent_id"]).order_by(Ticket.created_at.asc())),
+        ("team lead: member active count",
+         select(func.count(Ticket.id)).where(
+             Ticket.assigned_to == agent_id,
+             Ticket.status.in_(["OPEN", "IN_PROGRESS"]),
+             Ticket.parent_ticket_id == None,
+         )),
+
+        # ── analytics_routes ─────────────────────────────────────────────────
+        ("analytics: dept summary",
+         select(Ticket.status, Ticket.priority, func.count(Ticket.id))
+         .where(Ticket.department_id == dept_id).group_by(Ticket.status, Ticket.priority)),
+        ("analytics: employee summary",
+         select(Ticket.status, Ticket.priority, func.count(Ticket.id))
+         .where(Ticket.created_by == ids["employee_id"]).group_by(Ticket.status, Ticket.priority)),
+        ("analytics: SLA compliance (all depts)",
+         select(Ticket.department_id, func.count(Ticket.id))
+         .where(Ticket.sla_deadline.isnot(None)).group_by(Ticket.department_id)),
+        ("analytics: dept SLA compliance",
+         select(Ticket.department_id, func.count(Ticket.id)).where(
+             Ticket.department_id == dept_id,
+             Ticket.sla_deadline.isnot(None),
+         ).group_by(Ticket.department_id)),
+        ("analytics: dept trend",
+         select(func.date(Ticket.created_at), func.count(Ticket.id)).where(
+             Ticket.department_id == dept_id,
+             Ticket.created_at >= now - timedelta(days=30),
+         ).group_by(func.date(Ticket.created_at))),
+        ("analytics: agent performance",
+         select(func.count(Ticket.id)).where(
+             Ticket.assigned_to == agent_id,
+             Ticket.status.in_(['RESOLVED', 'CLOSED']),
+         )),
+
+        # ── scheduler ────────────────────────────────────────────────────────
+        ("scheduler: SLA breaches",
+         select(Ticket).where(
+             Ticket.parent_ticket_id == None,
+             Ticket.status.in_(['OPEN', 'IN_PROGRESS']),
+             Ticket.sla_deadline.isnot(None),
+         )),
+        ("scheduler: auto-approve",
+         select(Ticket).where(
+             Ticket.parent_ticket_id == None,
+             Ticket.status == 'OPEN',
+             Ticket.assigned_to == None,
+         )),
+        ("scheduler: auto-close",
+         select(Ticket).where(Ticket.parent_ticket_id == None, Ticket.status == 'RESOLVED')),
+        ("child propagation",
+         select(Ticket.id).where(Ticket.parent_ticket_id == ids["parent_id"])),
+    ]
+
+
+def explain(stmt):
+    compiled = stmt.compile(dialect=db.engine.dialect, compile_kwargs={"render_postcompile": True})
+    result = db.session.connection().exec_driver_sql("EXPLAIN " + str(compiled), compiled.params)
+    return [dict(row._mapping) for row in result]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="print the full plan for every query")
+    args = parser.parse_args()
+
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    app = create_app()
+    failures = []
+    with app.app_context():
+        ids = _sample_ids()
+        print(f"Sample ids: {ids}\n")
+        for name, stmt in hot_queries(ids):
+            plan = explain(stmt)
+            scans = [r for r in plan if r.get("table") == "tickets" and r.get("type") == "ALL"]
+            status = "FULL SCAN" if scans else "ok"
+            keys = ", ".join(str(r.get("key")) for r in plan if r.get("table") == "tickets")
+            print(f"  [{status:>9}] {name:<38} key: {keys}")
+            if scans:
+                failures.append(name)
+                for r in scans:
+                    print(f"              possible_keys: {r.get('possible_keys')}  rows: {r.get('rows')}")
+            if args.verbose:
+                for r in plan:
+                    print(f"              {r}")
+
+    if failures:
+        print(f"\n{len(failures)} query plan(s) scan tickets: {', '.join(failures)}")
+        sys.exit(1)
+    print("\nAll hot queries use an index.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+scripts/export_snapshot.py
+
+Writes / appends the Parquet analytics snapshot (tickets, ticket_ai,
+feedback, system_activity_logs) under ANALYTICS_SNAPSHOT_DIR.  Requires
+pyarrow.  Schedule it (cron / Task Scheduler) for BI refreshes.
+
+Usage:
+    python scripts/export_snapshot.py                      # incremental, all tables
+    python scripts/export_snapshot.py --full               # rebuild from scratch
+    python scripts/export_snapshot.py --tables tickets feedback --out D:/bi/resolveiq
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app
+from app.services.snapshot_service import SnapshotService, TABLES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=None, help="dataset directory (default: ANALYTICS_SNAPSHOT_DIR)")
+    parser.add_argument("--tables", nargs="+", choices=list(TABLES), default=None, help="tables to export (default: all)")
+    parser.add_argument("--full", action="store_true", help="discard existing files/watermarks and export everything")
+    args = parser.parse_args()
+
+    app = create_app()
+    root = args.out or app.config["ANALYTICS_SNAPSHOT_DIR"]
+    with app.app_context():
+        written = SnapshotService.snapshot(root, tables=args.tables, full=args.full)
+
+    mode = "full" if args.full else "incremental"
+    for table, rows in written.items():
+        print(f"  {table:<22} {rows:>10} rows")
+    print(f"Snapshot ({mode}) written to {root}")
+
+
+if __name__ == "__main__":
+    main()
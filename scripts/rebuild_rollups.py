@@ -0,0 +1,44 @@
+"""
+scripts/rebuild_rollups.py
+
+Backfills / rebuilds ticket_daily_rollups and ticket_latency_histograms
+from the tickets table.  Run once after deploying the tables; safe to
+re-run at any time.
+
+Usage:
+    python scripts/rebuild_rollups.py            # every day
+    python scripts/rebuild_rollups.py --days 7   # only the last 7 days
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app
+from app.services.rollup_service import RollupService
+from app.services.latency_histograms import LatencyHistogramService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=None, help="only rebuild days created within the last N days")
+    args = parser.parse_args()
+
+    since = None
+    if args.days:
+        since = (datetime.now(timezone.utc) - timedelta(days=args.days)).date()
+
+    app = create_app()
+    with app.app_context():
+        written = RollupService.rebuild(since=since)
+        histogram_rows = LatencyHistogramService.rebuild(since=since)
+    scope = f"since {since}" if since else "all days"
+    print(f"Rebuilt ticket daily rollups ({scope}): {written} rows written")
+    print(f"Rebuilt ticket latency histograms ({scope}): {histogram_rows} rows written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+from app.services.batch_assignment import plan_assignments
+from app.services.workload_ledger import AgentLoad
+
+
+def test_no_agents():
+    assert plan_assignments([(10, "P1"), (11, "P2")], {}, capacity=15) == []
+
+
+def test_no_tickets():
+    assert plan_assignments([], {1: AgentLoad()}, capacity=15) == []
+
+
+def test_least_loaded_agent_first():
+    loads = {1: AgentLoad(active=2, load=6), 2: AgentLoad(active=1, load=1)}
+    assert plan_assignments([(10, "P3")], loads, capacity=15) == [(10, 2)]
+
+
+def test_load_is_reweighted_by_priority():
+    loads = {1: AgentLoad(), 2: AgentLoad()}
+    tickets = [(10, "P1"), (11, "P4"), (12, "P4")]
+    # agent 1 takes the P1 (+5); both P4s then go to agent 2 (1, then 2 < 5)
+    assert plan_assignments(tickets, loads, capacity=15) == [(10, 1), (11, 2), (12, 2)]
+
+
+def test_capacity_cut_off():
+    loads = {1: AgentLoad(active=1, load=1), 2: AgentLoad(active=2, load=2)}
+    tickets = [(10, "P4"), (11, "P4"), (12, "P4")]
+    # agent 2 is already full; agent 1 fills its last slot and the rest wait
+    assert plan_assignments(tickets, loads, capacity=2) == [(10, 1)]
+
+
+def test_declined_agent_is_skipped():
+    loads = {1: AgentLoad(), 2: AgentLoad(active=3, load=9)}
+    tickets = [(10, "P4"), (11, "P4")]
+    plan = plan_assignments(tickets, loads, capacity=15, declined={10: {1}})
+    # agent 1 is passed over for ticket 10 only
+    assert plan == [(10, 2), (11, 1)]
+
+
+def test_ticket_declined_by_everyone_stays_unassigned():
+    loads = {1: AgentLoad(), 2: AgentLoad()}
+    tickets = [(10, "P1"), (11, "P2")]
+    plan = plan_assignments(tickets, loads, capacity=15, declined={10: {1, 2}})
+    assert plan == [(11, 1)]
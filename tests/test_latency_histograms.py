@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+from app.services.latency_histograms import (
+    MAX_BUCKET,
+    LatencyHistogramService,
+    bucket_for,
+    bucket_upper_seconds,
+)
+
+
+@pytest.mark.parametrize("seconds, bucket", [
+    (0, 0),
+    (0.5, 0),
+    (1, 0),
+    (1.0001, 1),
+    (2, 4),
+    (2.0001, 5),
+    (4, 8),
+    (60, 24),
+    (3600, 48),
+])
+def test_bucket_for(seconds, bucket):
+    assert bucket_for(seconds) == bucket
+
+
+def test_bucket_for_clamps_long_durations():
+    assert bucket_for(2 ** 40) == MAX_BUCKET
+
+
+def test_bucket_upper_seconds():
+    assert bucket_upper_seconds(0) == 1
+    assert bucket_upper_seconds(4) == 2
+    assert bucket_upper_seconds(8) == 4
+
+
+def test_upper_bound_stays_in_its_bucket():
+    for bucket in range(MAX_BUCKET + 1):
+        upper = bucket_upper_seconds(bucket)
+        assert bucket_for(upper) == bucket
+        if bucket < MAX_BUCKET:
+            assert bucket_for(upper * 1.000001) == bucket + 1
+
+
+def test_percentiles_empty():
+    assert LatencyHistogramService.percentiles({}) == {"count": 0, "p50": None, "p90": None, "p99": None}
+
+
+def test_percentiles_single_bucket():
+    assert LatencyHistogramService.percentiles({4: 10}) == {"count": 10, "p50": 2, "p90": 2, "p99": 2}
+
+
+def test_percentiles_nearest_rank():
+    counts = {12: 10, 0: 50, 8: 40}      # unordered on purpose
+    assert LatencyHistogramService.percentiles(counts) == {"count": 100, "p50": 1, "p90": 4, "p99": 8}
+
+
+def test_percentiles_rank_on_bucket_edge():
+    # rank 51 of 100 is the first ticket of the second bucket
+    assert LatencyHistogramService.percentiles({0: 50, 8: 50}, quantiles=(0.5, 0.51)) == {
+        "count": 100, "p50": 1, "p51": 4,
+    }